@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import importlib
+
+'''
+The classes of this package are imported at the first access,
+so that a script using only some of them does not pay for the others.
+e.g. LambdaCli imports cli.py & the modules of aws/ which it uses, but not docker/ nor s3_cli.py.
+'''
+
+# the exported classes & the modules defining them.
+_EXPORTS = {
+    'Cli': '.cli',
+    'CliEnum': '.cli_enum',
+    'Metrics': '.metrics',
+    'AwsCli': '.aws.aws_cli',
+    'LambdaCli': '.aws.lambda_cli',
+    'ApigatewayCli': '.aws.apigateway_cli',
+    'S3Cli': '.aws.s3_cli',
+    'DynamodbCli': '.aws.dynamodb_cli',
+    'Docker': '.docker.docker',
+}
+
+__all__ = list(_EXPORTS)
+
+# the type checkers regard it as True. typing is not imported, because it takes longer than this module.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .aws.apigateway_cli import ApigatewayCli
+    from .aws.aws_cli import AwsCli
+    from .aws.dynamodb_cli import DynamodbCli
+    from .aws.lambda_cli import LambdaCli
+    from .aws.s3_cli import S3Cli
+    from .cli import Cli
+    from .cli_enum import CliEnum
+    from .docker.docker import Docker
+    from .metrics import Metrics
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    # the next access does not call this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -2,9 +2,11 @@
 # the following is not necessary if Python version is 3.9 or over.
 from __future__ import annotations
 
-import yaml
+import subprocess
+from pathlib import Path
 from .aws_cli import AwsCli
-from typing import List, Tuple, Optional
+from ..cli_enum import CliEnum
+from typing import Iterable, Iterator, List, Tuple, Optional
 
 '''
 This is API Gateway Command Class
@@ -17,8 +19,9 @@ class ApigatewayCli(AwsCli):
         Refer super class's constructor.
     '''
 
-    def __init__(self, aws_profile: str, environment: str, region='ap-northeast-1') -> ApigatewayCli:
-        super().__init__(aws_profile=aws_profile, environment=environment, region=region)
+    def __init__(self, aws_profile: str, environment: str, region='ap-northeast-1', backend=CliEnum.BACKEND_CLI) -> ApigatewayCli:
+        super().__init__(aws_profile=aws_profile, environment=environment,
+                         region=region, backend=backend)
 
     ''' create API on API Gateway
     Args:
@@ -48,6 +51,16 @@ class ApigatewayCli(AwsCli):
         self.createStage(api_id)
         self.exportApi(api_name, api_id)
 
+    ''' update API on API Gateway asynchronously.
+        Refer update.
+    '''
+
+    async def updateAsync(self, api_name: str, api_id: str, development_id: str) -> None:
+        cmd, params = self.__importApiRequest(api_id, api_name)
+        await self.execAwsAsync(cmd, 'apigateway', 'put_rest_api', params)
+        await self.createStageAsync(api_id)
+        await self.exportApiAsync(api_name, api_id)
+
     ''' export Rest API
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/apigateway/get-export.html
     Args:
@@ -58,8 +71,18 @@ class ApigatewayCli(AwsCli):
     '''
 
     def exportApi(self, api_name: str, api_id: str) -> subprocess.CompletedProcess:
-        cmd = f"aws apigateway get-export --parameters extensions='apigateway' --rest-api-id {api_id} --stage-name {self.environment} --export-type oas30 --accepts application/yaml config/apigateway/{api_name}-{self.environment}-oas30-apigateway.yaml"
-        ApigatewayCli.execCmd(cmd)
+        cmd, params = self.__exportApiRequest(api_name, api_id)
+        return self.execAws(cmd, 'apigateway', 'get_export', params,
+                            outfile=self.__exportFile(api_name))
+
+    ''' export Rest API asynchronously.
+        Refer exportApi.
+    '''
+
+    async def exportApiAsync(self, api_name: str, api_id: str) -> subprocess.CompletedProcess:
+        cmd, params = self.__exportApiRequest(api_name, api_id)
+        return await self.execAwsAsync(cmd, 'apigateway', 'get_export', params,
+                                       outfile=self.__exportFile(api_name))
 
     ''' check whether the api exists or not
     Args:
@@ -71,20 +94,32 @@ class ApigatewayCli(AwsCli):
     def exsistsApi(self, api_name: str) -> Tuple[Optional[str], Optional[str]]:
         api_id = None
         development_id = None
-        cmd = f"aws apigateway get-rest-apis --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        for item in output_yaml['items']:
+        # stop fetching the next page at the first match.
+        for item in self.iterRestApis():
             if item['name'] == api_name:
                 api_id = item['id']
                 break
         if api_id is not None:
-            cmd = f"aws apigateway get-stages --rest-api-id {api_id} --output yaml"
-            output = ApigatewayCli.execCmd(cmd)
-            output_yaml = yaml.safe_load(output.stdout)
-            for item in output_yaml['item']:
-                if item['stageName'] == self.environment:
-                    development_id = item['deploymentId']
+            cmd = f"aws apigateway get-stages --rest-api-id {api_id} --output json"
+            output = self.execAws(cmd, 'apigateway', 'get_stages',
+                                  {'restApiId': api_id})
+            development_id = self.__parseDeploymentId(output)
+        return api_id, development_id
+
+    ''' check whether the api exists or not asynchronously.
+        Refer exsistsApi.
+    '''
+
+    async def exsistsApiAsync(self, api_name: str) -> Tuple[Optional[str], Optional[str]]:
+        development_id = None
+        cmd = f"aws apigateway get-rest-apis --output json"
+        output = await self.execAwsAsync(cmd, 'apigateway', 'get_rest_apis')
+        api_id = ApigatewayCli.__parseApiId(output, api_name)
+        if api_id is not None:
+            cmd = f"aws apigateway get-stages --rest-api-id {api_id} --output json"
+            output = await self.execAwsAsync(cmd, 'apigateway', 'get_stages',
+                                             {'restApiId': api_id})
+            development_id = self.__parseDeploymentId(output)
         return api_id, development_id
 
     ''' deploy api at the stage (create)
@@ -96,10 +131,23 @@ class ApigatewayCli(AwsCli):
     '''
 
     def createStage(self, api_id: str) -> str:
-        cmd = f"aws apigateway create-deployment --rest-api-id {api_id} --stage-name {self.environment} --variables alias={self.environment} --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        deployment_id = output_yaml["id"]
+        cmd = f"aws apigateway create-deployment --rest-api-id {api_id} --stage-name {self.environment} --variables alias={self.environment} --output json"
+        output = self.execAws(cmd, 'apigateway', 'create_deployment',
+                              self.__deploymentParams(api_id))
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        deployment_id = output_json["id"]
+        return deployment_id
+
+    ''' deploy api at the stage asynchronously.
+        Refer createStage.
+    '''
+
+    async def createStageAsync(self, api_id: str) -> str:
+        cmd = f"aws apigateway create-deployment --rest-api-id {api_id} --stage-name {self.environment} --variables alias={self.environment} --output json"
+        output = await self.execAwsAsync(cmd, 'apigateway', 'create_deployment',
+                                         self.__deploymentParams(api_id))
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        deployment_id = output_json["id"]
         return deployment_id
 
     ''' get lambda infomation from resources
@@ -111,11 +159,56 @@ class ApigatewayCli(AwsCli):
     '''
 
     def getLambdaInfos(self, api_id: str) -> List[dict]:
-        cmd = f"aws apigateway get-resources --rest-api-id {api_id} --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
+        return ApigatewayCli.__toLambdaInfos(self.iterResources(api_id))
+
+    ''' get lambda infomation from resources asynchronously.
+        Refer getLambdaInfos.
+    '''
+
+    async def getLambdaInfosAsync(self, api_id: str) -> List[dict]:
+        cmd = f"aws apigateway get-resources --rest-api-id {api_id} --output json"
+        output = await self.execAwsAsync(cmd, 'apigateway', 'get_resources',
+                                         {'restApiId': api_id})
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        return ApigatewayCli.__toLambdaInfos(output_json['items'])
+
+    ''' iterate the Rest APIs.
+        Refer iterItems.
+    Args:
+        page_size (int, optional): the number of APIs fetched at once.
+    Yields:
+        dict: the Rest API.
+    '''
+
+    def iterRestApis(self, page_size=None) -> Iterator[dict]:
+        cmd = f"aws apigateway get-rest-apis --output json"
+        return self.iterItems(cmd, 'apigateway', 'get_rest_apis', 'items', page_size=page_size)
+
+    ''' iterate the resources of the Rest API.
+        Refer iterItems.
+    Args:
+        api_id (str): The string identifier of the associated RestApi .
+        page_size (int, optional): the number of resources fetched at once.
+    Yields:
+        dict: the resource.
+    '''
+
+    def iterResources(self, api_id: str, page_size=None) -> Iterator[dict]:
+        cmd = f"aws apigateway get-resources --rest-api-id {api_id} --output json"
+        return self.iterItems(cmd, 'apigateway', 'get_resources', 'items',
+                              {'restApiId': api_id}, page_size)
+
+    ''' convert the resources into lambda infomation.
+    Args:
+        resources (Iterable): the resources.
+    Returns:
+        list: lambda info
+    '''
+
+    @staticmethod
+    def __toLambdaInfos(resources: Iterable[dict]) -> List[dict]:
         lambda_infos = list()
-        for item in output_yaml['items']:
+        for item in resources:
             if 'pathPart' in item:
                 lambda_name = item['pathPart'].replace("-", "_")
                 lambda_info = {'lambda_name': lambda_name,
@@ -134,16 +227,15 @@ class ApigatewayCli(AwsCli):
     '''
 
     def __createRestapi(self, api_name: str) -> Tuple[str, str]:
-        cmd = f"aws apigateway create-rest-api --name {api_name} --region {self.region} --endpoint-configuration types=REGIONAL --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
+        cmd = f"aws apigateway create-rest-api --name {api_name} --region {self.region} --endpoint-configuration types=REGIONAL --output json"
+        params = {'name': api_name,
+                  'endpointConfiguration': {'types': ['REGIONAL']}}
+        output = self.execAws(cmd, 'apigateway', 'create_rest_api', params)
         # get rest-api-id
-        output_yaml = yaml.safe_load(output.stdout)
-        rest_api_id = output_yaml['id']
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        rest_api_id = output_json['id']
         # get resource-id
-        cmd = f"aws apigateway get-resources --rest-api-id {rest_api_id} --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        for item in output_yaml['items']:
+        for item in self.iterResources(rest_api_id, page_size=1):
             parent_id = item['id']
             break
         return rest_api_id, parent_id
@@ -159,10 +251,12 @@ class ApigatewayCli(AwsCli):
     '''
 
     def __createResource(self, api_id: str, parent_id: str, path_part: str) -> str:
-        cmd = f"aws apigateway create-resource --rest-api-id {api_id} --parent-id {parent_id} --path-part {path_part} --output yaml"
-        output = ApigatewayCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        resource_id = output_yaml["id"]
+        cmd = f"aws apigateway create-resource --rest-api-id {api_id} --parent-id {parent_id} --path-part {path_part} --output json"
+        params = {'restApiId': api_id,
+                  'parentId': parent_id, 'pathPart': path_part}
+        output = self.execAws(cmd, 'apigateway', 'create_resource', params)
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        resource_id = output_json["id"]
         return resource_id
 
     ''' create a method on the resource
@@ -180,7 +274,9 @@ class ApigatewayCli(AwsCli):
 
     def __putMethod(self, api_id: str, resource_id: str, http_method: str, authorization_type: str) -> subprocess.CompletedProcess:
         cmd = f"aws apigateway put-method --rest-api-id {api_id} --resource-id {resource_id} --http-method {http_method} --authorization-type {authorization_type}"
-        ApigatewayCli.execCmd(cmd)
+        params = {'restApiId': api_id, 'resourceId': resource_id,
+                  'httpMethod': http_method, 'authorizationType': authorization_type}
+        return self.execAws(cmd, 'apigateway', 'put_method', params)
 
     ''' set integration into the method
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/apigateway/put-integration.html
@@ -195,7 +291,9 @@ class ApigatewayCli(AwsCli):
 
     def __putIntegration(self, api_id: str, resource_id: str, http_method: str, type: str) -> subprocess.CompletedProcess:
         cmd = f"aws apigateway put-integration --rest-api-id {api_id} --resource-id {resource_id} --http-method {http_method} --type {type}"
-        ApigatewayCli.execCmd(cmd)
+        params = {'restApiId': api_id, 'resourceId': resource_id,
+                  'httpMethod': http_method, 'type': type}
+        return self.execAws(cmd, 'apigateway', 'put_integration', params)
 
     ''' import Rest API
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/apigateway/put-rest-api.html
@@ -207,5 +305,81 @@ class ApigatewayCli(AwsCli):
     '''
 
     def __importApi(self, api_id: str, api_name: str) -> subprocess.CompletedProcess:
-        cmd = f"aws apigateway put-rest-api --rest-api-id {api_id} --mode overwrite --cli-binary-format raw-in-base64-out --body 'file://config/apigateway/{api_name}-{self.environment}-oas30-apigateway.yaml' --output yaml"
-        ApigatewayCli.execCmd(cmd)
+        cmd, params = self.__importApiRequest(api_id, api_name)
+        return self.execAws(cmd, 'apigateway', 'put_rest_api', params)
+
+    ''' build the request of put-rest-api.
+        Refer __importApi.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+
+    def __importApiRequest(self, api_id: str, api_name: str) -> Tuple[str, dict]:
+        cmd = f"aws apigateway put-rest-api --rest-api-id {api_id} --mode overwrite --cli-binary-format raw-in-base64-out --body 'file://{self.__exportFile(api_name)}' --output json"
+        params = {'restApiId': api_id, 'mode': 'overwrite',
+                  'body': Path(self.__exportFile(api_name))}
+        return cmd, params
+
+    ''' build the request of get-export.
+        Refer exportApi.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+
+    def __exportApiRequest(self, api_name: str, api_id: str) -> Tuple[str, dict]:
+        cmd = f"aws apigateway get-export --parameters extensions='apigateway' --rest-api-id {api_id} --stage-name {self.environment} --export-type oas30 --accepts application/yaml {self.__exportFile(api_name)}"
+        params = {'restApiId': api_id, 'stageName': self.environment, 'exportType': 'oas30',
+                  'parameters': {'extensions': 'apigateway'}, 'accepts': 'application/yaml'}
+        return cmd, params
+
+    ''' get the path of the exported API definition.
+    Args:
+        api_name (str): The name of the API.
+    Returns:
+        str: the file path.
+    '''
+
+    def __exportFile(self, api_name: str) -> str:
+        return f"config/apigateway/{api_name}-{self.environment}-oas30-apigateway.yaml"
+
+    ''' build the parameters of create-deployment.
+    Args:
+        api_id (str): The string identifier of the associated RestApi .
+    Returns:
+        dict: the parameters of the operation.
+    '''
+
+    def __deploymentParams(self, api_id: str) -> dict:
+        return {'restApiId': api_id, 'stageName': self.environment,
+                'variables': {'alias': self.environment}}
+
+    ''' parse the result of get-rest-apis into the api id.
+    Args:
+        output (subprocess.CompletedProcess): the result of get-rest-apis.
+        api_name (str): The name of the API.
+    Returns:
+        str: The string identifier of the associated RestApi or None.
+    '''
+
+    @staticmethod
+    def __parseApiId(output: subprocess.CompletedProcess, api_name: str) -> Optional[str]:
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        for item in output_json['items']:
+            if item['name'] == api_name:
+                return item['id']
+        return None
+
+    ''' parse the result of get-stages into the deployment id of the environment.
+    Args:
+        output (subprocess.CompletedProcess): the result of get-stages.
+    Returns:
+        str: The identifier for the deployment resource or None.
+    '''
+
+    def __parseDeploymentId(self, output: subprocess.CompletedProcess) -> Optional[str]:
+        development_id = None
+        output_json = ApigatewayCli.parseOutput(output.stdout)
+        for item in output_json['item']:
+            if item['stageName'] == self.environment:
+                development_id = item['deploymentId']
+        return development_id
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import base64
+import datetime
+import json
+import subprocess
+import threading
+from pathlib import Path
+# botocore is imported when a backend is created, because it takes longer than the rest of this package.
+
+'''
+This is in-process AWS API Backend Class
+'''
+
+
+class BotocoreBackend:
+    # the maximum number of pooled HTTP connections per client.
+    MAX_POOL_CONNECTIONS = 32
+    # the exit codes of the aws cli (v2).
+    RETURNCODE_CLIENT_ERROR = 254
+    RETURNCODE_ERROR = 255
+    __backends = dict()
+    __backends_lock = threading.Lock()
+
+    ''' constructor.
+        Use BotocoreBackend.get in order to share the session and connections.
+    Args:
+        aws_profile (str): AWS Profile Name (define it in ~/.aws/credentials).
+        region (str): the target region.
+    '''
+
+    def __init__(self, aws_profile: str, region: str) -> BotocoreBackend:
+        try:
+            import botocore.session
+        except ImportError:
+            raise ImportError(
+                'botocore is required for BACKEND_BOTOCORE. Please install it: pip install botocore')
+        self.aws_profile = aws_profile
+        self.region = region
+        self.session = botocore.session.Session(profile=aws_profile)
+        self.__clients = dict()
+        self.__clients_lock = threading.Lock()
+
+    ''' get the backend shared by the profile and the region.
+    Args:
+        aws_profile (str): AWS Profile Name (define it in ~/.aws/credentials).
+        region (str): the target region.
+    Returns:
+        BotocoreBackend: the backend.
+    '''
+    @staticmethod
+    def get(aws_profile: str, region: str) -> BotocoreBackend:
+        key = (aws_profile, region)
+        with BotocoreBackend.__backends_lock:
+            if key not in BotocoreBackend.__backends:
+                BotocoreBackend.__backends[key] = BotocoreBackend(
+                    aws_profile, region)
+            return BotocoreBackend.__backends[key]
+
+    ''' get the client of the service. The client is created once and reused.
+        e.g. botocore.stub.Stubber(backend.client('lambda')) stubs the responses.
+    Args:
+        service (str): the service name. e.g. lambda, apigateway
+    Returns:
+        botocore.client.BaseClient: the client.
+    '''
+
+    def client(self, service: str):
+        from botocore.config import Config
+        with self.__clients_lock:
+            if service not in self.__clients:
+                # botocore does not retry, since AwsCli.execAws retries by AwsRetry.
+                config = Config(max_pool_connections=BotocoreBackend.MAX_POOL_CONNECTIONS,
+                                retries={'total_max_attempts': 1, 'mode': 'standard'})
+                self.__clients[service] = self.session.create_client(
+                    service, region_name=self.region, config=config)
+            return self.__clients[service]
+
+    ''' call the API operation.
+        The paginated operation is fetched to the end, like the aws cli.
+    Args:
+        service (str): the service name. e.g. lambda, apigateway
+        operation (str): the operation name of the client. e.g. get_function
+        params (dict): the parameters of the operation.
+            pathlib.Path values are replaced with the file contents, like fileb:// of the aws cli.
+        outfile (str, optional): the file path in which the streaming body of the response is written.
+    Returns:
+        subprocess.CompletedProcess: the result whose stdout is the response as json,
+            and whose returncode and stderr are the same as the aws cli.
+    '''
+
+    def call(self, service: str, operation: str, params: dict, outfile=None) -> subprocess.CompletedProcess:
+        from botocore.exceptions import BotoCoreError, ClientError
+        args = f"botocore {service} {operation}"
+        try:
+            client = self.client(service)
+            params = BotocoreBackend.__resolve(params)
+            if client.can_paginate(operation):
+                response = client.get_paginator(operation).paginate(
+                    **params).build_full_result()
+            else:
+                response = getattr(client, operation)(**params)
+        except ClientError as e:
+            return subprocess.CompletedProcess(args, BotocoreBackend.RETURNCODE_CLIENT_ERROR, '', f"\n{e}\n")
+        except BotoCoreError as e:
+            return subprocess.CompletedProcess(args, BotocoreBackend.RETURNCODE_ERROR, '', f"\n{e}\n")
+        response.pop('ResponseMetadata', None)
+        if outfile:
+            with open(outfile, 'wb') as file:
+                file.write(response.pop('body').read())
+        stdout = json.dumps(response, default=BotocoreBackend.__serialize)
+        return subprocess.CompletedProcess(args, 0, stdout, '')
+
+    ''' replace pathlib.Path values in the parameters with the file contents.
+    Args:
+        value (object): the parameters.
+    Returns:
+        object: the parameters which are able to be sent.
+    '''
+    @staticmethod
+    def __resolve(value: object) -> object:
+        if isinstance(value, Path):
+            return value.expanduser().read_bytes()
+        if isinstance(value, dict):
+            return {key: BotocoreBackend.__resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [BotocoreBackend.__resolve(item) for item in value]
+        return value
+
+    ''' serialize the values which json does not support, in the same way as the aws cli.
+    Args:
+        value (object): the value.
+    Returns:
+        object: the serializable value.
+    '''
+    @staticmethod
+    def __serialize(value: object) -> object:
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        if hasattr(value, 'read'):
+            value = value.read()
+        if isinstance(value, bytes):
+            return base64.b64encode(value).decode()
+        return str(value)
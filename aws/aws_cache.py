@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+from ..cli import Cli
+
+'''
+This is AWS Response Cache Class
+'''
+
+
+class AwsCache:
+    # the seconds while a response is valid. 0 (defalt) disables the cache, so that it is enabled explicitly.
+    # e.g. AwsCache.TTL = 60
+    TTL = 0
+    # the number of responses kept. The least recently used one is evicted over it.
+    MAX_ENTRIES = 1024
+    # whether the responses are saved on the disk at exit and loaded by the next run.
+    PERSIST = False
+    # the directory in which the responses are saved.
+    CACHE_DIR = '~/.cache/python-cli'
+    # the read-only operations whose responses are cached.
+    OPERATIONS = {
+        ('lambda', 'get-function'), ('lambda', 'get-alias'), ('lambda', 'list-layers'),
+        ('iam', 'list-roles'), ('apigateway', 'get-rest-apis'), ('apigateway', 'get-resources'),
+    }
+    # the operations which change the resources & invalidate the responses of the same service.
+    MUTATING_PREFIXES = ('create-', 'update-', 'delete-', 'put-', 'publish-',
+                         'add-', 'remove-', 'import-', 'tag-', 'untag-')
+    # the options which identify the resource of an operation.
+    RESOURCE_OPTIONS = ('--function-name', '--rest-api-id',
+                        '--layer-name', '--role-name')
+    # whether the failures of NOT_FOUND_ERRORS are cached as well as the successes.
+    # it saves the existence checks, but a resource created by another process is not found until TTL passes.
+    CACHE_NOT_FOUND = False
+    # the failures which are cached when CACHE_NOT_FOUND is True.
+    NOT_FOUND_ERRORS = ('ResourceNotFoundException',
+                        'NotFoundException', 'NoSuchEntity')
+    __entries = OrderedDict()
+    __lock = threading.Lock()
+    # it increases per invalidation, so that the response fetched before a mutation is not stored after it.
+    __generation = 0
+    __loaded = False
+    __registered = False
+
+    ''' get the cached response of a command.
+    Args:
+        aws_profile (str): AWS Profile Name.
+        region (str): the target region.
+        cmd (str): the aws cli command.
+    Returns:
+        tuple: the response (None when it is not cached) & the generation given to store.
+    e.g.
+        result, generation = AwsCache.lookup('my-profile', 'ap-northeast-1', cmd)
+        if result is None:
+            result = Cli.execCmd(cmd)
+            AwsCache.store('my-profile', 'ap-northeast-1', cmd, result, generation)
+    '''
+    @staticmethod
+    def lookup(aws_profile: str, region: str, cmd: str) -> Tuple[Optional[subprocess.CompletedProcess], int]:
+        words = AwsCache.__split(cmd)
+        if AwsCache.TTL <= 0 or tuple(words[1:3]) not in AwsCache.OPERATIONS:
+            return None, None
+        key = AwsCache.__key(aws_profile, region, words)
+        with AwsCache.__lock:
+            AwsCache.__load()
+            entry = AwsCache.__entries.get(key)
+            if entry is not None and time.time() - entry['CachedAt'] > AwsCache.TTL:
+                del AwsCache.__entries[key]
+                entry = None
+            if entry is None:
+                return None, AwsCache.__generation
+            AwsCache.__entries.move_to_end(key)
+        return subprocess.CompletedProcess(entry['Args'], entry['ReturnCode'],
+                                           entry['Stdout'], entry['Stderr']), None
+
+    ''' cache the response of a command got by lookup.
+    Args:
+        aws_profile (str): AWS Profile Name.
+        region (str): the target region.
+        cmd (str): the aws cli command.
+        result (subprocess.CompletedProcess): the response.
+        generation (int): the generation returned by lookup. The response is not cached when it is None.
+    '''
+    @staticmethod
+    def store(aws_profile: str, region: str, cmd: str, result: subprocess.CompletedProcess, generation: Optional[int]) -> None:
+        if generation is None:
+            return
+        if result.returncode != 0 and not (AwsCache.CACHE_NOT_FOUND and any(
+                error in (result.stderr or '') for error in AwsCache.NOT_FOUND_ERRORS)):
+            return
+        words = AwsCache.__split(cmd)
+        key = AwsCache.__key(aws_profile, region, words)
+        with AwsCache.__lock:
+            if generation != AwsCache.__generation:
+                return
+            AwsCache.__entries[key] = {
+                'Profile': aws_profile, 'Region': region, 'Service': words[1],
+                'Resource': AwsCache.__resource(words), 'CachedAt': time.time(),
+                'Args': result.args, 'ReturnCode': result.returncode,
+                'Stdout': result.stdout, 'Stderr': result.stderr
+            }
+            AwsCache.__entries.move_to_end(key)
+            while len(AwsCache.__entries) > AwsCache.MAX_ENTRIES:
+                AwsCache.__entries.popitem(last=False)
+            if AwsCache.PERSIST and not AwsCache.__registered:
+                atexit.register(AwsCache.save)
+                AwsCache.__registered = True
+
+    ''' invalidate the responses touching the resource of a mutating command.
+        The responses of the same resource and the listings of the service (e.g. list-layers) are removed.
+    Args:
+        aws_profile (str): AWS Profile Name.
+        region (str): the target region.
+        cmd (str): the aws cli command.
+    Returns:
+        bool: True when the command is mutating.
+    '''
+    @staticmethod
+    def invalidate(aws_profile: str, region: str, cmd: str) -> bool:
+        words = AwsCache.__split(cmd)
+        if len(words) < 3 or not words[2].startswith(AwsCache.MUTATING_PREFIXES):
+            return False
+        resource = AwsCache.__resource(words)
+        with AwsCache.__lock:
+            AwsCache.__generation += 1
+            for key, entry in list(AwsCache.__entries.items()):
+                if (entry['Profile'], entry['Region'], entry['Service']) != (aws_profile, region, words[1]):
+                    continue
+                if resource is None or entry['Resource'] is None or entry['Resource'] == resource:
+                    del AwsCache.__entries[key]
+        return True
+
+    ''' clear all responses, including the ones saved on the disk.
+    '''
+    @staticmethod
+    def clear() -> None:
+        with AwsCache.__lock:
+            AwsCache.__generation += 1
+            AwsCache.__entries.clear()
+            AwsCache.__loaded = True
+        try:
+            os.remove(AwsCache.__cacheFile())
+        except OSError:
+            pass
+
+    ''' save the responses on the disk when PERSIST is True. It is called at exit.
+    '''
+    @staticmethod
+    def save() -> None:
+        if not AwsCache.PERSIST:
+            return
+        with AwsCache.__lock:
+            entries = {'\t'.join(key): entry for key,
+                       entry in AwsCache.__entries.items()}
+        Cli.writeAtomic(AwsCache.__cacheFile(), json.dumps(entries))
+
+    ''' load the responses saved on the disk at the first lookup. It is called with the lock.
+    '''
+    @staticmethod
+    def __load() -> None:
+        if AwsCache.__loaded or not AwsCache.PERSIST:
+            return
+        AwsCache.__loaded = True
+        try:
+            with open(AwsCache.__cacheFile()) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]['CachedAt']):
+            if now - entry['CachedAt'] <= AwsCache.TTL:
+                AwsCache.__entries.setdefault(tuple(key.split('\t')), entry)
+
+    ''' get the path of the responses saved on the disk.
+    Returns:
+        Path: the file path.
+    '''
+    @staticmethod
+    def __cacheFile() -> Path:
+        return Path(AwsCache.CACHE_DIR).expanduser() / 'responses.json'
+
+    ''' split the command into the words.
+    Args:
+        cmd (str): the aws cli command.
+    Returns:
+        list: the words.
+    '''
+    @staticmethod
+    def __split(cmd: str) -> list:
+        try:
+            return shlex.split(cmd)
+        except ValueError:
+            return cmd.split()
+
+    ''' get the key of the command, whose options are sorted so that their order does not matter.
+    Args:
+        aws_profile (str): AWS Profile Name.
+        region (str): the target region.
+        words (list): the words of the command.
+    Returns:
+        tuple: the key.
+    '''
+    @staticmethod
+    def __key(aws_profile: str, region: str, words: list) -> Tuple[str, str, str]:
+        options = []
+        for word in words[3:]:
+            if word.startswith('--') or not options:
+                options.append([word])
+            else:
+                options[-1].append(word)
+        normalized = words[:3] + [' '.join(option)
+                                  for option in sorted(options)]
+        return aws_profile, region, ' '.join(normalized)
+
+    ''' get the resource of the command. e.g. the function name of --function-name my_function:dev
+    Args:
+        words (list): the words of the command.
+    Returns:
+        str: the resource, or None when the command has no resource option. e.g. list-layers
+    '''
+    @staticmethod
+    def __resource(words: list) -> Optional[str]:
+        for option in AwsCache.RESOURCE_OPTIONS:
+            if option in words[:-1]:
+                value = words[words.index(option) + 1]
+                # arn:aws:lambda:{region}:{account}:function:{name}[:{qualifier}]
+                if value.startswith('arn:'):
+                    return value.split(':')[6] if value.count(':') >= 6 else value
+                return value.split(':')[0]
+        return None
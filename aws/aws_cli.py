@@ -2,9 +2,15 @@
 # the following is not necessary if Python version is 3.9 or over.
 from __future__ import annotations
 
-import os
-import yaml
+import shlex
+import subprocess
+import time
+from typing import Iterable, Iterator, Optional, Tuple
 from ..cli import Cli
+from ..cli_enum import CliEnum
+from .aws_cache import AwsCache
+from .aws_retry import AwsRetry
+from .aws_session import AwsSession
 
 '''
 This is AWS Command Class
@@ -12,23 +18,33 @@ This is AWS Command Class
 
 
 class AwsCli(Cli):
+    # the number of items fetched by a command of iterItems.
+    PAGE_SIZE = 1000
 
     ''' constructor.
     Args:
         aws_profile (str): AWS Profile Name (define it in ~/.aws/credentials).
         region (str): the target region.
         environment (str, optional): the target environment.
+        backend (int, optional): the way of executing AWS operations.
+            BACKEND_CLI(defalt): run the aws cli.
+            BACKEND_BOTOCORE: call the API in this process with the shared botocore session.
+    Note:
+        The instances of the same profile and region share the session (AwsSession),
+        so the caller identity is got only once. os.environ is not changed:
+        the profile is given to each command executed by execAws.
     '''
 
-    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1') -> AwsCli:
+    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1', backend=CliEnum.BACKEND_CLI) -> AwsCli:
         self.aws_profile = aws_profile
-        os.environ['AWS_PROFILE'] = aws_profile
-        cmd = f"aws sts get-caller-identity --output yaml"
-        output = AwsCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        self.aws_account = output_yaml['Account']
-        self.aws_arn = output_yaml['Arn']
         self.region = region
+        self.backend = backend
+        self.session = AwsSession.get(aws_profile, region)
+        self.botocore = self.session.botocore \
+            if backend == CliEnum.BACKEND_BOTOCORE else None
+        identity = self.session.getIdentity(self.botocore)
+        self.aws_account = identity['Account']
+        self.aws_arn = identity['Arn']
         if environment is not None:
             self.environment = environment
 
@@ -42,18 +58,211 @@ class AwsCli(Cli):
         del self.aws_arn
         del self.aws_account
         del self.aws_profile
+        del self.backend
+        del self.botocore
+        del self.session
+
+    ''' execute an AWS operation with the backend of this instance.
+        The failures are classified by AwsRetry: throttles, transient failures and conflicts are retried
+        with jittered exponential backoff, and the operations running at the same time are limited
+        per service by the AIMD limiter of the session.
+        The transient failures are retried only for the idempotent operations, since the request may have been committed.
+        The aws cli and botocore do not retry by themselves, so that the retries are not multiplied.
+        The responses of the read-only operations in AwsCache.OPERATIONS are cached when AwsCache.TTL is set,
+        and a mutating operation invalidates the cached responses of the same resource.
+    Args:
+        cmd (str): the aws cli command executed by BACKEND_CLI.
+        service (str, optional): the service name called by BACKEND_BOTOCORE. e.g. lambda
+        operation (str, optional): the operation name called by BACKEND_BOTOCORE. e.g. get_function
+            When it is None, the command is executed even by BACKEND_BOTOCORE.
+        params (dict, optional): the parameters of the operation.
+        error_option (int, optional): the option when an error happens after the retries.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+        outfile (str, optional): the file path in which the streaming body of the response is written.
+        idempotent (bool, optional): whether the transient failures are retried.
+            AwsRetry.isIdempotent decides it by the operation when it is None.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command.
+    '''
+
+    def execAws(self, cmd: str, service=None, operation=None, params=None, error_option=CliEnum.CMD_OPTION_STOP, outfile=None, idempotent=None) -> subprocess.CompletedProcess:
+        result, generation = AwsCache.lookup(self.aws_profile, self.region, cmd)
+        if result is not None:
+            return result if result.returncode == 0 or error_option == CliEnum.CMD_OPTION_CONTINUE \
+                else AwsCli.checkResult(result, error_option)
+        limiter = self.session.limiter(service or AwsRetry.service(cmd))
+        if idempotent is None:
+            idempotent = AwsRetry.isIdempotent(cmd)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = limiter.acquire()
+            failure = CliEnum.FAILURE_FATAL
+            try:
+                if self.botocore is None or operation is None:
+                    result = AwsCli.execCmd(
+                        cmd, CliEnum.CMD_OPTION_CONTINUE, self.session.env)
+                else:
+                    result = AwsCli.execFunc(f"[botocore] {service} {operation}",
+                                             lambda: self.botocore.call(
+                                                 service, operation, params or dict(), outfile),
+                                             CliEnum.CMD_OPTION_CONTINUE)
+                failure = AwsRetry.classify(result)
+            finally:
+                limiter.release(failure, started)
+            if not AwsRetry.isRetried(failure, attempt, idempotent):
+                break
+            time.sleep(AwsRetry.backoff(failure, attempt))
+        if not AwsCache.invalidate(self.aws_profile, self.region, cmd):
+            AwsCache.store(self.aws_profile, self.region,
+                           cmd, result, generation)
+        if failure is None or error_option == CliEnum.CMD_OPTION_CONTINUE:
+            return result
+        return AwsCli.checkResult(result, error_option)
+
+    ''' execute an AWS operation with the backend of this instance asynchronously.
+        Refer execAws.
+    '''
+
+    async def execAwsAsync(self, cmd: str, service=None, operation=None, params=None, error_option=CliEnum.CMD_OPTION_STOP, outfile=None, idempotent=None) -> subprocess.CompletedProcess:
+        import asyncio
+        result, generation = AwsCache.lookup(self.aws_profile, self.region, cmd)
+        if result is not None:
+            return result if result.returncode == 0 or error_option == CliEnum.CMD_OPTION_CONTINUE \
+                else AwsCli.checkResult(result, error_option)
+        limiter = self.session.limiter(service or AwsRetry.service(cmd))
+        if idempotent is None:
+            idempotent = AwsRetry.isIdempotent(cmd)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = await limiter.acquireAsync()
+            failure = CliEnum.FAILURE_FATAL
+            try:
+                if self.botocore is None or operation is None:
+                    result = await AwsCli.execCmdAsync(cmd, CliEnum.CMD_OPTION_CONTINUE, self.session.env)
+                else:
+                    result = await AwsCli.execFuncAsync(f"[botocore] {service} {operation}",
+                                                        lambda: self.botocore.call(
+                                                            service, operation, params or dict(), outfile),
+                                                        CliEnum.CMD_OPTION_CONTINUE)
+                failure = AwsRetry.classify(result)
+            finally:
+                limiter.release(failure, started)
+            if not AwsRetry.isRetried(failure, attempt, idempotent):
+                break
+            await asyncio.sleep(AwsRetry.backoff(failure, attempt))
+        if not AwsCache.invalidate(self.aws_profile, self.region, cmd):
+            AwsCache.store(self.aws_profile, self.region,
+                           cmd, result, generation)
+        if failure is None or error_option == CliEnum.CMD_OPTION_CONTINUE:
+            return result
+        return AwsCli.checkResult(result, error_option)
+
+    ''' iterate the items of a paginated AWS operation page by page.
+        The next page is fetched (--max-items & --starting-token) only when the items are consumed,
+        so the iteration can stop early and huge listings are processed in constant memory.
+    Args:
+        cmd (str): the aws cli command without the pagination options.
+        service (str): the service name called by BACKEND_BOTOCORE. e.g. iam
+        operation (str): the operation name called by BACKEND_BOTOCORE. e.g. list_roles
+        result_key (str): the key of the items in the result. e.g. Roles
+        params (dict, optional): the parameters of the operation.
+        page_size (int, optional): the number of items fetched at once. PAGE_SIZE is used when it is None.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: end the iteration at the failed page.
+    Yields:
+        dict: an item.
+    '''
+
+    def iterItems(self, cmd: str, service: str, operation: str, result_key: str, params=None, page_size=None, error_option=CliEnum.CMD_OPTION_STOP) -> Iterator[dict]:
+        for items, _ in self.iterPages(cmd, service, operation, result_key, params, page_size, error_option=error_option):
+            yield from items
+
+    ''' iterate the pages of a paginated AWS operation with the token of the next page.
+        The token can be saved in order to resume the iteration later by starting_token.
+        Refer iterItems.
+    Args:
+        starting_token (str, optional): the token of the page which the iteration starts from.
+    Yields:
+        tuple: the items of the page & the token of the next page, which is None at the last page.
+    '''
 
-    ''' get information of IAM Roles.
+    def iterPages(self, cmd: str, service: str, operation: str, result_key: str, params=None, page_size=None, starting_token=None, error_option=CliEnum.CMD_OPTION_STOP) -> Iterator[Tuple[list, Optional[str]]]:
+        page_size = page_size or AwsCli.PAGE_SIZE
+        token = starting_token
+        while True:
+            page_cmd = f"{cmd} --max-items {page_size}"
+            pagination = {'MaxItems': page_size}
+            if token:
+                page_cmd += f" --starting-token {shlex.quote(token)}"
+                pagination['StartingToken'] = token
+            page_params = dict(params or dict(), PaginationConfig=pagination)
+            output = self.execAws(page_cmd, service, operation,
+                                  page_params, error_option)
+            if output.returncode != 0:
+                return
+            # the output is empty when nothing is listed. e.g. list-objects-v2 of an empty prefix
+            output_json = AwsCli.parseOutput(output.stdout) or dict()
+            token = output_json.get('NextToken')
+            yield output_json.get(result_key, []), token
+            if not token:
+                return
+
+    ''' iterate IAM Roles.
+        Refer iterItems.
+    Args:
+        page_size (int, optional): the number of roles fetched at once.
+    Yields:
+        dict: IAM Role.
+    '''
+
+    def iterRoles(self, page_size=None) -> Iterator[dict]:
+        cmd = 'aws iam list-roles --output json'
+        return self.iterItems(cmd, 'iam', 'list_roles', 'Roles', page_size=page_size)
+
+    ''' get information of IAM Roles with the profile, region and backend of this instance.
+        It can be called on the class too for the compatibility (AwsCli.getRoles()), but then the aws cli is executed
+        with os.environ, whose profile is not the one of the instances any more since they do not change os.environ.
+        A warning is output in that case.
     Returns:
         dict: IAM Roles.
+    e.g.
+        roles = lambda_cli.getRoles()
+        roles = AwsCli.getRoles(lambda_cli)
     '''
-    @staticmethod
-    def getRoles() -> dict:
-        cmd = 'aws iam list-roles --output yaml'
+
+    def getRoles(self=None) -> dict:
+        if self is not None:
+            return AwsCli.__toRoles(self.iterRoles())
+        AwsCli.stdout('AwsCli.getRoles() uses the profile of os.environ, not the one of the instances. '
+                      'Call getRoles on an instance.', CliEnum.SEVERIY_WARN)
+        cmd = 'aws iam list-roles --output json'
         output = AwsCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
+        return AwsCli.__toRoles(AwsCli.parseOutput(output.stdout)['Roles'])
+
+    ''' get information of IAM Roles asynchronously.
+        Refer getRoles.
+    '''
+
+    async def getRolesAsync(self) -> dict:
+        cmd = 'aws iam list-roles --output json'
+        output = await self.execAwsAsync(cmd, 'iam', 'list_roles')
+        output_json = AwsCli.parseOutput(output.stdout)
+        return AwsCli.__toRoles(output_json['Roles'])
+
+    ''' convert IAM Roles into the information.
+    Args:
+        roles_iter (Iterable): IAM Roles.
+    Returns:
+        dict: IAM Roles.
+    '''
+    @staticmethod
+    def __toRoles(roles_iter: Iterable[dict]) -> dict:
         roles = dict()
-        for role in output_yaml['Roles']:
+        for role in roles_iter:
             roles[role['RoleName']] = {
                 'Arn': role['Arn'],
                 'RoleId': role['RoleId']
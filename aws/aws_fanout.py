@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from typing import Callable, Iterable, Tuple, Type, Union
+from ..cli_enum import CliEnum
+from .aws_cli import AwsCli
+
+'''
+This is AWS Multi Target Execution Class
+'''
+
+
+class AwsFanout:
+
+    ''' constructor.
+        The same operation is executed on each target (profile & region) at the same time.
+        Each target has its own session, whose environment variables (AWS_PROFILE & AWS_REGION)
+        are given to its commands only, so os.environ is never changed.
+    Args:
+        targets (Iterable): the targets (aws_profile, region).
+        environment (str, optional): the target environment given to the instances. e.g. dev
+        max_workers (int, optional): the number of targets executed at the same time. All targets when it is None.
+        backend (int, optional): the backend of the instances. Refer AwsCli.
+    e.g.
+        fanout = AwsFanout([('account-a', 'ap-northeast-1'), ('account-a', 'us-east-1'),
+                            ('account-b', 'ap-northeast-1')], 'dev')
+        report = fanout.run(LambdaCli, 'updateFunction', 'my_function', 'dist/my_function.zip',
+                            role, 30, 128, layers, incremental=True)
+        report = fanout.run(S3Cli, lambda s3: s3.syncUpload('dist', 'my-backet', 'lambda'))
+    Note:
+        ApigatewayCli exports the API into the same file for all targets,
+        so run its operations reading the file (e.g. update) with max_workers=1.
+    '''
+
+    def __init__(self, targets: Iterable[Tuple[str, str]], environment=None, max_workers=None, backend=CliEnum.BACKEND_CLI) -> AwsFanout:
+        self.targets = list(dict.fromkeys(tuple(target) for target in targets))
+        self.environment = environment
+        self.max_workers = max_workers or len(self.targets) or 1
+        self.backend = backend
+        self.__instances = dict()
+
+    ''' get the instance of the class for the target, which is created once and reused.
+    Args:
+        cli_class (Type[AwsCli]): the class. e.g. LambdaCli
+        target (tuple): the target (aws_profile, region).
+    Returns:
+        AwsCli: the instance.
+    '''
+
+    def instance(self, cli_class: Type[AwsCli], target: Tuple[str, str]) -> AwsCli:
+        key = (cli_class, target)
+        if key not in self.__instances:
+            aws_profile, region = target
+            self.__instances[key] = cli_class(
+                aws_profile, self.environment, region=region, backend=self.backend)
+        return self.__instances[key]
+
+    ''' execute the operation on all targets at the same time.
+        A target fails when the operation stops the processing (an error of CMD_OPTION_STOP),
+        raises an error, or returns subprocess.CompletedProcess whose returncode is not 0.
+        The other targets are not affected by it.
+    Args:
+        cli_class (Type[AwsCli]): the class executing the operation. e.g. LambdaCli, ApigatewayCli, S3Cli
+        operation (str or Callable): the method name, or the function called with the instance.
+        *args: the arguments of the method.
+        error_option (int, optional): the option when a target fails.
+            CMD_OPTION_STOP(defalt): stop the processing after all targets finish.
+            CMD_OPTION_CONTINUE: continue the processing.
+        **kwargs: the keyword arguments of the method.
+    Returns:
+        dict: the results (Results), the errors (Failures) and the seconds (Seconds) by the target.
+            The result of a target stopped by CMD_OPTION_STOP is the failed command (subprocess.CompletedProcess),
+            and its error has the command & its stderr.
+    '''
+
+    def run(self, cli_class: Type[AwsCli], operation: Union[str, Callable[[AwsCli], object]], *args, error_option=CliEnum.CMD_OPTION_STOP, **kwargs) -> dict:
+        report = {'Results': dict(), 'Failures': dict(), 'Seconds': dict()}
+
+        def execute(target: Tuple[str, str]) -> None:
+            started = time.perf_counter()
+            # the worker threads are reused, so the error of the earlier target is told apart.
+            last_error = AwsCli.getLastError()
+            try:
+                # the instance is created on the worker, since its constructor gets the caller identity.
+                cli = self.instance(cli_class, target)
+                result = getattr(cli, operation)(*args, **kwargs) if isinstance(operation, str) \
+                    else operation(cli)
+                report['Results'][target] = result
+                if isinstance(result, subprocess.CompletedProcess) and result.returncode != 0:
+                    report['Failures'][target] = (result.stderr or '').strip() \
+                        or f"returncode {result.returncode}"
+            # sys.exit() of CMD_OPTION_STOP stops only this target.
+            except SystemExit:
+                error = AwsCli.getLastError()
+                if error is None or error is last_error:
+                    report['Failures'][target] = 'stopped by the error of a command'
+                else:
+                    # the failed command is reported like the result of CMD_OPTION_CONTINUE.
+                    report['Results'][target] = error
+                    report['Failures'][target] = f"{error.args}: " + \
+                        ((error.stderr or '').strip() or f"returncode {error.returncode}")
+            except Exception as e:
+                report['Failures'][target] = f"{type(e).__name__}: {e}"
+            finally:
+                report['Seconds'][target] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        AwsCli.mapParallel(execute, self.targets, self.max_workers)
+        name = operation if isinstance(operation, str) \
+            else getattr(operation, '__name__', 'operation')
+        for target, error in report['Failures'].items():
+            AwsCli.stdout(f"{cli_class.__name__}.{name} failed on {target[0]} {target[1]}: {error}",
+                          CliEnum.SEVERIY_ERROR)
+        severity = CliEnum.SEVERIY_ERROR if report['Failures'] else CliEnum.SEVERIY_INFO
+        AwsCli.stdout(f"{cli_class.__name__}.{name} on {len(self.targets)} targets in "
+                      f"{time.perf_counter() - started:.2f}s, {len(report['Failures'])} failed", severity)
+        if report['Failures'] and error_option == CliEnum.CMD_OPTION_STOP:
+            sys.exit()
+        return report
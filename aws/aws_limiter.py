@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+from ..cli_enum import CliEnum
+
+'''
+This is AIMD Concurrency Limiter Class
+'''
+
+
+class AimdLimiter:
+    # the range & the first value of the number of operations running at the same time.
+    MIN_LIMIT = 1
+    MAX_LIMIT = 64
+    INITIAL_LIMIT = 8
+    # the limit is multiplied by DECREASE on a throttle, and increases by INCREASE per LIMIT successes.
+    DECREASE = 0.5
+    INCREASE = 1.0
+
+    ''' constructor.
+        The limit increases additively on success and decreases multiplicatively on throttle,
+        so the concurrency converges to the rate the service allows.
+        The throttles of the operations started before the last decrease belong to the same congestion,
+        so they do not decrease the limit again.
+    Args:
+        limit (float, optional): the first limit. INITIAL_LIMIT is used when it is None.
+    '''
+
+    def __init__(self, limit=None) -> AimdLimiter:
+        self.limit = float(limit or AimdLimiter.INITIAL_LIMIT)
+        self.running = 0
+        # the time of the last decrease.
+        self.decreased_at = float('-inf')
+        self.__condition = threading.Condition()
+        # the event loops & the futures of acquireAsync waiting for release.
+        self.__waiters = []
+
+    ''' wait until an operation can start.
+    Returns:
+        float: the time when it started, which is given to release.
+    '''
+
+    def acquire(self) -> float:
+        with self.__condition:
+            while self.running >= int(self.limit):
+                self.__condition.wait()
+            self.running += 1
+            return time.monotonic()
+
+    ''' start an operation if the limit allows.
+    Returns:
+        bool: True when it can start.
+    '''
+
+    def tryAcquire(self) -> bool:
+        with self.__condition:
+            if self.running >= int(self.limit):
+                return False
+            self.running += 1
+            return True
+
+    ''' wait until an operation can start, without blocking the event loop.
+        It is woken up by release, which may be called on another thread.
+    Returns:
+        float: the time when it started, which is given to release.
+    '''
+
+    async def acquireAsync(self) -> float:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.__condition:
+                if self.running < int(self.limit):
+                    self.running += 1
+                    return time.monotonic()
+                waiter = (loop, loop.create_future())
+                self.__waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self.__condition:
+                    if waiter in self.__waiters:
+                        self.__waiters.remove(waiter)
+
+    ''' finish an operation, and adapt the limit by its result.
+    Args:
+        failure (int, optional): the failure of the operation. None when it succeeded. Refer AwsRetry.classify.
+        started (float, optional): the time returned by acquire. A throttle always decreases the limit when it is None.
+    '''
+
+    def release(self, failure: Optional[int] = None, started: Optional[float] = None) -> None:
+        with self.__condition:
+            self.running -= 1
+            if failure == CliEnum.FAILURE_THROTTLE:
+                # one decrease per congestion: the operations started before the last decrease saw the old limit.
+                if started is None or started > self.decreased_at:
+                    self.limit = max(AimdLimiter.MIN_LIMIT,
+                                     self.limit * AimdLimiter.DECREASE)
+                    self.decreased_at = time.monotonic()
+            elif failure is None:
+                self.limit = min(AimdLimiter.MAX_LIMIT,
+                                 self.limit + AimdLimiter.INCREASE / self.limit)
+            self.__condition.notify_all()
+            for loop, future in self.__waiters:
+                try:
+                    loop.call_soon_threadsafe(AimdLimiter.__wake, future)
+                except RuntimeError:
+                    # the event loop is closed.
+                    pass
+            self.__waiters.clear()
+
+    ''' wake up acquireAsync on its event loop.
+    Args:
+        future (asyncio.Future): the future which acquireAsync awaits.
+    '''
+    @staticmethod
+    def __wake(future) -> None:
+        if not future.done():
+            future.set_result(None)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import re
+import subprocess
+from typing import Optional
+from ..cli_enum import CliEnum
+
+'''
+This is AWS Retry Policy Class
+'''
+
+
+class AwsRetry:
+    # the number of times an operation is executed at most. 1 disables the retry.
+    MAX_ATTEMPTS = 6
+    # the first backoff seconds of each failure, which doubles per attempt up to BACKOFF_MAX.
+    BACKOFF_BASE = {
+        CliEnum.FAILURE_THROTTLE: 0.5,
+        CliEnum.FAILURE_TRANSIENT: 0.2,
+        CliEnum.FAILURE_CONFLICT: 1.0,
+    }
+    BACKOFF_MAX = 20.0
+    # the error codes & messages in stderr of the aws cli and the botocore backend.
+    THROTTLE_PATTERN = re.compile(
+        r'Throttling|ThrottlingException|TooManyRequestsException|RequestLimitExceeded|SlowDown|'
+        r'ProvisionedThroughputExceededException|RequestThrottled|Rate exceeded')
+    TRANSIENT_PATTERN = re.compile(
+        r'RequestTimeout|ServiceUnavailable|InternalError|InternalFailure|InternalServerError|'
+        r'ServiceException|Could not connect to the endpoint URL|Connection was closed|'
+        r'Read timeout|Connect timeout|EndpointConnectionError|\((?:500|502|503|504)\)')
+    # only the conflicts with an operation in progress, which succeed after it finishes.
+    CONFLICT_PATTERN = re.compile(
+        r'update is in progress|The operation cannot be performed at this time|'
+        r'OperationAbortedException|TransactionInProgressException')
+    # the conflicts with the existing resource never succeed by the retry. e.g. create-alias of an existing alias
+    PERMANENT_PATTERN = re.compile(r'already exists', re.IGNORECASE)
+    # the exit codes of the aws cli which never succeed by the retry. (parse error, invalid config & SIGINT)
+    FATAL_RETURNCODES = {130, 252, 253}
+    # the operations which are safe to repeat after a transient failure, whose request may have been committed.
+    # the others (e.g. create-rest-api, create-deployment, publish-version) would create duplicates.
+    IDEMPOTENT_PREFIXES = ('get-', 'list-', 'describe-', 'head-', 'scan', 'query', 'batch-get-',
+                           'update-', 'put-', 'delete-', 'remove-', 'tag-', 'untag-', 'batch-write-item')
+    # the commands of aws s3, which are idempotent too.
+    IDEMPOTENT_S3_COMMANDS = ('ls', 'cp', 'sync', 'rm')
+
+    ''' classify the failure of an operation.
+    Args:
+        result (subprocess.CompletedProcess): the result of the operation.
+    Returns:
+        int: None when it succeeded, or the failure.
+            FAILURE_THROTTLE: the request rate is over the limit.
+            FAILURE_TRANSIENT: the service or the network failed temporarily.
+            FAILURE_CONFLICT: the resource is being modified by another operation. e.g. a Lambda update in progress
+            FAILURE_FATAL: the retry never succeeds. e.g. the resource already exists
+    '''
+    @staticmethod
+    def classify(result: Optional[subprocess.CompletedProcess]) -> Optional[int]:
+        if result is None:
+            return CliEnum.FAILURE_FATAL
+        if result.returncode == 0:
+            return None
+        if result.returncode in AwsRetry.FATAL_RETURNCODES:
+            return CliEnum.FAILURE_FATAL
+        stderr = result.stderr or ''
+        if AwsRetry.PERMANENT_PATTERN.search(stderr):
+            return CliEnum.FAILURE_FATAL
+        if AwsRetry.THROTTLE_PATTERN.search(stderr):
+            return CliEnum.FAILURE_THROTTLE
+        if AwsRetry.CONFLICT_PATTERN.search(stderr):
+            return CliEnum.FAILURE_CONFLICT
+        if AwsRetry.TRANSIENT_PATTERN.search(stderr):
+            return CliEnum.FAILURE_TRANSIENT
+        return CliEnum.FAILURE_FATAL
+
+    ''' check whether the failure is retried.
+        The throttles and the conflicts are always retried since the request was rejected,
+        but the transient failures are retried only for the idempotent operations.
+    Args:
+        failure (int): the failure. Refer classify.
+        attempt (int): the number of the attempts so far.
+        idempotent (bool, optional): whether the operation is safe to repeat. Refer isIdempotent.
+    Returns:
+        bool: True when it is retried.
+    '''
+    @staticmethod
+    def isRetried(failure: Optional[int], attempt: int, idempotent=True) -> bool:
+        if failure == CliEnum.FAILURE_TRANSIENT and not idempotent:
+            return False
+        return failure in AwsRetry.BACKOFF_BASE and attempt < AwsRetry.MAX_ATTEMPTS
+
+    ''' check whether an aws cli command is safe to repeat.
+    Args:
+        cmd (str): the command. e.g. aws lambda get-function ...
+    Returns:
+        bool: True when it is a read or an idempotent operation.
+    '''
+    @staticmethod
+    def isIdempotent(cmd: str) -> bool:
+        words = cmd.split()
+        if len(words) < 3 or words[0] != 'aws':
+            return False
+        if words[1] == 's3':
+            return words[2] in AwsRetry.IDEMPOTENT_S3_COMMANDS
+        return words[2].startswith(AwsRetry.IDEMPOTENT_PREFIXES)
+
+    ''' get the seconds to wait before the next attempt. (exponential backoff with full jitter)
+    Args:
+        failure (int): the failure. Refer classify.
+        attempt (int): the number of the attempts so far.
+    Returns:
+        float: the seconds.
+    '''
+    @staticmethod
+    def backoff(failure: int, attempt: int) -> float:
+        import random
+        ceiling = min(AwsRetry.BACKOFF_MAX,
+                      AwsRetry.BACKOFF_BASE[failure] * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    ''' get the service of an aws cli command.
+    Args:
+        cmd (str): the command. e.g. aws lambda get-function ...
+    Returns:
+        str: the service. e.g. lambda
+    '''
+    @staticmethod
+    def service(cmd: str) -> str:
+        words = cmd.split()
+        return words[1] if len(words) > 1 and words[0] == 'aws' else ''
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from ..cli import Cli
+from .aws_backend import BotocoreBackend
+from .aws_limiter import AimdLimiter
+
+'''
+This is AWS Session Class
+'''
+
+
+class AwsSession:
+    # the seconds while the caller identity cached on the disk is valid. 0 disables the disk cache.
+    IDENTITY_CACHE_TTL = 0
+    # the directory in which the caller identity is cached.
+    IDENTITY_CACHE_DIR = '~/.cache/python-cli'
+    __sessions = dict()
+    __identities = dict()
+    __lock = threading.Lock()
+
+    ''' constructor.
+        Use AwsSession.get in order to share the session.
+    Args:
+        aws_profile (str): AWS Profile Name (define it in ~/.aws/credentials).
+        region (str): the target region.
+    '''
+
+    def __init__(self, aws_profile: str, region: str) -> AwsSession:
+        self.aws_profile = aws_profile
+        self.region = region
+        # the environment variables overridden for the aws cli. os.environ is not changed.
+        # the region is given too, so that the sessions of the same profile do not share the region of the profile.
+        # the aws cli does not retry, since AwsCli.execAws retries by AwsRetry.
+        self.overrides = {'AWS_PROFILE': aws_profile, 'AWS_REGION': region, 'AWS_DEFAULT_REGION': region,
+                          'AWS_MAX_ATTEMPTS': '1', 'AWS_RETRY_MODE': 'standard'}
+        self.__limiters = dict()
+        self.__limiters_lock = threading.Lock()
+
+    ''' get the session shared by the profile and the region.
+    Args:
+        aws_profile (str): AWS Profile Name (define it in ~/.aws/credentials).
+        region (str): the target region.
+    Returns:
+        AwsSession: the session.
+    '''
+    @staticmethod
+    def get(aws_profile: str, region: str) -> AwsSession:
+        key = (aws_profile, region)
+        with AwsSession.__lock:
+            if key not in AwsSession.__sessions:
+                AwsSession.__sessions[key] = AwsSession(aws_profile, region)
+            return AwsSession.__sessions[key]
+
+    ''' get the environment variables of the aws cli.
+        It is built from os.environ on each command, so that the later changes (e.g. AWS_ENDPOINT_URL_DYNAMODB) are applied.
+    Returns:
+        dict: os.environ with the overrides.
+    '''
+    @property
+    def env(self) -> dict:
+        return dict(os.environ, **self.overrides)
+
+    ''' get the botocore backend of this session.
+    Returns:
+        BotocoreBackend: the backend.
+    '''
+    @property
+    def botocore(self) -> BotocoreBackend:
+        return BotocoreBackend.get(self.aws_profile, self.region)
+
+    ''' get the concurrency limiter of the service, which is shared by the instances of this session.
+    Args:
+        service (str): the service name. e.g. lambda
+    Returns:
+        AimdLimiter: the limiter.
+    '''
+
+    def limiter(self, service: str) -> AimdLimiter:
+        with self.__limiters_lock:
+            if service not in self.__limiters:
+                self.__limiters[service] = AimdLimiter()
+            return self.__limiters[service]
+
+    ''' get the caller identity of the profile.
+        It is cached in memory, and on the disk while IDENTITY_CACHE_TTL seconds.
+    Args:
+        botocore (BotocoreBackend, optional): the backend calling STS. The aws cli is used when it is None.
+    Returns:
+        dict: the caller identity which has Account and Arn.
+    '''
+
+    def getIdentity(self, botocore: Optional[BotocoreBackend] = None) -> dict:
+        identity = AwsSession.__identities.get(self.aws_profile)
+        if identity is None:
+            identity = self.__loadIdentity()
+        if identity is None:
+            identity = self.__fetchIdentity(botocore)
+            self.__saveIdentity(identity)
+        AwsSession.__identities[self.aws_profile] = identity
+        return identity
+
+    ''' clear the caller identities cached in memory.
+    '''
+    @staticmethod
+    def clearIdentities() -> None:
+        AwsSession.__identities.clear()
+
+    ''' call sts get-caller-identity.
+    Args:
+        botocore (BotocoreBackend, optional): the backend calling STS.
+    Returns:
+        dict: the caller identity.
+    '''
+
+    def __fetchIdentity(self, botocore: Optional[BotocoreBackend]) -> dict:
+        cmd = f"aws sts get-caller-identity --output json"
+        if botocore is None:
+            output = Cli.execCmd(cmd, env=self.env)
+        else:
+            output = Cli.execFunc('[botocore] sts get_caller_identity',
+                                  lambda: botocore.call('sts', 'get_caller_identity', dict()))
+        output_json = Cli.parseOutput(output.stdout)
+        return {'Account': output_json['Account'], 'Arn': output_json['Arn']}
+
+    ''' get the path of the caller identity cached on the disk.
+    Returns:
+        Path: the file path.
+    '''
+
+    def __identityFile(self) -> Path:
+        return Path(AwsSession.IDENTITY_CACHE_DIR).expanduser() / f"identity-{self.aws_profile}.json"
+
+    ''' load the caller identity cached on the disk.
+    Returns:
+        dict: the caller identity or None when it is not cached or expired.
+    '''
+
+    def __loadIdentity(self) -> Optional[dict]:
+        if AwsSession.IDENTITY_CACHE_TTL <= 0:
+            return None
+        try:
+            with open(self.__identityFile()) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - cache.get('CachedAt', 0) > AwsSession.IDENTITY_CACHE_TTL:
+            return None
+        return {'Account': cache['Account'], 'Arn': cache['Arn']}
+
+    ''' save the caller identity on the disk.
+    Args:
+        identity (dict): the caller identity.
+    '''
+
+    def __saveIdentity(self, identity: dict) -> None:
+        if AwsSession.IDENTITY_CACHE_TTL <= 0:
+            return
+        Cli.writeAtomic(self.__identityFile(), json.dumps(
+            dict(identity, CachedAt=time.time())))
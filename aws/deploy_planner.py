@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+from ..cli import Cli
+from .apigateway_cli import ApigatewayCli
+from .lambda_cli import LambdaCli
+
+'''
+This is Deployment Planner Class
+'''
+
+
+class DeployPlanner:
+
+    ''' constructor.
+        The steps of a release are added as the nodes of a dependency graph,
+        and the nodes whose dependencies are done run at the same time.
+    Args:
+        max_workers (int, optional): the number of nodes running at the same time.
+    e.g.
+        planner = DeployPlanner(max_workers=8)
+        for name in function_names:
+            planner.addFunction(lambda_cli, name, f"dist/{name}.zip", role, 30, 128, layers)
+        planner.addApi(apigateway_cli, lambda_cli, 'MY_API', api_id, development_id)
+        planner.run(dry_run=True)
+        planner.run()
+    '''
+
+    def __init__(self, max_workers=8) -> DeployPlanner:
+        self.max_workers = max_workers
+        self.nodes = dict()
+        # the return values of the nodes, which the following nodes can use.
+        self.results = dict()
+
+    ''' add a node.
+    Args:
+        name (str): the unique name of the node. e.g. publish:my_function
+        func (Callable): the function of the step, which is called without arguments.
+        depends (list, optional): the names of the nodes which must be done before it.
+        estimate (float, optional): the estimated seconds of the step, used by the dry-run.
+    Returns:
+        str: the name of the node.
+    '''
+
+    def add(self, name: str, func: Callable[[], object], depends=None, estimate=1.0) -> str:
+        if name in self.nodes:
+            raise ValueError(f"the node {name} is already added.")
+        self.nodes[name] = {'Func': func, 'Depends': list(depends or []),
+                            'Estimate': estimate, 'Seconds': None}
+        return name
+
+    ''' add the steps deploying a lambda function:
+        deploy (create or update) -> publish (a version) -> alias (create or update).
+        The version is not published when the incremental update changes nothing.
+    Args:
+        lambda_cli (LambdaCli): the client of the environment.
+        function_name (str): The name of the Lambda function.
+        zip_file (str): The path to the zip file of the code you are uploading.
+        role (str): The Amazon Resource Name (ARN) of the function's execution role.
+        timeout (int): The amount of time that Lambda allows a function to run before stopping it.
+        memory_size (int): The amount of memory available to the function at runtime.
+        layers (list): A list of function layers , to add to the function's execution environment.
+        description (str, optional): the description of this function.
+        depends (list, optional): the names of the nodes which must be done before the deploy. e.g. a layer
+    Returns:
+        str: the name of the alias node, which the following steps depend on.
+    '''
+
+    def addFunction(self, lambda_cli: LambdaCli, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None, depends=None) -> str:
+        deploy = f"deploy:{function_name}"
+        publish = f"publish:{function_name}"
+        alias = f"alias:{function_name}"
+
+        def deployFunction() -> object:
+            if lambda_cli.existsFunction(function_name):
+                return lambda_cli.updateFunction(function_name, zip_file, role, timeout, memory_size, layers, description, incremental=True)
+            return lambda_cli.createFunction(function_name, zip_file, role, timeout, memory_size, layers, description)
+
+        def publishFunction() -> Optional[str]:
+            if self.results[deploy] is None:
+                return None
+            return lambda_cli.publishFunction(function_name, description)
+
+        def updateAlias() -> object:
+            version = self.results[publish]
+            if version is None:
+                return None
+            if lambda_cli.existsAlias(function_name):
+                return lambda_cli.updateAlias(function_name, version, description)
+            return lambda_cli.createAlias(function_name, version, description)
+
+        self.add(deploy, deployFunction, depends, estimate=10.0)
+        self.add(publish, publishFunction, [deploy], estimate=3.0)
+        return self.add(alias, updateAlias, [publish], estimate=2.0)
+
+    ''' add the steps deploying an API: permission (of the functions) -> update (import & stage).
+    Args:
+        apigateway_cli (ApigatewayCli): the client of the environment.
+        lambda_cli (LambdaCli): the client of the environment.
+        api_name (str): The name of the API.
+        api_id (str): The string identifier of the associated RestApi .
+        development_id (str): The identifier for the deployment resource.
+        lambda_infos (list, optional): the functions of the API. Refer ApigatewayCli.getLambdaInfos.
+            They are got when the node runs if it is None.
+    Returns:
+        str: the name of the update node.
+    '''
+
+    def addApi(self, apigateway_cli: ApigatewayCli, lambda_cli: LambdaCli, api_name: str, api_id: str, development_id: str, lambda_infos=None) -> str:
+        permission = f"permission:{api_name}"
+        update = f"update:{api_name}"
+        if lambda_infos is None:
+            depends = [name for name in self.nodes if name.startswith('alias:')]
+        else:
+            depends = [f"alias:{info['lambda_name']}" for info in lambda_infos
+                       if f"alias:{info['lambda_name']}" in self.nodes]
+
+        def addPermission() -> object:
+            infos = lambda_infos if lambda_infos is not None \
+                else apigateway_cli.getLambdaInfos(api_id)
+            return lambda_cli.addPermission(api_id, infos)
+
+        self.add(permission, addPermission, depends, estimate=3.0)
+        return self.add(update, lambda: apigateway_cli.update(api_name, api_id, development_id),
+                        [permission], estimate=10.0)
+
+    ''' execute the nodes in the order of the dependencies, or output the plan by the dry-run.
+    Args:
+        dry_run (bool, optional): output the plan and the critical path by the estimates without executing.
+    Returns:
+        dict: the seconds of the nodes (Nodes), the critical path (CriticalPath)
+            and the seconds of the whole (Seconds), which are estimated by the dry-run.
+    '''
+
+    def run(self, dry_run=False) -> dict:
+        order = self.__sort()
+        if dry_run:
+            weights = {name: node['Estimate']
+                       for name, node in self.nodes.items()}
+            path, seconds = self.__criticalPath(order, weights)
+            for level, names in enumerate(self.__levels(order)):
+                Cli.stdout(f"[plan] level {level}: {', '.join(names)}")
+            Cli.stdout(
+                f"[plan] critical path ({seconds:.1f}s estimated): {' -> '.join(path)}")
+            return {'Nodes': weights, 'CriticalPath': path, 'Seconds': seconds}
+        started = time.perf_counter()
+        self.__execute()
+        weights = {name: node['Seconds'] for name, node in self.nodes.items()}
+        path, _ = self.__criticalPath(order, weights)
+        report = {'Nodes': weights, 'CriticalPath': path,
+                  'Seconds': time.perf_counter() - started}
+        for name in order:
+            Cli.stdout(f"[deploy] {name}: {weights[name]:.2f}s")
+        Cli.stdout(f"[deploy] {len(order)} steps in {report['Seconds']:.2f}s, "
+                   f"critical path: {' -> '.join(path)}")
+        return report
+
+    ''' execute the nodes with the thread pool as soon as their dependencies are done.
+        The nodes not started yet are cancelled when a node fails.
+    '''
+
+    def __execute(self) -> None:
+        remaining = {name: set(node['Depends'])
+                     for name, node in self.nodes.items()}
+        dependents = {name: [] for name in self.nodes}
+        for name, node in self.nodes.items():
+            for depend in node['Depends']:
+                dependents[depend].append(name)
+
+        def runNode(name: str) -> object:
+            node_started = time.perf_counter()
+            try:
+                return self.nodes[name]['Func']()
+            finally:
+                self.nodes[name]['Seconds'] = time.perf_counter() - \
+                    node_started
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = dict()
+            for name in [name for name, depends in remaining.items() if not depends]:
+                futures[executor.submit(runNode, name)] = name
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except BaseException:
+                        for pending in futures:
+                            pending.cancel()
+                        raise
+                    for dependent in dependents[name]:
+                        remaining[dependent].discard(name)
+                        if not remaining[dependent]:
+                            futures[executor.submit(
+                                runNode, dependent)] = dependent
+
+    ''' sort the nodes topologically.
+    Returns:
+        list: the names of the nodes.
+    '''
+
+    def __sort(self) -> List[str]:
+        for name, node in self.nodes.items():
+            for depend in node['Depends']:
+                if depend not in self.nodes:
+                    raise ValueError(
+                        f"the node {name} depends on the unknown node {depend}.")
+        order = []
+        state = dict()
+
+        def visit(name: str) -> None:
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"the nodes have a cycle at {name}.")
+            state[name] = 'visiting'
+            for depend in self.nodes[name]['Depends']:
+                visit(depend)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    ''' group the nodes by the length of the longest dependency chain before them.
+    Args:
+        order (list): the names of the nodes sorted topologically.
+    Returns:
+        list: the names of the nodes in each level, which can run at the same time.
+    '''
+
+    def __levels(self, order: List[str]) -> List[List[str]]:
+        level = dict()
+        for name in order:
+            level[name] = max([level[depend] + 1 for depend in self.nodes[name]['Depends']],
+                              default=0)
+        levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for name in order:
+            levels[level[name]].append(name)
+        return levels
+
+    ''' find the longest chain of the dependencies by the seconds of the nodes.
+    Args:
+        order (list): the names of the nodes sorted topologically.
+        weights (dict): the seconds of the nodes.
+    Returns:
+        tuple: the names of the nodes on the path & the total seconds.
+    '''
+
+    def __criticalPath(self, order: List[str], weights: Dict[str, float]) -> tuple:
+        finish = dict()
+        previous = dict()
+        for name in order:
+            start = 0.0
+            previous[name] = None
+            for depend in self.nodes[name]['Depends']:
+                if finish[depend] > start:
+                    start = finish[depend]
+                    previous[name] = depend
+            finish[name] = start + (weights[name] or 0.0)
+        if not finish:
+            return [], 0.0
+        name = max(finish, key=finish.get)
+        total = finish[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
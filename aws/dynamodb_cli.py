@@ -1,6 +1,18 @@
 # -*- coding: utf-8 -*-
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator, List
 from .aws_cli import AwsCli
 from ..cli_enum import CliEnum
+from ..metrics import Metrics
 
 '''
 This is DynamoDB Command Class
@@ -8,24 +20,356 @@ This is DynamoDB Command Class
 
 
 class DynamodbCli(AwsCli):
+    # the maximum number of items written by a batch-write-item.
+    BATCH_WRITE_SIZE = 25
+    # the number of times UnprocessedItems are retried, and the backoff seconds (base & max).
+    BATCH_WRITE_RETRIES = 8
+    BACKOFF_BASE = 0.05
+    BACKOFF_MAX = 5.0
 
     ''' constructor.
         Refer super class's constructor.
     '''
 
-    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1'):
-        super().__init__(aws_profile=aws_profile, environment=environment, region=region)
+    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1', backend=CliEnum.BACKEND_CLI):
+        super().__init__(aws_profile=aws_profile, environment=environment,
+                         region=region, backend=backend)
 
     # create a table.
 
     def createTable(self, table_name: str):
-        json_data = DynamodbCli.loadJson(
-            f"config/dynamodb/{table_name}.json", CliEnum.RETURN_TYPE_STRING)
-        cmd = f"aws dynamodb create-table --output text --cli-input-json '{json_data}'"
-        DynamodbCli.execCmd(cmd)
+        cmd, params = self.__createTableRequest(table_name)
+        self.execAws(cmd, 'dynamodb', 'create_table', params)
+
+    # create a table asynchronously.
+
+    async def createTableAsync(self, table_name: str):
+        cmd, params = self.__createTableRequest(table_name)
+        await self.execAwsAsync(cmd, 'dynamodb', 'create_table', params)
 
     # delete a table.
 
     def deleteTable(self, table_name: str):
         cmd = f"aws dynamodb delete-table --table-name {table_name}"
-        DynamodbCli.execCmd(cmd)
+        self.execAws(cmd, 'dynamodb', 'delete_table', {'TableName': table_name})
+
+    # delete a table asynchronously.
+
+    async def deleteTableAsync(self, table_name: str):
+        cmd = f"aws dynamodb delete-table --table-name {table_name}"
+        await self.execAwsAsync(cmd, 'dynamodb', 'delete_table', {'TableName': table_name})
+
+    ''' load the items of a JSONL or CSV file into the table.
+        The items are read as a stream, packed into batch-write-item of BATCH_WRITE_SIZE items,
+        and written by the parallel writers. UnprocessedItems are retried with exponential backoff.
+        Set AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000 in order to load into amazon/dynamodb-local.
+    Args:
+        table_name (str): the table name.
+        file_path (str): the JSONL or CSV file. The format is decided by the suffix (.csv or the others).
+            A line of JSONL is an item of plain JSON, or of DynamoDB JSON when typed is True.
+            A row of CSV is an item whose attributes are the columns. The empty cells are omitted.
+        max_workers (int, optional): the number of writers.
+        typed (bool, optional): whether the items of JSONL are DynamoDB JSON. e.g. {"id": {"N": "1"}}
+        types (dict, optional): the DynamoDB types of the CSV columns which are not strings. e.g. {'id': 'N'}
+        error_option (int, optional): the option when some items are not written.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        dict: the number of items written (Items) & not written (Failed),
+            the number of retried requests (Retries) and the elapsed seconds (Seconds).
+    e.g.
+        dynamodb_cli.loadItems('Users', 'fixtures/users.jsonl', max_workers=8)
+    '''
+
+    def loadItems(self, table_name: str, file_path: str, max_workers=4, typed=False, types=None, error_option=CliEnum.CMD_OPTION_STOP) -> dict:
+        report = {'Items': 0, 'Failed': 0, 'Retries': 0, 'Seconds': 0.0}
+        started = time.perf_counter()
+
+        def collect(done: set) -> None:
+            for future in done:
+                batch_report = future.result()
+                for key in ('Items', 'Failed', 'Retries'):
+                    report[key] += batch_report[key]
+
+        # the workers record the commands with this method.
+        batch_write = Metrics.bindCaller(self.__batchWrite)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = set()
+            batch = []
+            for item in DynamodbCli.__readItems(file_path, typed, types or dict()):
+                batch.append({'PutRequest': {'Item': item}})
+                if len(batch) == DynamodbCli.BATCH_WRITE_SIZE:
+                    futures.add(executor.submit(
+                        batch_write, table_name, batch))
+                    batch = []
+                    # wait for the running batches so that the file is not read too far ahead.
+                    if len(futures) >= max_workers * 2:
+                        done, futures = wait(
+                            futures, return_when=FIRST_COMPLETED)
+                        collect(done)
+            if batch:
+                futures.add(executor.submit(
+                    batch_write, table_name, batch))
+            collect(futures)
+        report['Seconds'] = time.perf_counter() - started
+        severity = CliEnum.SEVERIY_ERROR if report['Failed'] else CliEnum.SEVERIY_INFO
+        DynamodbCli.stdout(f"{table_name}: {report['Items']} items loaded in {report['Seconds']:.2f}s, "
+                           f"{report['Retries']} retries, {report['Failed']} failed", severity)
+        if report['Failed'] and error_option == CliEnum.CMD_OPTION_STOP:
+            sys.exit()
+        return report
+
+    ''' write the items by batch-write-item, retrying UnprocessedItems with exponential backoff & jitter.
+        The throttles and transient failures of the request itself are retried by execAws,
+        so a failed request fails the whole batch at once. e.g. ValidationException, ResourceNotFoundException
+    Args:
+        table_name (str): the table name.
+        requests (list): PutRequest of the items.
+    Returns:
+        dict: the number of items written (Items) & not written (Failed), and the number of retries (Retries).
+    '''
+
+    def __batchWrite(self, table_name: str, requests: List[dict]) -> dict:
+        report = {'Items': 0, 'Failed': 0, 'Retries': 0}
+        for attempt in range(DynamodbCli.BATCH_WRITE_RETRIES + 1):
+            if attempt > 0:
+                report['Retries'] += 1
+                backoff = min(DynamodbCli.BACKOFF_MAX,
+                              DynamodbCli.BACKOFF_BASE * 2 ** attempt)
+                time.sleep(random.uniform(0, backoff))
+            request_items = {table_name: requests}
+            # the items are passed by a file, because they are too long for an argument.
+            with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+                json.dump(request_items, file)
+                file.flush()
+                cmd = f"aws dynamodb batch-write-item --request-items file://{file.name} --output json"
+                output = self.execAws(cmd, 'dynamodb', 'batch_write_item', {'RequestItems': request_items},
+                                      CliEnum.CMD_OPTION_CONTINUE)
+            if output is None or output.returncode != 0:
+                break
+            unprocessed = (DynamodbCli.parseOutput(output.stdout) or dict()).get(
+                'UnprocessedItems', dict()).get(table_name, [])
+            report['Items'] += len(requests) - len(unprocessed)
+            requests = unprocessed
+            if not requests:
+                break
+        report['Failed'] = len(requests)
+        return report
+
+    ''' export the table into JSONL files by a parallel scan.
+        Each segment of the scan is written into its own file page by page, so the table is not held in memory.
+        The position of each segment is saved in a checkpoint file after each page,
+        and the export interrupted is resumed from the checkpoints by resume=True.
+        The checkpoints are removed when all segments finish, so the next export scans the table again.
+        Set AWS_ENDPOINT_URL_DYNAMODB=http://localhost:8000 in order to export from amazon/dynamodb-local.
+    Args:
+        table_name (str): the table name.
+        out_dir (str): the directory in which {table_name}-{segment}.jsonl & the checkpoints are written.
+        total_segments (int, optional): the number of segments scanned in parallel.
+        typed (bool, optional): write the items as DynamoDB JSON. Plain JSON is written when it is False.
+        page_size (int, optional): the number of items scanned at once.
+        resume (bool, optional): resume the interrupted export from the checkpoints. The export starts over when it is False.
+            ValueError is raised when total_segments or typed is not the one of the checkpoints.
+    Returns:
+        dict: the number of items written (Items), the files (Files) and the elapsed seconds (Seconds).
+    e.g.
+        dynamodb_cli.exportTable('Users', './dump', total_segments=8)
+        dynamodb_cli.exportTable('Users', './dump', total_segments=8, resume=True)
+        dynamodb_cli.loadItems('Users', './dump/Users-0000.jsonl', typed=True)
+    '''
+
+    def exportTable(self, table_name: str, out_dir: str, total_segments=4, typed=True, page_size=None, resume=False) -> dict:
+        root = Path(out_dir).expanduser()
+        root.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        # the workers record the commands with this method.
+        export_segment = Metrics.bindCaller(self.__exportSegment)
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            futures = [executor.submit(export_segment, table_name, root, segment,
+                                       total_segments, typed, page_size, resume)
+                       for segment in range(total_segments)]
+            # result() raises the error of the workers.
+            items = sum(future.result() for future in futures)
+        # the export is complete, so it is not resumed any more.
+        for segment in range(total_segments):
+            DynamodbCli.__checkpointFile(root, table_name, segment).unlink()
+        report = {'Items': items, 'Seconds': time.perf_counter() - started,
+                  'Files': [str(root / f"{table_name}-{segment:04d}.jsonl") for segment in range(total_segments)]}
+        DynamodbCli.stdout(
+            f"{table_name}: {report['Items']} items exported in {report['Seconds']:.2f}s by {total_segments} segments")
+        return report
+
+    ''' scan a segment of the table into the file, saving the checkpoint after each page.
+    Args:
+        table_name (str): the table name.
+        root (Path): the output directory.
+        segment (int): the segment.
+        total_segments (int): the number of segments.
+        typed (bool): write the items as DynamoDB JSON.
+        page_size (int): the number of items scanned at once.
+        resume (bool): resume from the checkpoint.
+    Returns:
+        int: the number of items in the file.
+    '''
+
+    def __exportSegment(self, table_name: str, root: Path, segment: int, total_segments: int, typed: bool, page_size: int, resume: bool) -> int:
+        path = root / f"{table_name}-{segment:04d}.jsonl"
+        checkpoint_path = DynamodbCli.__checkpointFile(root, table_name, segment)
+        checkpoint = {'TotalSegments': total_segments, 'Typed': typed,
+                      'NextToken': None, 'Offset': 0, 'Items': 0, 'Done': False}
+        if resume and checkpoint_path.exists():
+            saved = json.loads(checkpoint_path.read_text())
+            # the file must not mix the items of another scan or another encoding.
+            if (saved.get('TotalSegments'), saved.get('Typed')) != (total_segments, typed):
+                raise ValueError(f"{checkpoint_path} was saved with total_segments={saved.get('TotalSegments')} "
+                                 f"and typed={saved.get('Typed')}. Export with them or resume=False.")
+            checkpoint = saved
+        if checkpoint['Done']:
+            return checkpoint['Items']
+        cmd = f"aws dynamodb scan --table-name {table_name} --segment {segment} --total-segments {total_segments} --output json"
+        params = {'TableName': table_name,
+                  'Segment': segment, 'TotalSegments': total_segments}
+        with open(path, 'a+b') as file:
+            # discard the items written after the last checkpoint.
+            file.truncate(checkpoint['Offset'])
+            file.seek(checkpoint['Offset'])
+            for items, token in self.iterPages(cmd, 'dynamodb', 'scan', 'Items', params, page_size,
+                                               checkpoint['NextToken']):
+                for item in items:
+                    if not typed:
+                        item = DynamodbCli.fromAttribute({'M': item})
+                    file.write(DynamodbCli.dumpJson(item).encode() + b'\n')
+                file.flush()
+                os.fsync(file.fileno())
+                checkpoint.update(NextToken=token, Offset=file.tell(),
+                                  Items=checkpoint['Items'] + len(items), Done=token is None)
+                DynamodbCli.writeAtomic(checkpoint_path, json.dumps(checkpoint))
+        return checkpoint['Items']
+
+    ''' get the path of the checkpoint of a segment.
+    Args:
+        root (Path): the output directory.
+        table_name (str): the table name.
+        segment (int): the segment.
+    Returns:
+        Path: the file path.
+    '''
+    @staticmethod
+    def __checkpointFile(root: Path, table_name: str, segment: int) -> Path:
+        return root / f"{table_name}-{segment:04d}.checkpoint.json"
+
+    ''' read the items of a JSONL or CSV file one by one.
+    Args:
+        file_path (str): the JSONL or CSV file.
+        typed (bool): whether the items of JSONL are DynamoDB JSON.
+        types (dict): the DynamoDB types of the CSV columns which are not strings.
+    Yields:
+        dict: the item of DynamoDB JSON.
+    '''
+    @staticmethod
+    def __readItems(file_path: str, typed: bool, types: dict) -> Iterator[dict]:
+        path = Path(file_path).expanduser()
+        with open(path, newline='') as file:
+            if path.suffix.lower() == '.csv':
+                for row in csv.DictReader(file):
+                    yield {name: DynamodbCli.__toCsvAttribute(value, types.get(name, 'S'))
+                           for name, value in row.items() if value != ''}
+                return
+            for line in file:
+                if not line.strip():
+                    continue
+                item = json.loads(line, parse_float=Decimal)
+                yield item if typed else DynamodbCli.toAttribute(item)['M']
+
+    ''' convert a cell of CSV into the attribute value.
+    Args:
+        value (str): the cell.
+        attribute_type (str): the DynamoDB type. S, N, BOOL or the others which are JSON.
+    Returns:
+        dict: the attribute value.
+    '''
+    @staticmethod
+    def __toCsvAttribute(value: str, attribute_type: str) -> dict:
+        if attribute_type in ('S', 'N'):
+            return {attribute_type: value}
+        if attribute_type == 'BOOL':
+            return {'BOOL': value.lower() in ('true', '1', 'yes')}
+        return DynamodbCli.toAttribute(json.loads(value, parse_float=Decimal))
+
+    ''' convert a value of plain JSON into the attribute value of DynamoDB JSON.
+    Args:
+        value (object): the value. e.g. {"id": 1, "tags": ["a"]}
+    Returns:
+        dict: the attribute value. e.g. {"M": {"id": {"N": "1"}, "tags": {"L": [{"S": "a"}]}}}
+    '''
+    @staticmethod
+    def toAttribute(value: object) -> dict:
+        if value is None:
+            return {'NULL': True}
+        if isinstance(value, bool):
+            return {'BOOL': value}
+        if isinstance(value, (int, float, Decimal)):
+            return {'N': str(value)}
+        if isinstance(value, str):
+            return {'S': value}
+        if isinstance(value, list):
+            return {'L': [DynamodbCli.toAttribute(item) for item in value]}
+        if isinstance(value, dict):
+            return {'M': {key: DynamodbCli.toAttribute(item) for key, item in value.items()}}
+        raise TypeError(f"{type(value)} is not supported by DynamoDB.")
+
+    ''' convert the attribute value of DynamoDB JSON into a value of plain JSON.
+        The inverse of toAttribute. The numbers are int, or Decimal when they have a fraction or an exponent,
+        so that their precision (up to 38 digits) is kept. Serialize the value with dumpJson.
+        The sets are lists and the binaries are base64 strings.
+    Args:
+        attribute (dict): the attribute value. e.g. {"M": {"id": {"N": "1"}}}
+    Returns:
+        object: the value. e.g. {"id": 1}
+    '''
+    @staticmethod
+    def fromAttribute(attribute: dict) -> object:
+        (attribute_type, value), = attribute.items()
+        if attribute_type == 'N':
+            return Decimal(value) if any(c in value for c in '.eE') else int(value)
+        if attribute_type == 'NS':
+            return [DynamodbCli.fromAttribute({'N': item}) for item in value]
+        if attribute_type == 'NULL':
+            return None
+        if attribute_type == 'L':
+            return [DynamodbCli.fromAttribute(item) for item in value]
+        if attribute_type == 'M':
+            return {key: DynamodbCli.fromAttribute(item) for key, item in value.items()}
+        # S, B, BOOL, SS & BS.
+        return value
+
+    ''' serialize the value of fromAttribute into compact JSON.
+        Decimal is written as the number itself, not converted into float.
+    Args:
+        value (object): the value. e.g. {"id": 1, "price": Decimal("1.10")}
+    Returns:
+        str: the JSON. e.g. {"id":1,"price":1.10}
+    '''
+    @staticmethod
+    def dumpJson(value: object) -> str:
+        try:
+            # most values have no Decimal.
+            return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        except TypeError:
+            pass
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, dict):
+            return '{' + ','.join(f"{json.dumps(key, ensure_ascii=False)}:{DynamodbCli.dumpJson(item)}"
+                                  for key, item in value.items()) + '}'
+        if isinstance(value, list):
+            return '[' + ','.join(DynamodbCli.dumpJson(item) for item in value) + ']'
+        raise TypeError(f"{type(value)} is not JSON serializable.")
+
+    # build the command & the parameters of create-table from config/dynamodb/{table_name}.json.
+
+    def __createTableRequest(self, table_name: str) -> tuple:
+        params = DynamodbCli.loadJson(f"config/dynamodb/{table_name}.json")
+        json_data = json.dumps(params, sort_keys=True, indent=2)
+        cmd = f"aws dynamodb create-table --output text --cli-input-json '{json_data}'"
+        return cmd, params
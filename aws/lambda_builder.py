@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Tuple
+from ..cli import Cli
+from ..cli_enum import CliEnum
+from .lambda_cli import LambdaCli
+
+'''
+This is Lambda Artifact Builder Class
+'''
+
+
+class LambdaBuilder:
+    # the directory in which the built zip files are cached by the hash of their inputs.
+    CACHE_DIR = '~/.cache/python-cli/artifacts'
+    # the timestamp of all entries, which is the earliest one of the zip format.
+    DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    # the file & directory names which are not packaged.
+    EXCLUDES = ('__pycache__', '*.pyc', '*.pyo', '.git', '.DS_Store')
+    # the directory of the layer, which Lambda adds into sys.path.
+    LAYER_PREFIX = 'python/'
+    # it is included into the hash, so that changing the format of the zip files invalidates the cache.
+    FORMAT_VERSION = '1'
+
+    ''' constructor.
+        The zip files are reproducible: the entries are sorted, and their timestamps and permissions are normalized,
+        so the same sources always produce the same bytes and the same CodeSha256.
+    Args:
+        cache_dir (str, optional): the cache directory. CACHE_DIR is used when it is None.
+        max_workers (int, optional): the number of processes building at the same time. The number of CPUs when it is None.
+    e.g.
+        builder = LambdaBuilder()
+        reports = builder.buildMany({'my_function': 'src/my_function'}, 'dist')
+        lambda_cli.updateFunction('my_function', reports['my_function']['ZipFile'], role, 30, 128, layers, incremental=True)
+        report = builder.build('layers/common', 'dist/common.zip', layer=True)
+        lambda_cli.publishLayer('common', report['ZipFile'], incremental=True)
+    '''
+
+    def __init__(self, cache_dir=None, max_workers=None) -> LambdaBuilder:
+        self.cache_dir = str(Path(cache_dir or LambdaBuilder.CACHE_DIR).expanduser())
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    ''' build a zip file from the source directory, or take it from the cache.
+    Args:
+        source_dir (str): the source directory, whose files are put at the root of the zip file.
+        zip_file (str, optional): the path to the zip file. The cached file is returned when it is None.
+        layer (bool, optional): put the files under python/ for a layer.
+    Returns:
+        dict: the path to the zip file (ZipFile), CodeSha256, the hash of the inputs (Hash),
+            the number of files (Files), whether it was cached (Cached) and the seconds (Seconds).
+    '''
+
+    def build(self, source_dir: str, zip_file=None, layer=False) -> dict:
+        prefix = LambdaBuilder.LAYER_PREFIX if layer else ''
+        return LambdaBuilder._build(source_dir, zip_file, prefix, self.cache_dir)
+
+    ''' build the zip files in parallel processes.
+    Args:
+        sources (dict): the source directories by the name. e.g. {'my_function': 'src/my_function'}
+        out_dir (str, optional): the directory into which {name}.zip are written. The cached files are returned when it is None.
+        layer (bool, optional): put the files under python/ for layers.
+        error_option (int, optional): the option when a build fails.
+            CMD_OPTION_STOP(defalt): stop the processing after all builds finish.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        dict: the reports by the name. Refer build. The report of a failed build has Error.
+    '''
+
+    def buildMany(self, sources: Dict[str, str], out_dir=None, layer=False, error_option=CliEnum.CMD_OPTION_STOP) -> Dict[str, dict]:
+        prefix = LambdaBuilder.LAYER_PREFIX if layer else ''
+        if out_dir is not None:
+            Path(out_dir).mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        reports = dict()
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(sources) or 1)) as executor:
+            futures = {name: executor.submit(LambdaBuilder._build, source_dir,
+                                             None if out_dir is None else str(
+                                                 Path(out_dir) / f"{name}.zip"),
+                                             prefix, self.cache_dir)
+                       for name, source_dir in sources.items()}
+            for name, future in futures.items():
+                try:
+                    reports[name] = future.result()
+                except Exception as e:
+                    reports[name] = {'Error': f"{type(e).__name__}: {e}"}
+        failed = [name for name, report in reports.items() if 'Error' in report]
+        cached = len([report for report in reports.values()
+                      if report.get('Cached')])
+        for name in failed:
+            Cli.stdout(f"{name}: {reports[name]['Error']}", CliEnum.SEVERIY_ERROR)
+        severity = CliEnum.SEVERIY_ERROR if failed else CliEnum.SEVERIY_INFO
+        Cli.stdout(f"{len(reports) - cached - len(failed)} built, {cached} cached, {len(failed)} failed "
+                   f"in {time.perf_counter() - started:.2f}s", severity)
+        if failed and error_option == CliEnum.CMD_OPTION_STOP:
+            sys.exit()
+        return reports
+
+    ''' build a zip file in a worker process. Refer build.
+        It is not name-mangled so that the process pool can pickle it.
+    Args:
+        source_dir (str): the source directory.
+        zip_file (str): the path to the zip file, or None.
+        prefix (str): the directory of the entries in the zip file.
+        cache_dir (str): the cache directory.
+    Returns:
+        dict: the report.
+    '''
+    @staticmethod
+    def _build(source_dir: str, zip_file: str, prefix: str, cache_dir: str) -> dict:
+        started = time.perf_counter()
+        files = LambdaBuilder.__walk(Path(source_dir).expanduser())
+        digest = LambdaBuilder.__hash(files, prefix)
+        cache_file = Path(cache_dir) / f"{digest}.zip"
+        cached = cache_file.is_file()
+        if not cached:
+            Cli.writeAtomic(cache_file, lambda tmp_file: LambdaBuilder.__zip(
+                files, prefix, tmp_file))
+        if zip_file is None:
+            zip_file = str(cache_file)
+        else:
+            Path(zip_file).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cache_file, zip_file)
+        return {'ZipFile': zip_file, 'CodeSha256': LambdaCli.codeSha256(cache_file), 'Hash': digest, 'Files': len(files),
+                'Cached': cached, 'Seconds': time.perf_counter() - started}
+
+    ''' list the files of the source directory in the order of the entries.
+    Args:
+        source_dir (Path): the source directory.
+    Returns:
+        list: the relative paths with '/' & the paths of the files.
+    '''
+    @staticmethod
+    def __walk(source_dir: Path) -> List[Tuple[str, Path]]:
+        if not source_dir.is_dir():
+            raise FileNotFoundError(f"{source_dir} is not a directory.")
+        files = []
+        for root, dirs, names in os.walk(source_dir):
+            dirs[:] = [name for name in dirs
+                       if not LambdaBuilder.__isExcluded(name)]
+            for name in names:
+                if LambdaBuilder.__isExcluded(name):
+                    continue
+                path = Path(root) / name
+                files.append((path.relative_to(source_dir).as_posix(), path))
+        return sorted(files)
+
+    ''' check whether the file or directory is excluded.
+    Args:
+        name (str): the name.
+    Returns:
+        bool: True when it is not packaged.
+    '''
+    @staticmethod
+    def __isExcluded(name: str) -> bool:
+        return any(fnmatch(name, pattern) for pattern in LambdaBuilder.EXCLUDES)
+
+    ''' hash the inputs of the zip file: the paths, the executable bits and the contents of the files.
+    Args:
+        files (list): the files. Refer __walk.
+        prefix (str): the directory of the entries in the zip file.
+    Returns:
+        str: the hex SHA-256.
+    '''
+    @staticmethod
+    def __hash(files: List[Tuple[str, Path]], prefix: str) -> str:
+        sha256 = hashlib.sha256()
+        sha256.update(
+            f"{LambdaBuilder.FORMAT_VERSION}\0{prefix}\0".encode())
+        for name, path in files:
+            file_sha256 = hashlib.sha256()
+            with open(path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    file_sha256.update(chunk)
+            sha256.update(
+                f"{name}\0{LambdaBuilder.__mode(path):o}\0{file_sha256.hexdigest()}\n".encode())
+        return sha256.hexdigest()
+
+    ''' get the normalized permission of the file.
+    Args:
+        path (Path): the file path.
+    Returns:
+        int: 0o755 when it is executable, otherwise 0o644.
+    '''
+    @staticmethod
+    def __mode(path: Path) -> int:
+        return 0o755 if os.stat(path).st_mode & 0o111 else 0o644
+
+    ''' write the zip file whose bytes depend only on the inputs.
+    Args:
+        files (list): the files. Refer __walk.
+        prefix (str): the directory of the entries in the zip file.
+        zip_file (Path): the path to the zip file.
+    '''
+    @staticmethod
+    def __zip(files: List[Tuple[str, Path]], prefix: str, zip_file: Path) -> None:
+        with zipfile.ZipFile(zip_file, 'w') as archive:
+            for name, path in files:
+                info = zipfile.ZipInfo(
+                    f"{prefix}{name}", date_time=LambdaBuilder.DATE_TIME)
+                # unix, so that Lambda keeps the permission.
+                info.create_system = 3
+                info.external_attr = (
+                    0o100000 | LambdaBuilder.__mode(path)) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.file_size = os.stat(path).st_size
+                with open(path, 'rb') as source, archive.open(info, 'w') as target:
+                    shutil.copyfileobj(source, target, 1024 * 1024)
@@ -2,8 +2,13 @@
 # the following is not necessary if Python version is 3.9 or over.
 from __future__ import annotations
 
-import yaml
+import base64
+import hashlib
+import json
+import subprocess
 import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 from .aws_cli import AwsCli
 from ..cli_enum import CliEnum
 
@@ -13,13 +18,17 @@ This is Lambda Command Class
 
 
 class LambdaCli(AwsCli):
+    # the principal & the action of the permission added by addPermission.
+    PERMISSION_PRINCIPAL = 'apigateway.amazonaws.com'
+    PERMISSION_ACTION = 'lambda:InvokeFunction'
 
     ''' constructor.
         Refer super class's constructor.
     '''
 
-    def __init__(self, aws_profile: str, environment: str, region='ap-northeast-1') -> LambdaCli:
-        super().__init__(aws_profile=aws_profile, environment=environment, region=region)
+    def __init__(self, aws_profile: str, environment: str, region='ap-northeast-1', backend=CliEnum.BACKEND_CLI) -> LambdaCli:
+        super().__init__(aws_profile=aws_profile, environment=environment,
+                         region=region, backend=backend)
 
     ''' create the lambda function.
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/create-function.html
@@ -36,21 +45,17 @@ class LambdaCli(AwsCli):
     '''
 
     def createFunction(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda create-function --function-name {function_name} " \
-            '--runtime python3.8 ' \
-            f"--role {role} " \
-            f'--handler {function_name}.lambda_handler ' \
-            f"--timeout {timeout} " \
-            f"--memory-size {memory_size} " \
-            f"--zip-file fileb://{zip_file} --output yaml "
-        if description:
-            cmd += f"--description {re.escape(description)} "
-        if self.environment:
-            syntax = f"Variables={{AWS_LAMBDA_FUNCTION_ALIAS={self.environment}}}"
-            cmd += f"--environment {syntax} "
-        if layers:
-            cmd += f"--layers {' '.join(layers)} "
-        LambdaCli.execCmd(cmd)
+        cmd, params = self.__createFunctionRequest(
+            function_name, zip_file, role, timeout, memory_size, layers, description)
+        return self.execAws(cmd, 'lambda', 'create_function', params)
+
+    ''' create the lambda function asynchronously.
+        Refer createFunction.
+    '''
+    async def createFunctionAsync(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> subprocess.CompletedProcess:
+        cmd, params = self.__createFunctionRequest(
+            function_name, zip_file, role, timeout, memory_size, layers, description)
+        return await self.execAwsAsync(cmd, 'lambda', 'create_function', params)
 
     ''' update the lambda function.
         TODO: dynamodb と同様に--cli-input-jsonでupload知るように修正
@@ -63,26 +68,161 @@ class LambdaCli(AwsCli):
         memory_size (int): The amount of memory available to the function at runtime.
         layers (str): A list of function layers to add to the function’s execution environment. 
         description (str, optional): the description of this function.
+        incremental (bool, optional): skip uploading the code when its CodeSha256 is the same as the zip file,
+            and skip updating the configuration when it is the same as the arguments.
+            $LATEST is compared with the version of the alias too, so that the code uploaded by a run
+            which failed before publishing (e.g. a throttle or Ctrl-C) is still published by the next run.
     Returns:
         subprocess.CompletedProcess: the result of executing command.
+            None when nothing is updated in the incremental mode and the alias is on the same code & configuration,
+            so publishing a version can be skipped.
+            The result of get-function-configuration of the alias when only the alias is behind.
+    e.g.
+        if lambda_cli.updateFunction(name, zip_file, role, 30, 128, layers, incremental=True):
+            version = lambda_cli.publishFunction(name)
+            lambda_cli.updateAlias(name, version)
     '''
-    def updateFunction(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda update-function-code --function-name {function_name} --zip-file fileb://{zip_file} --output yaml"
-        LambdaCli.execCmd(cmd)
-        cmd = f"aws lambda update-function-configuration --function-name {function_name} --output yaml " \
-            '--runtime python3.8 ' \
-            f"--role {role} " \
-            f'--handler {function_name}.lambda_handler ' \
-            f"--timeout {timeout} " \
-            f"--memory-size {memory_size} "
-        if description:
-            cmd += f"--description {re.escape(description)} "
-        if self.environment:
-            syntax = f"Variables={{AWS_LAMBDA_FUNCTION_ALIAS={self.environment}}}"
-            cmd += f"--environment {syntax} "
-        if layers:
-            cmd += f"--layers {' '.join(layers)} "
-        LambdaCli.execCmd(cmd)
+    def updateFunction(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None, incremental=False) -> Optional[subprocess.CompletedProcess]:
+        result = None
+        code_cmd, code_params = self.__updateFunctionCodeRequest(
+            function_name, zip_file)
+        config_cmd, config_params = self.__updateFunctionConfigurationRequest(
+            function_name, role, timeout, memory_size, layers, description)
+        update_code, update_config = True, True
+        if incremental:
+            current = self.getFunctionConfiguration(function_name)
+            update_code, update_config = LambdaCli.__diffFunction(
+                current, zip_file, config_params)
+            if not update_code and not update_config:
+                cmd, params = self.__aliasConfigurationRequest(function_name)
+                output = self.execAws(cmd, 'lambda', 'get_function_configuration',
+                                      params, CliEnum.CMD_OPTION_CONTINUE)
+                if LambdaCli.__isAliasBehind(output, zip_file, config_params):
+                    result = output
+        if update_code:
+            result = self.execAws(code_cmd, 'lambda',
+                                  'update_function_code', code_params)
+        if update_config:
+            result = self.execAws(config_cmd, 'lambda',
+                                  'update_function_configuration', config_params)
+        return result
+
+    ''' update the lambda function asynchronously.
+        Refer updateFunction.
+    '''
+    async def updateFunctionAsync(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None, incremental=False) -> Optional[subprocess.CompletedProcess]:
+        result = None
+        code_cmd, code_params = self.__updateFunctionCodeRequest(
+            function_name, zip_file)
+        config_cmd, config_params = self.__updateFunctionConfigurationRequest(
+            function_name, role, timeout, memory_size, layers, description)
+        update_code, update_config = True, True
+        if incremental:
+            current = await self.getFunctionConfigurationAsync(function_name)
+            update_code, update_config = LambdaCli.__diffFunction(
+                current, zip_file, config_params)
+            if not update_code and not update_config:
+                cmd, params = self.__aliasConfigurationRequest(function_name)
+                output = await self.execAwsAsync(cmd, 'lambda', 'get_function_configuration',
+                                                 params, CliEnum.CMD_OPTION_CONTINUE)
+                if LambdaCli.__isAliasBehind(output, zip_file, config_params):
+                    result = output
+        if update_code:
+            result = await self.execAwsAsync(code_cmd, 'lambda',
+                                             'update_function_code', code_params)
+        if update_config:
+            result = await self.execAwsAsync(config_cmd, 'lambda',
+                                             'update_function_configuration', config_params)
+        return result
+
+    ''' get the configuration of the lambda function ($LATEST).
+        Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/get-function-configuration.html
+    Args:
+        function_name (str): The name of the Lambda function.
+    Returns:
+        dict: the configuration.
+    '''
+    def getFunctionConfiguration(self, function_name: str) -> dict:
+        cmd = f"aws lambda get-function-configuration --function-name {function_name} --output json"
+        output = self.execAws(cmd, 'lambda', 'get_function_configuration',
+                              {'FunctionName': function_name})
+        return LambdaCli.parseOutput(output.stdout)
+
+    ''' get the configuration of the lambda function asynchronously.
+        Refer getFunctionConfiguration.
+    '''
+    async def getFunctionConfigurationAsync(self, function_name: str) -> dict:
+        cmd = f"aws lambda get-function-configuration --function-name {function_name} --output json"
+        output = await self.execAwsAsync(cmd, 'lambda', 'get_function_configuration',
+                                         {'FunctionName': function_name})
+        return LambdaCli.parseOutput(output.stdout)
+
+    ''' calculate the SHA-256 of the zip file in the same format as CodeSha256 of Lambda.
+    Args:
+        zip_file (str): The path to the zip file.
+    Returns:
+        str: the base64 encoded SHA-256.
+    '''
+    @staticmethod
+    def codeSha256(zip_file: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(Path(zip_file).expanduser(), 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        return base64.b64encode(sha256.digest()).decode()
+
+    ''' build the request of get-function-configuration of the version which the alias points to.
+    Args:
+        function_name (str): The name of the Lambda function.
+    Returns:
+        tuple: the command & the parameters.
+    '''
+    def __aliasConfigurationRequest(self, function_name: str) -> Tuple[str, dict]:
+        cmd = f"aws lambda get-function-configuration --function-name {function_name} --qualifier {self.environment} --output json"
+        params = {'FunctionName': function_name, 'Qualifier': self.environment}
+        return cmd, params
+
+    ''' check whether the version of the alias is not the zip file and the desired configuration.
+    Args:
+        output (subprocess.CompletedProcess): the result of get-function-configuration of the alias.
+        zip_file (str): The path to the zip file.
+        params (dict): the parameters of update-function-configuration.
+    Returns:
+        bool: True when the alias does not exist or is on another code or configuration.
+    '''
+    @staticmethod
+    def __isAliasBehind(output: subprocess.CompletedProcess, zip_file: str, params: dict) -> bool:
+        if output is None or output.returncode != 0:
+            return True
+        return any(LambdaCli.__diffFunction(LambdaCli.parseOutput(output.stdout), zip_file, params))
+
+    ''' compare the current function with the zip file and the desired configuration.
+    Args:
+        current (dict): the current configuration. Refer getFunctionConfiguration.
+        zip_file (str): The path to the zip file.
+        params (dict): the parameters of update-function-configuration.
+    Returns:
+        tuple: whether the code is changed & whether the configuration is changed.
+    '''
+    @staticmethod
+    def __diffFunction(current: dict, zip_file: str, params: dict) -> Tuple[bool, bool]:
+        code_changed = current.get('CodeSha256') != LambdaCli.codeSha256(zip_file)
+        config_changed = False
+        for key, value in params.items():
+            if key == 'FunctionName':
+                continue
+            if key == 'Layers':
+                current_value = [layer['Arn']
+                                 for layer in current.get('Layers', [])]
+            elif key == 'Environment':
+                current_value = {
+                    'Variables': current.get('Environment', dict()).get('Variables', dict())}
+            else:
+                current_value = current.get(key)
+            if current_value != value:
+                config_changed = True
+                break
+        return code_changed, config_changed
 
     ''' create the lambda alias
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/create-alias.html
@@ -94,10 +234,17 @@ class LambdaCli(AwsCli):
         subprocess.CompletedProcess: the result of executing command.
     '''
     def createAlias(self, funciton_name: str, version: str, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda create-alias --function-name {funciton_name} --name {self.environment} --function-version {re.escape(version)} --output yaml"
-        if description:
-            cmd += f"--description {re.escape(description)} "
-        LambdaCli.execCmd(cmd)
+        cmd, params = self.__aliasRequest(
+            'create-alias', funciton_name, version, description)
+        return self.execAws(cmd, 'lambda', 'create_alias', params)
+
+    ''' create the lambda alias asynchronously.
+        Refer createAlias.
+    '''
+    async def createAliasAsync(self, funciton_name: str, version: str, description=None) -> subprocess.CompletedProcess:
+        cmd, params = self.__aliasRequest(
+            'create-alias', funciton_name, version, description)
+        return await self.execAwsAsync(cmd, 'lambda', 'create_alias', params)
 
     ''' update the lambda alias
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/update-alias.html
@@ -109,32 +256,58 @@ class LambdaCli(AwsCli):
         subprocess.CompletedProcess: the result of executing command.
     '''
     def updateAlias(self, funciton_name: str, version: str, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda update-alias --function-name {funciton_name} --name {self.environment} --function-version {re.escape(version)} --output yaml"
-        if description:
-            cmd += f"--description {re.escape(description)} "
-        LambdaCli.execCmd(cmd)
+        cmd, params = self.__aliasRequest(
+            'update-alias', funciton_name, version, description)
+        return self.execAws(cmd, 'lambda', 'update_alias', params)
+
+    ''' update the lambda alias asynchronously.
+        Refer updateAlias.
+    '''
+    async def updateAliasAsync(self, funciton_name: str, version: str, description=None) -> subprocess.CompletedProcess:
+        cmd, params = self.__aliasRequest(
+            'update-alias', funciton_name, version, description)
+        return await self.execAwsAsync(cmd, 'lambda', 'update_alias', params)
 
     ''' add permission into the lambda function in order to registere API Gateway.
+        The policy of each function is got once, and the functions are processed concurrently.
+        The permissions of a function are added one by one, because Lambda updates its policy serially.
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/add-permission.html
     Args:
         api_id (str): API ID of on the API Gateway.
         functions (str): A list of function names.
+        max_workers (int, optional): the maximum number of functions processed at the same time.
     Returns:
         subprocess.CompletedProcess: the result of executing command.
     '''
-    def addPermission(self, api_id: str, functions: str) -> subprocess.CompletedProcess:
-        for func in functions:
-            statement_id = LambdaCli.getRandomStr(36)
-            function_name = f"arn:aws:lambda:{self.region}:{self.aws_account}:function:{func['lambda_name']}:{self.environment}"
-            for method in func['methods']:
-                if method == 'OPTIONS':
+    def addPermission(self, api_id: str, functions: str, max_workers=8) -> subprocess.CompletedProcess:
+        def add(func: dict) -> None:
+            permissions = self.__getPermissions(func['lambda_name'])
+            for source_arn in self.__permissionSourceArns(api_id, func):
+                permission = (source_arn, LambdaCli.PERMISSION_PRINCIPAL,
+                              LambdaCli.PERMISSION_ACTION)
+                if permission in permissions:
                     continue
-                source_arn = f"arn:aws:execute-api:{self.region}:{self.aws_account}:{api_id}/*/{method}/{func['resource_name']}"
-                if self.__exsistsPermission(
-                        func['lambda_name'], source_arn):
+                cmd, params = self.__addPermissionRequest(func, source_arn)
+                self.execAws(cmd, 'lambda', 'add_permission', params)
+                permissions.add(permission)
+        LambdaCli.mapParallel(add, functions, max_workers)
+
+    ''' add permission into the lambda functions asynchronously.
+        Refer addPermission.
+    '''
+    async def addPermissionAsync(self, api_id: str, functions: str) -> None:
+        import asyncio
+        async def add(func: dict) -> None:
+            permissions = await self.__getPermissionsAsync(func['lambda_name'])
+            for source_arn in self.__permissionSourceArns(api_id, func):
+                permission = (source_arn, LambdaCli.PERMISSION_PRINCIPAL,
+                              LambdaCli.PERMISSION_ACTION)
+                if permission in permissions:
                     continue
-                cmd = f"aws lambda add-permission  --function-name '{function_name}'  --source-arn '{source_arn}'  --principal apigateway.amazonaws.com  --statement-id {statement_id}  --action lambda:InvokeFunction  --output yaml"
-                LambdaCli.execCmd(cmd)
+                cmd, params = self.__addPermissionRequest(func, source_arn)
+                await self.execAwsAsync(cmd, 'lambda', 'add_permission', params)
+                permissions.add(permission)
+        await asyncio.gather(*[add(func) for func in functions])
 
     ''' create a version from the current code and configuration of a function of AWS Lambda.
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/publish-version.html
@@ -145,12 +318,19 @@ class LambdaCli(AwsCli):
         subprocess.CompletedProcess: the result of executing command.
     '''
     def publishFunction(self, function_name: str, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda publish-version --function-name {function_name} --output yaml"
-        if description:
-            cmd += f" --description {re.escape(description)}"
-        output = LambdaCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
-        return output_yaml['Version']
+        cmd, params = self.__publishFunctionRequest(function_name, description)
+        output = self.execAws(cmd, 'lambda', 'publish_version', params)
+        output_json = LambdaCli.parseOutput(output.stdout)
+        return output_json['Version']
+
+    ''' create a version of the lambda function asynchronously.
+        Refer publishFunction.
+    '''
+    async def publishFunctionAsync(self, function_name: str, description=None) -> str:
+        cmd, params = self.__publishFunctionRequest(function_name, description)
+        output = await self.execAwsAsync(cmd, 'lambda', 'publish_version', params)
+        output_json = LambdaCli.parseOutput(output.stdout)
+        return output_json['Version']
 
     ''' creates an AWS Lambda layer from a ZIP archive.
         Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/publish-layer-version.html
@@ -158,14 +338,68 @@ class LambdaCli(AwsCli):
         function_name (str): The name of the Lambda function.
         zip_file (str): The path to the zip file of the code you are uploading.
         description (str, optional): A description of the alias.
+        incremental (bool, optional): skip publishing when the CodeSha256 of the latest version is the same as the zip file.
+            Build the zip file reproducibly (Refer LambdaBuilder), otherwise it is always different.
     Returns:
         subprocess.CompletedProcess: the result of executing command.
+            None when nothing is published in the incremental mode.
     '''
-    def publishLayer(self, layer_name: str, zip_file: str, description=None) -> subprocess.CompletedProcess:
-        cmd = f"aws lambda publish-layer-version --layer-name {layer_name} --license-info 'MIT' --compatible-runtimes python3.8 --zip-file fileb://{zip_file} --output yaml"
-        if description:
-            cmd += f" --description {re.escape(description)}"
-        LambdaCli.execCmd(cmd)
+    def publishLayer(self, layer_name: str, zip_file: str, description=None, incremental=False) -> Optional[subprocess.CompletedProcess]:
+        if incremental:
+            latest = self.getLatestLayerVersion(layer_name)
+            if latest is not None and latest['Content'].get('CodeSha256') == LambdaCli.codeSha256(zip_file):
+                return None
+        cmd, params = self.__publishLayerRequest(
+            layer_name, zip_file, description)
+        return self.execAws(cmd, 'lambda', 'publish_layer_version', params)
+
+    ''' creates an AWS Lambda layer asynchronously.
+        Refer publishLayer.
+    '''
+    async def publishLayerAsync(self, layer_name: str, zip_file: str, description=None, incremental=False) -> Optional[subprocess.CompletedProcess]:
+        if incremental:
+            latest = await self.getLatestLayerVersionAsync(layer_name)
+            if latest is not None and latest['Content'].get('CodeSha256') == LambdaCli.codeSha256(zip_file):
+                return None
+        cmd, params = self.__publishLayerRequest(
+            layer_name, zip_file, description)
+        return await self.execAwsAsync(cmd, 'lambda', 'publish_layer_version', params)
+
+    ''' get the latest version of the layer.
+        Ref: https://awscli.amazonaws.com/v2/documentation/api/latest/reference/lambda/get-layer-version.html
+    Args:
+        layer_name (str): The name of the layer.
+    Returns:
+        dict: the layer version which has Content.CodeSha256, or None when the layer has no version.
+    '''
+    def getLatestLayerVersion(self, layer_name: str) -> Optional[dict]:
+        cmd, params = self.__listLayerVersionsRequest(layer_name)
+        output = self.execAws(cmd, 'lambda', 'list_layer_versions',
+                              params, CliEnum.CMD_OPTION_CONTINUE)
+        versions = LambdaCli.parseOutput(output.stdout).get('LayerVersions', []) \
+            if output.returncode == 0 else []
+        if not versions:
+            return None
+        cmd, params = self.__getLayerVersionRequest(
+            layer_name, versions[0]['Version'])
+        output = self.execAws(cmd, 'lambda', 'get_layer_version', params)
+        return LambdaCli.parseOutput(output.stdout)
+
+    ''' get the latest version of the layer asynchronously.
+        Refer getLatestLayerVersion.
+    '''
+    async def getLatestLayerVersionAsync(self, layer_name: str) -> Optional[dict]:
+        cmd, params = self.__listLayerVersionsRequest(layer_name)
+        output = await self.execAwsAsync(cmd, 'lambda', 'list_layer_versions',
+                                         params, CliEnum.CMD_OPTION_CONTINUE)
+        versions = LambdaCli.parseOutput(output.stdout).get('LayerVersions', []) \
+            if output.returncode == 0 else []
+        if not versions:
+            return None
+        cmd, params = self.__getLayerVersionRequest(
+            layer_name, versions[0]['Version'])
+        output = await self.execAwsAsync(cmd, 'lambda', 'get_layer_version', params)
+        return LambdaCli.parseOutput(output.stdout)
 
     ''' check whether the lambda function exists or not.
     Args:
@@ -174,8 +408,21 @@ class LambdaCli(AwsCli):
         bool: whether the lambda function exists or not.
     '''
     def existsFunction(self, function_name: str) -> bool:
-        cmd = f"aws lambda get-function --function-name {function_name} --output yaml"
-        output = LambdaCli.execCmd(cmd, CliEnum.CMD_OPTION_CONTINUE)
+        cmd = f"aws lambda get-function --function-name {function_name} --output json"
+        params = {'FunctionName': function_name}
+        output = self.execAws(cmd, 'lambda', 'get_function',
+                              params, CliEnum.CMD_OPTION_CONTINUE)
+        return True if output.returncode == 0 \
+            else False
+
+    ''' check whether the lambda function exists or not asynchronously.
+        Refer existsFunction.
+    '''
+    async def existsFunctionAsync(self, function_name: str) -> bool:
+        cmd = f"aws lambda get-function --function-name {function_name} --output json"
+        params = {'FunctionName': function_name}
+        output = await self.execAwsAsync(cmd, 'lambda', 'get_function',
+                                         params, CliEnum.CMD_OPTION_CONTINUE)
         return True if output.returncode == 0 \
             else False
 
@@ -186,39 +433,279 @@ class LambdaCli(AwsCli):
         bool: whether the alias of the lambda function exists or not.
     '''
     def existsAlias(self, function_name: str) -> bool:
-        cmd = f"aws lambda get-alias --function-name {function_name} --name {self.environment} --output yaml"
-        output = LambdaCli.execCmd(cmd, CliEnum.CMD_OPTION_CONTINUE)
+        cmd = f"aws lambda get-alias --function-name {function_name} --name {self.environment} --output json"
+        params = {'FunctionName': function_name, 'Name': self.environment}
+        output = self.execAws(cmd, 'lambda', 'get_alias',
+                              params, CliEnum.CMD_OPTION_CONTINUE)
+        return True if output.returncode == 0 \
+            else False
+
+    ''' check whether the alias of the lambda function exists or not asynchronously.
+        Refer existsAlias.
+    '''
+    async def existsAliasAsync(self, function_name: str) -> bool:
+        cmd = f"aws lambda get-alias --function-name {function_name} --name {self.environment} --output json"
+        params = {'FunctionName': function_name, 'Name': self.environment}
+        output = await self.execAwsAsync(cmd, 'lambda', 'get_alias',
+                                         params, CliEnum.CMD_OPTION_CONTINUE)
         return True if output.returncode == 0 \
             else False
 
-    ''' check whether the permission of the lambda function exists or not.
+    ''' get the permissions of the lambda function alias from its policy.
     Args:
         function_name (str): The name of the Lambda function.
-        source_arn (str): source arn of lambda function.
     Returns:
-        bool: whether the permission of the lambda function exists or not.
+        set: the permissions (source_arn, principal, action). Empty when the function has no policy.
     '''
-    def __exsistsPermission(self, function_name: str, source_arn: str) -> bool:
-        cmd = f"aws lambda get-policy --function-name '{function_name}:{self.environment}' --output yaml"
-        output = LambdaCli.execCmd(cmd, CliEnum.CMD_OPTION_CONTINUE)
+    def __getPermissions(self, function_name: str) -> Set[Tuple[str, str, str]]:
+        cmd = f"aws lambda get-policy --function-name '{function_name}:{self.environment}' --output json"
+        params = {'FunctionName': f"{function_name}:{self.environment}"}
+        output = self.execAws(cmd, 'lambda', 'get_policy',
+                              params, CliEnum.CMD_OPTION_CONTINUE)
+        return LambdaCli.__parsePermissions(output)
+
+    ''' get the permissions of the lambda function alias asynchronously.
+        Refer __getPermissions.
+    '''
+    async def __getPermissionsAsync(self, function_name: str) -> Set[Tuple[str, str, str]]:
+        cmd = f"aws lambda get-policy --function-name '{function_name}:{self.environment}' --output json"
+        params = {'FunctionName': f"{function_name}:{self.environment}"}
+        output = await self.execAwsAsync(cmd, 'lambda', 'get_policy',
+                                         params, CliEnum.CMD_OPTION_CONTINUE)
+        return LambdaCli.__parsePermissions(output)
+
+    ''' parse the result of get-policy into the permissions.
+    Args:
+        output (subprocess.CompletedProcess): the result of get-policy.
+    Returns:
+        set: the permissions (source_arn, principal, action).
+    '''
+    @staticmethod
+    def __parsePermissions(output: subprocess.CompletedProcess) -> Set[Tuple[str, str, str]]:
+        permissions = set()
         if not output.returncode == 0:
-            return False
-        output_yaml = yaml.safe_load(output.stdout)
-        return True if source_arn in output_yaml['Policy'] \
-            else False
+            return permissions
+        output_json = LambdaCli.parseOutput(output.stdout)
+        policy = json.loads(output_json['Policy'])
+        for statement in policy.get('Statement', []):
+            principal = statement.get('Principal')
+            principals = principal.values() if isinstance(principal, dict) \
+                else [principal]
+            principals = [item for value in principals
+                          for item in (value if isinstance(value, list) else [value])]
+            actions = statement.get('Action')
+            actions = actions if isinstance(actions, list) else [actions]
+            source_arns = [condition['AWS:SourceArn']
+                           for condition in statement.get('Condition', dict()).values()
+                           if 'AWS:SourceArn' in condition]
+            for source_arn in source_arns:
+                for principal in principals:
+                    for action in actions:
+                        permissions.add((source_arn, principal, action))
+        return permissions
+
+    ''' iterate the layers compatible with python3.8.
+        Refer iterItems.
+    Args:
+        page_size (int, optional): the number of layers fetched at once.
+    Yields:
+        dict: the layer.
+    '''
+    def iterLayers(self, page_size=None) -> Iterator[dict]:
+        cmd = 'aws lambda list-layers --compatible-runtime python3.8 --output json'
+        params = {'CompatibleRuntime': 'python3.8'}
+        return self.iterItems(cmd, 'lambda', 'list_layers', 'Layers', params, page_size)
 
     ''' get layers information.
     Returns:
         dict: layers information.
     '''
     def getLayers(self) -> dict:
-        cmd = 'aws lambda list-layers --compatible-runtime python3.8 --output yaml'
-        output = LambdaCli.execCmd(cmd)
-        output_yaml = yaml.safe_load(output.stdout)
+        return LambdaCli.__toLayers(self.iterLayers())
+
+    ''' get layers information asynchronously.
+        Refer getLayers.
+    '''
+    async def getLayersAsync(self) -> dict:
+        cmd = 'aws lambda list-layers --compatible-runtime python3.8 --output json'
+        params = {'CompatibleRuntime': 'python3.8'}
+        output = await self.execAwsAsync(cmd, 'lambda', 'list_layers', params)
+        output_json = LambdaCli.parseOutput(output.stdout)
+        return LambdaCli.__toLayers(output_json['Layers'])
+
+    ''' convert the layers into the information.
+    Args:
+        layers_iter (Iterable): the layers.
+    Returns:
+        dict: layers information.
+    '''
+    @staticmethod
+    def __toLayers(layers_iter: Iterable[dict]) -> dict:
         layers = dict()
-        for layer in output_yaml['Layers']:
+        for layer in layers_iter:
             layers[layer['LayerName']] = {
                 'LayerArn': layer['LayerArn'],
                 'LayerVersionArn': layer['LatestMatchingVersion']['LayerVersionArn']
             }
         return layers
+
+    ''' build the request of create-function.
+        Refer createFunction.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __createFunctionRequest(self, function_name: str, zip_file: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> Tuple[str, dict]:
+        cmd = f"aws lambda create-function --function-name {function_name} " \
+            f"--zip-file fileb://{zip_file} --output json "
+        options, params = self.__configuration(function_name,
+                                               role, timeout, memory_size, layers, description)
+        params['Code'] = {'ZipFile': Path(zip_file)}
+        return cmd + options, params
+
+    ''' build the request of update-function-code.
+        Refer updateFunction.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __updateFunctionCodeRequest(self, function_name: str, zip_file: str) -> Tuple[str, dict]:
+        cmd = f"aws lambda update-function-code --function-name {function_name} --zip-file fileb://{zip_file} --output json"
+        params = {'FunctionName': function_name, 'ZipFile': Path(zip_file)}
+        return cmd, params
+
+    ''' build the request of update-function-configuration.
+        Refer updateFunction.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __updateFunctionConfigurationRequest(self, function_name: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> Tuple[str, dict]:
+        cmd = f"aws lambda update-function-configuration --function-name {function_name} --output json "
+        options, params = self.__configuration(function_name,
+                                               role, timeout, memory_size, layers, description)
+        return cmd + options, params
+
+    ''' build the function configuration.
+        create-function and update-function-configuration share it.
+    Returns:
+        tuple: the command options & the parameters of the operation.
+    '''
+    def __configuration(self, function_name: str, role: str, timeout: int, memory_size: int, layers: list, description=None) -> Tuple[str, dict]:
+        options = '--runtime python3.8 ' \
+            f"--role {role} " \
+            f'--handler {function_name}.lambda_handler ' \
+            f"--timeout {timeout} " \
+            f"--memory-size {memory_size} "
+        params = {
+            'FunctionName': function_name,
+            'Runtime': 'python3.8',
+            'Role': role,
+            'Handler': f"{function_name}.lambda_handler",
+            'Timeout': timeout,
+            'MemorySize': memory_size
+        }
+        if description:
+            options += f"--description {re.escape(description)} "
+            params['Description'] = description
+        if self.environment:
+            syntax = f"Variables={{AWS_LAMBDA_FUNCTION_ALIAS={self.environment}}}"
+            options += f"--environment {syntax} "
+            params['Environment'] = {
+                'Variables': {'AWS_LAMBDA_FUNCTION_ALIAS': self.environment}}
+        if layers:
+            options += f"--layers {' '.join(layers)} "
+            params['Layers'] = list(layers)
+        return options, params
+
+    ''' build the request of create-alias or update-alias.
+    Args:
+        sub_command (str): create-alias or update-alias.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __aliasRequest(self, sub_command: str, funciton_name: str, version: str, description=None) -> Tuple[str, dict]:
+        cmd = f"aws lambda {sub_command} --function-name {funciton_name} --name {self.environment} --function-version {re.escape(version)} --output json "
+        params = {'FunctionName': funciton_name,
+                  'Name': self.environment, 'FunctionVersion': version}
+        if description:
+            cmd += f"--description {re.escape(description)} "
+            params['Description'] = description
+        return cmd, params
+
+    ''' build the source arns of the methods which invoke the lambda function.
+    Args:
+        api_id (str): API ID of on the API Gateway.
+        func (dict): the lambda info which has lambda_name, resource_name and methods.
+    Returns:
+        list: source arns.
+    '''
+    def __permissionSourceArns(self, api_id: str, func: dict) -> List[str]:
+        return [f"arn:aws:execute-api:{self.region}:{self.aws_account}:{api_id}/*/{method}/{func['resource_name']}"
+                for method in func['methods'] if method != 'OPTIONS']
+
+    ''' build the request of add-permission.
+        The statement id is generated for each permission, because it must be unique in the policy.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __addPermissionRequest(self, func: dict, source_arn: str) -> Tuple[str, dict]:
+        statement_id = LambdaCli.getRandomStr(36)
+        function_name = f"arn:aws:lambda:{self.region}:{self.aws_account}:function:{func['lambda_name']}:{self.environment}"
+        cmd = f"aws lambda add-permission  --function-name '{function_name}'  --source-arn '{source_arn}'  --principal {LambdaCli.PERMISSION_PRINCIPAL}  --statement-id {statement_id}  --action {LambdaCli.PERMISSION_ACTION}  --output json"
+        params = {
+            'FunctionName': function_name,
+            'SourceArn': source_arn,
+            'Principal': LambdaCli.PERMISSION_PRINCIPAL,
+            'StatementId': statement_id,
+            'Action': LambdaCli.PERMISSION_ACTION
+        }
+        return cmd, params
+
+    ''' build the request of publish-version.
+        Refer publishFunction.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __publishFunctionRequest(self, function_name: str, description=None) -> Tuple[str, dict]:
+        cmd = f"aws lambda publish-version --function-name {function_name} --output json"
+        params = {'FunctionName': function_name}
+        if description:
+            cmd += f" --description {re.escape(description)}"
+            params['Description'] = description
+        return cmd, params
+
+    ''' build the request of list-layer-versions, which gets only the latest version.
+        Refer getLatestLayerVersion.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __listLayerVersionsRequest(self, layer_name: str) -> Tuple[str, dict]:
+        cmd = f"aws lambda list-layer-versions --layer-name {layer_name} --max-items 1 --output json"
+        params = {'LayerName': layer_name, 'PaginationConfig': {'MaxItems': 1}}
+        return cmd, params
+
+    ''' build the request of get-layer-version.
+        Refer getLatestLayerVersion.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __getLayerVersionRequest(self, layer_name: str, version: int) -> Tuple[str, dict]:
+        cmd = f"aws lambda get-layer-version --layer-name {layer_name} --version-number {version} --output json"
+        params = {'LayerName': layer_name, 'VersionNumber': version}
+        return cmd, params
+
+    ''' build the request of publish-layer-version.
+        Refer publishLayer.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    def __publishLayerRequest(self, layer_name: str, zip_file: str, description=None) -> Tuple[str, dict]:
+        cmd = f"aws lambda publish-layer-version --layer-name {layer_name} --license-info 'MIT' --compatible-runtimes python3.8 --zip-file fileb://{zip_file} --output json"
+        params = {
+            'LayerName': layer_name,
+            'LicenseInfo': 'MIT',
+            'CompatibleRuntimes': ['python3.8'],
+            'Content': {'ZipFile': Path(zip_file)}
+        }
+        if description:
+            cmd += f" --description {re.escape(description)}"
+            params['Description'] = description
+        return cmd, params
@@ -1,5 +1,22 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import heapq
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from fnmatch import fnmatch
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from .aws_backend import BotocoreBackend
 from .aws_cli import AwsCli
+from .aws_retry import AwsRetry
+from ..cli_enum import CliEnum
+from ..metrics import Metrics
 import re
 
 '''
@@ -8,13 +25,18 @@ This is S3 Command Class
 
 
 class S3Cli(AwsCli):
+    # the maximum number of keys deleted by a delete-objects.
+    DELETE_BATCH_SIZE = 1000
+    # the directory in which the manifests of syncUpload and syncDownload are saved.
+    MANIFEST_DIR = '~/.cache/python-cli'
 
     ''' constructor.
         Refer super class's constructor.
     '''
 
-    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1'):
-        super().__init__(aws_profile=aws_profile, environment=environment, region=region)
+    def __init__(self, aws_profile: str, environment=None, region='ap-northeast-1', backend=CliEnum.BACKEND_CLI):
+        super().__init__(aws_profile=aws_profile, environment=environment,
+                         region=region, backend=backend)
 
     ''' upload objects into the bucket in S3
     Args:
@@ -31,12 +53,18 @@ class S3Cli(AwsCli):
     '''
 
     def upload(self, local_dir: str, bucket_name: str, prefix_name: str, exclude=None, include=None):
-        cmd = f"aws s3 cp {local_dir} s3://{bucket_name}/{prefix_name} --recursive --output yaml "
-        if exclude:
-            cmd += f"--exclude {re.escape(exclude)} "
-        if include:
-            cmd += f"--include {re.escape(include)} "
-        S3.execCmd(cmd)
+        cmd = self.__copyCmd(
+            local_dir, f"s3://{bucket_name}/{prefix_name}", exclude, include)
+        self.__execProgress(cmd)
+
+    ''' upload objects into the bucket in S3 asynchronously.
+        Refer upload.
+    '''
+
+    async def uploadAsync(self, local_dir: str, bucket_name: str, prefix_name: str, exclude=None, include=None):
+        cmd = self.__copyCmd(
+            local_dir, f"s3://{bucket_name}/{prefix_name}", exclude, include)
+        await self.execAwsAsync(cmd)
 
     ''' download objects into the bucket in S3
     Args:
@@ -52,39 +80,668 @@ class S3Cli(AwsCli):
     '''
 
     def download(self, local_dir: str, bucket_name: str, prefix_name: str, exclude=None, include=None):
-        cmd = f"aws s3 cp s3://{bucket_name}/{prefix_name} {local_dir} --recursive --output yaml "
-        if exclude:
-            cmd += f"--exclude {re.escape(exclude)} "
-        if include:
-            cmd += f"--include {re.escape(include)} "
-        S3.execCmd(cmd)
+        cmd = self.__copyCmd(
+            f"s3://{bucket_name}/{prefix_name}", local_dir, exclude, include)
+        self.__execProgress(cmd)
 
-    ''' remove objects on the bucket in S3
+    ''' download objects into the bucket in S3 asynchronously.
+        Refer download.
+    '''
+
+    async def downloadAsync(self, local_dir: str, bucket_name: str, prefix_name: str, exclude=None, include=None):
+        cmd = self.__copyCmd(
+            f"s3://{bucket_name}/{prefix_name}", local_dir, exclude, include)
+        await self.execAwsAsync(cmd)
+
+    ''' upload only new or changed files into the bucket in S3.
+        The size, mtime & MD5 of the synced files are kept in a local manifest per directory, bucket & prefix,
+        so the unchanged files are neither hashed nor transferred again.
+        A file is transferred when the ETag of the object is neither its MD5 nor the ETag recorded in the manifest.
+    Args:
+        local_dir (str): Local directry path which has target objects to upload.
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet.
+        delete (bool, optional): delete the objects which do not exist in the local directory.
+            They are deleted by delete-objects of DELETE_BATCH_SIZE keys.
+        max_workers (int, optional): the number of files transferred (or batches deleted) at the same time.
+    Returns:
+        dict: the keys transferred (Transferred), deleted (Deleted) and skipped (Skipped).
+    e.g.
+        s3_cli.syncUpload('./dist', 'MY_BUCKET', 'assets', delete=True)
+    '''
+
+    def syncUpload(self, local_dir: str, bucket_name: str, prefix_name: str, delete=False, max_workers=8) -> dict:
+        root = Path(local_dir).expanduser()
+        manifest_path = self.__manifestFile(root, bucket_name, prefix_name)
+        manifest = S3Cli.__loadManifest(manifest_path)
+        remote = self.__listRemote(bucket_name, prefix_name)
+        result = {'Transferred': [], 'Deleted': [], 'Skipped': 0}
+
+        def upload(path: str) -> None:
+            entry = manifest.get(path)
+            stat = (root / path).stat()
+            if entry is None or (entry['Size'], entry['Mtime']) != (stat.st_size, stat.st_mtime_ns):
+                entry = {'Size': stat.st_size, 'Mtime': stat.st_mtime_ns,
+                         'Hash': S3Cli.__md5(root / path), 'ETag': None}
+            etag = remote.get(path, dict()).get('ETag')
+            if etag is not None and etag in (f'"{entry["Hash"]}"', entry['ETag']):
+                manifest[path] = dict(entry, ETag=etag)
+                return
+            key = S3Cli.__key(prefix_name, path)
+            cmd = f"aws s3api put-object --bucket {bucket_name} --key {shlex.quote(key)} --body {shlex.quote(str(root / path))} --output json"
+            output = self.execAws(cmd, 's3', 'put_object',
+                                  {'Bucket': bucket_name, 'Key': key, 'Body': root / path})
+            manifest[path] = dict(
+                entry, ETag=S3Cli.parseOutput(output.stdout)['ETag'])
+            result['Transferred'].append(key)
+
+        local_paths = list(S3Cli.__walk(root))
+        try:
+            S3Cli.mapParallel(upload, local_paths, max_workers)
+            result['Skipped'] = len(local_paths) - len(result['Transferred'])
+            if delete:
+                keys = sorted(S3Cli.__key(prefix_name, path)
+                              for path in remote.keys() - set(local_paths))
+                batches = [keys[idx:idx + S3Cli.DELETE_BATCH_SIZE]
+                           for idx in range(0, len(keys), S3Cli.DELETE_BATCH_SIZE)]
+                errors = sum(S3Cli.mapParallel(lambda batch: self.__deleteObjects(bucket_name, batch),
+                                               batches, max_workers), [])
+                failed = {error['Key'] for error in errors}
+                result['Deleted'] += [key for key in keys if key not in failed]
+                if errors:
+                    S3Cli.stdout(f"{len(errors)} objects are not deleted. {errors[0]}",
+                                 CliEnum.SEVERIY_ERROR)
+                    sys.exit()
+        finally:
+            S3Cli.__saveManifest(manifest_path, {
+                path: entry for path, entry in manifest.items() if (root / path).is_file()})
+        return result
+
+    ''' download only new or changed objects from the bucket in S3.
+        Refer syncUpload.
+        An object is transferred when its ETag is not the one recorded in the manifest,
+        or the local file is changed after the last sync.
+    Args:
+        local_dir (str): Local directry path in which the target objects will be download.
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet.
+        delete (bool, optional): delete the local files which do not exist in the bucket.
+        max_workers (int, optional): the number of objects transferred at the same time.
+    Returns:
+        dict: the local paths transferred (Transferred), deleted (Deleted) and skipped (Skipped).
+    '''
+
+    def syncDownload(self, local_dir: str, bucket_name: str, prefix_name: str, delete=False, max_workers=8) -> dict:
+        root = Path(local_dir).expanduser()
+        manifest_path = self.__manifestFile(root, bucket_name, prefix_name)
+        manifest = S3Cli.__loadManifest(manifest_path)
+        remote = self.__listRemote(bucket_name, prefix_name)
+        result = {'Transferred': [], 'Deleted': [], 'Skipped': 0}
+
+        def download(path: str) -> None:
+            entry = manifest.get(path)
+            file = root / path
+            if entry is not None and entry['ETag'] == remote[path]['ETag'] and file.is_file():
+                stat = file.stat()
+                if (entry['Size'], entry['Mtime']) == (stat.st_size, stat.st_mtime_ns):
+                    return
+            file.parent.mkdir(parents=True, exist_ok=True)
+            key = S3Cli.__key(prefix_name, path)
+            cmd = f"aws s3api get-object --bucket {bucket_name} --key {shlex.quote(key)} {shlex.quote(str(file))} --output json"
+            output = self.execAws(cmd, 's3', 'get_object',
+                                  {'Bucket': bucket_name, 'Key': key}, outfile=file)
+            stat = file.stat()
+            manifest[path] = {'Size': stat.st_size, 'Mtime': stat.st_mtime_ns,
+                              'Hash': None, 'ETag': S3Cli.parseOutput(output.stdout)['ETag']}
+            result['Transferred'].append(str(file))
+
+        try:
+            S3Cli.mapParallel(download, remote.keys(), max_workers)
+            result['Skipped'] = len(remote) - len(result['Transferred'])
+            if delete:
+                for path in set(S3Cli.__walk(root)) - remote.keys():
+                    (root / path).unlink()
+                    result['Deleted'].append(str(root / path))
+        finally:
+            S3Cli.__saveManifest(manifest_path, {
+                path: entry for path, entry in manifest.items() if (root / path).is_file()})
+        return result
+
+    ''' upload the files in the local directory with a process pool.
+        The files are partitioned into the shards balanced by the byte size,
+        and each shard is transferred by a worker process. The failed files of a shard are retried.
+        Set AWS_ENDPOINT_URL in order to transfer to an S3 compatible server such as moto_server.
+    Args:
+        local_dir (str): Local directry path which has target objects to upload.
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet.
+        shards (int, optional): the number of shards. The number of CPUs is used when it is None.
+        retries (int, optional): the number of times the failed files of a shard are retried.
+        error_option (int, optional): the option when some files are not transferred.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        dict: the report. Refer __transferShards.
+    e.g.
+        report = s3_cli.uploadSharded('./data', 'MY_BUCKET', 'MY_FOLDER', shards=8)
+        print(report['Throughput'])
+    '''
+
+    def uploadSharded(self, local_dir: str, bucket_name: str, prefix_name: str, shards=None, retries=2, error_option=CliEnum.CMD_OPTION_STOP) -> dict:
+        root = Path(local_dir).expanduser()
+        items = [(str(root / path), S3Cli.__key(prefix_name, path), (root / path).stat().st_size)
+                 for path in S3Cli.__walk(root)]
+        return self.__transferShards('upload', bucket_name, items, shards, retries, error_option)
+
+    ''' download the objects under the prefix with a process pool.
+        Refer uploadSharded.
     Args:
+        local_dir (str): Local directry path in which the target objects will be download.
         bucket_name (str): Target S3 bucket name.
         prefix_name (str): Target prefix name on the target backet.
+        shards (int, optional): the number of shards. The number of CPUs is used when it is None.
+        retries (int, optional): the number of times the failed objects of a shard are retried.
+        error_option (int, optional): the option when some objects are not transferred.
+    Returns:
+        dict: the report. Refer __transferShards.
+    '''
+
+    def downloadSharded(self, local_dir: str, bucket_name: str, prefix_name: str, shards=None, retries=2, error_option=CliEnum.CMD_OPTION_STOP) -> dict:
+        root = Path(local_dir).expanduser()
+        items = [(S3Cli.__key(prefix_name, path), str(root / path), content['Size'])
+                 for path, content in self.__listRemote(bucket_name, prefix_name).items()]
+        return self.__transferShards('download', bucket_name, items, shards, retries, error_option)
+
+    ''' remove objects on the bucket in S3
+        The keys are deleted by delete-objects of DELETE_BATCH_SIZE keys while the listing streams,
+        and the batches are executed in parallel.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet. It is regarded as a directory.
+            e.g. build/12 removes build/12/... but not build/123/...
         exclude (str, optional): exclude objects with UNIX style wildcards.
         include (str, optional): include objects with UNIX style wildcards.
+            The wildcards are matched with the key after the prefix, and include precedes exclude like aws s3 rm.
+        max_workers (int, optional): the number of batches executed at the same time.
+        error_option (int, optional): the option when some objects are not deleted.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        dict: the number of deleted objects (Deleted), the keys not deleted (Failed)
+            and the result of each batch (Batches).
+    e.g.
+        s3_cli.remove('MY_BUCKET', 'build/1234/', exclude="*", include="*.zip")
+        --> it will remove only files ending with .zip:
     '''
 
-    def remove(self, s3_path: str, exclude=None, include=None):
-        cmd = f"aws s3 rm s3://{bucket_name}/{prefix_name} --recursive --output yaml "
-        if exclude:
-            cmd += f"--exclude {re.escape(exclude)} "
-        if include:
-            cmd += f"--include {re.escape(include)} "
-        S3.execCmd(cmd)
+    def remove(self, bucket_name: str, prefix_name: str, exclude=None, include=None, max_workers=8, error_option=CliEnum.CMD_OPTION_STOP) -> dict:
+        # the prefix is a directory like aws s3 rm --recursive, so that build/12 does not remove build/123/.
+        if prefix_name and not prefix_name.endswith('/'):
+            prefix_name += '/'
+        report = {'Deleted': 0, 'Failed': [], 'Batches': []}
+
+        def delete(index: int, keys: List[str]) -> None:
+            errors = self.__deleteObjects(bucket_name, keys)
+            report['Batches'].append(
+                {'Batch': index, 'Deleted': len(keys) - len(errors), 'Errors': errors})
+
+        def keys() -> Iterator[str]:
+            for obj in self.iterObjects(bucket_name, prefix_name):
+                path = obj['Key'][len(prefix_name or ''):]
+                if S3Cli.__isFiltered(path, exclude, include):
+                    yield obj['Key']
+
+        # the workers record the commands with this method.
+        delete = Metrics.bindCaller(delete)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = set()
+            batch = []
+            index = 0
+            for key in keys():
+                batch.append(key)
+                if len(batch) == S3Cli.DELETE_BATCH_SIZE:
+                    futures.add(executor.submit(delete, index, batch))
+                    batch = []
+                    index += 1
+                    # wait for the running batches so that the listing does not go too far ahead.
+                    if len(futures) >= max_workers * 2:
+                        done, futures = wait(
+                            futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+            if batch:
+                futures.add(executor.submit(delete, index, batch))
+            for future in futures:
+                future.result()
+        for batch in sorted(report['Batches'], key=lambda batch: batch['Batch']):
+            report['Deleted'] += batch['Deleted']
+            report['Failed'] += [error['Key'] for error in batch['Errors']]
+            if batch['Errors']:
+                S3Cli.stdout(f"batch {batch['Batch']}: {len(batch['Errors'])} objects are not deleted. "
+                             f"{batch['Errors'][0]}", CliEnum.SEVERIY_ERROR)
+        if report['Failed'] and error_option == CliEnum.CMD_OPTION_STOP:
+            sys.exit()
+        return report
 
     ''' list objects on the bucket in S3
     Args:
         bucket_name (str, optional): Target S3 bucket name.
         prefix_name (str, optional): Target prefix name on the target backet.
+    Returns:
+        subprocess.CompletedProcess: the result whose stdout is the listing.
     '''
 
-    def ls(self, bucket_name=None, prefix_name=None):
+    def ls(self, bucket_name=None, prefix_name=None) -> subprocess.CompletedProcess:
         cmd = f"aws s3 ls --recursive --output yaml "
         if bucket_name:
             cmd += f"{re.escape(bucket_name)}/"
             if prefix_name:
                 cmd += f"{re.escape(prefix_name)}"
-        S3.execCmd(cmd)
+        if self.botocore is not None:
+            operation = 'list_objects_v2' if bucket_name else 'list_buckets'
+            return S3Cli.execFunc(f"[botocore] s3 {operation}",
+                                  lambda: self.__lsBotocore(bucket_name, prefix_name))
+        # all lines are kept, since the listing is the result.
+        return self.__execProgress(cmd, tail_lines=None)
+
+    ''' iterate the objects on the bucket in S3 as the listing streams.
+        The next page is fetched only when the objects are consumed, so a huge bucket is listed in constant memory.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str, optional): list only the keys beginning with it.
+        delimiter (str, optional): the keys under the delimiter after the prefix are not listed.
+            Refer iterPrefixes in order to list them as prefixes.
+        page_size (int, optional): the number of objects fetched at once.
+    Yields:
+        dict: Key, Size & LastModified of the object.
+    e.g.
+        for obj in s3_cli.iterObjects('MY_BUCKET', 'logs/2021/'):
+            print(obj['Key'], obj['Size'])
+    '''
+
+    def iterObjects(self, bucket_name: str, prefix_name=None, delimiter=None, page_size=None) -> Iterator[dict]:
+        cmd, params = S3Cli.__listObjectsRequest(
+            bucket_name, prefix_name, delimiter)
+        for content in self.iterItems(cmd, 's3', 'list_objects_v2', 'Contents', params, page_size):
+            yield {'Key': content['Key'], 'Size': content['Size'], 'LastModified': content['LastModified']}
+
+    ''' iterate the common prefixes on the bucket in S3. e.g. the folders directly under the prefix.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str, optional): list only the keys beginning with it.
+        delimiter (str, optional): the delimiter grouping the keys.
+        page_size (int, optional): the number of prefixes fetched at once.
+    Yields:
+        str: the common prefix.
+    '''
+
+    def iterPrefixes(self, bucket_name: str, prefix_name=None, delimiter='/', page_size=None) -> Iterator[str]:
+        cmd, params = S3Cli.__listObjectsRequest(
+            bucket_name, prefix_name, delimiter)
+        for common_prefix in self.iterItems(cmd, 's3', 'list_objects_v2', 'CommonPrefixes', params, page_size):
+            yield common_prefix['Prefix']
+
+    ''' count the objects and total the bytes per prefix, incrementally while the listing streams.
+        Only the totals are held in memory, not the objects.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str, optional): aggregate only the keys beginning with it.
+        depth (int, optional): the number of the folders after prefix_name which group the keys.
+            0 aggregates all the keys into prefix_name.
+        delimiter (str, optional): the delimiter of the folders.
+    Returns:
+        dict: Count & Bytes by the prefix.
+    e.g.
+        s3_cli.summarize('MY_BUCKET', 'logs/', depth=1)
+        --> {'logs/2020/': {'Count': 120, 'Bytes': 3456}, 'logs/2021/': {'Count': 80, 'Bytes': 2345}}
+    '''
+
+    def summarize(self, bucket_name: str, prefix_name=None, depth=1, delimiter='/') -> Dict[str, dict]:
+        prefix = prefix_name or ''
+        summary = dict()
+        for obj in self.iterObjects(bucket_name, prefix_name):
+            folders = obj['Key'][len(prefix):].split(delimiter)[:-1][:depth]
+            group = prefix + ''.join(folder + delimiter for folder in folders)
+            total = summary.setdefault(group, {'Count': 0, 'Bytes': 0})
+            total['Count'] += 1
+            total['Bytes'] += obj['Size']
+        return summary
+
+    ''' list objects with the botocore backend, printing them page by page like aws s3 ls.
+    Args:
+        bucket_name (str, optional): Target S3 bucket name.
+        prefix_name (str, optional): Target prefix name on the target backet.
+    Returns:
+        subprocess.CompletedProcess: the result whose stdout is the listing in the format of aws s3 ls.
+    '''
+
+    def __lsBotocore(self, bucket_name=None, prefix_name=None) -> subprocess.CompletedProcess:
+        client = self.botocore.client('s3')
+        lines = []
+        if not bucket_name:
+            for bucket in client.list_buckets()['Buckets']:
+                lines.append(
+                    f"{bucket['CreationDate'].astimezone():%Y-%m-%d %H:%M:%S} {bucket['Name']}")
+                S3Cli.write(lines[-1])
+            return subprocess.CompletedProcess('s3 list_buckets', 0, '\n'.join(lines), '')
+        paginator = client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix_name or ''):
+            for content in page.get('Contents', []):
+                lines.append(
+                    f"{content['LastModified'].astimezone():%Y-%m-%d %H:%M:%S} {content['Size']:>10} {content['Key']}")
+                S3Cli.write(lines[-1])
+        return subprocess.CompletedProcess('s3 list_objects_v2', 0, '\n'.join(lines), '')
+
+    ''' transfer the files shard by shard with a process pool, and report the result.
+    Args:
+        direction (str): upload or download.
+        bucket_name (str): Target S3 bucket name.
+        items (list): the source, the destination & the byte size of the files.
+        shards (int): the number of shards.
+        retries (int): the number of times the failed files of a shard are retried with the backoff of AwsRetry.
+        error_option (int): the option when some files are not transferred.
+    Returns:
+        dict: Files, Bytes & Seconds transferred, Throughput (bytes per second),
+            Failed (the sources not transferred) and Shards (the report of each shard).
+    '''
+
+    def __transferShards(self, direction: str, bucket_name: str, items: List[Tuple[str, str, int]], shards: int, retries: int, error_option: int) -> dict:
+        shards = S3Cli.__partition(items, shards or os.cpu_count() or 1)
+        report = {'Files': 0, 'Bytes': 0, 'Seconds': 0.0,
+                  'Throughput': 0.0, 'Failed': [], 'Shards': []}
+        started = time.perf_counter()
+        futures = dict()
+        with ProcessPoolExecutor(max_workers=len(shards) or 1) as executor:
+            def submit(index: int, shard: list, attempt: int) -> None:
+                future = executor.submit(S3Cli._transferShard, self.aws_profile, self.region, self.backend,
+                                         self.session.env, direction, bucket_name, shard)
+                futures[future] = (index, shard, attempt)
+            for index, shard in enumerate(shards):
+                submit(index, shard, 0)
+            # the retries waiting for their backoff: (the time to submit, index, shard, attempt).
+            delayed = []
+            while futures or delayed:
+                while delayed and delayed[0][0] <= time.monotonic():
+                    _, index, shard, attempt = heapq.heappop(delayed)
+                    submit(index, shard, attempt)
+                timeout = max(0.0, delayed[0][0] - time.monotonic()) if delayed else None
+                if not futures:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(futures, timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, shard, attempt = futures.pop(future)
+                    shard_report = future.result()
+                    report['Files'] += shard_report['Files']
+                    report['Bytes'] += shard_report['Bytes']
+                    report['Shards'].append(
+                        dict(shard_report, Shard=index, Attempt=attempt))
+                    failed = set(shard_report['Failed'])
+                    if failed and attempt < retries:
+                        # the failed files are retried after the jittered backoff, so that they do not hit the throttle at once.
+                        heapq.heappush(delayed, (time.monotonic() + AwsRetry.backoff(CliEnum.FAILURE_TRANSIENT, attempt + 1),
+                                                 index, [item for item in shard if item[0] in failed], attempt + 1))
+                    else:
+                        report['Failed'] += shard_report['Failed']
+        report['Seconds'] = time.perf_counter() - started
+        if report['Seconds'] > 0:
+            report['Throughput'] = report['Bytes'] / report['Seconds']
+        severity = CliEnum.SEVERIY_ERROR if report['Failed'] else CliEnum.SEVERIY_INFO
+        S3Cli.stdout(f"{direction} {report['Files']} files {report['Bytes']} bytes in {report['Seconds']:.2f}s "
+                     f"({report['Throughput'] / 1024 / 1024:.2f} MiB/s) by {len(shards)} shards, "
+                     f"{len(report['Failed'])} failed", severity)
+        if report['Failed'] and error_option == CliEnum.CMD_OPTION_STOP:
+            sys.exit()
+        return report
+
+    ''' transfer the files of a shard in a worker process.
+        It is not name-mangled so that the process pool can pickle it.
+    Args:
+        aws_profile (str): AWS Profile Name.
+        region (str): the target region.
+        backend (int): the way of executing AWS operations.
+        env (dict): the environment variables of the aws cli.
+        direction (str): upload or download.
+        bucket_name (str): Target S3 bucket name.
+        shard (list): the source, the destination & the byte size of the files.
+    Returns:
+        dict: Files & Bytes transferred, Seconds and Failed (the sources not transferred).
+    '''
+    @staticmethod
+    def _transferShard(aws_profile: str, region: str, backend: int, env: dict, direction: str, bucket_name: str, shard: List[Tuple[str, str, int]]) -> dict:
+        started = time.perf_counter()
+        # the connections of the parent process must not be shared after fork.
+        botocore = BotocoreBackend(aws_profile, region) \
+            if backend == CliEnum.BACKEND_BOTOCORE else None
+        report = {'Files': 0, 'Bytes': 0, 'Failed': []}
+        for source, destination, size in shard:
+            if direction == 'upload':
+                cmd = f"aws s3api put-object --bucket {bucket_name} --key {shlex.quote(destination)} --body {shlex.quote(source)} --output json"
+                operation, params = 'put_object', {
+                    'Bucket': bucket_name, 'Key': destination, 'Body': Path(source)}
+                outfile = None
+            else:
+                Path(destination).parent.mkdir(parents=True, exist_ok=True)
+                cmd = f"aws s3api get-object --bucket {bucket_name} --key {shlex.quote(source)} {shlex.quote(destination)} --output json"
+                operation, params = 'get_object', {
+                    'Bucket': bucket_name, 'Key': source}
+                outfile = destination
+            if botocore is None:
+                result = S3Cli.execCmd(
+                    cmd, CliEnum.CMD_OPTION_CONTINUE, env)
+            else:
+                result = S3Cli.execFunc(f"[botocore] s3 {operation}",
+                                        lambda: botocore.call(
+                                            's3', operation, params, outfile),
+                                        CliEnum.CMD_OPTION_CONTINUE)
+            if result is not None and result.returncode == 0:
+                report['Files'] += 1
+                report['Bytes'] += size
+            else:
+                report['Failed'].append(source)
+        report['Seconds'] = time.perf_counter() - started
+        return report
+
+    ''' partition the files into the shards balanced by the byte size (the largest file first).
+    Args:
+        items (list): the source, the destination & the byte size of the files.
+        shards (int): the number of shards.
+    Returns:
+        list: the shards which have some files.
+    '''
+    @staticmethod
+    def __partition(items: List[Tuple[str, str, int]], shards: int) -> List[List[Tuple[str, str, int]]]:
+        buckets = [[] for _ in range(max(1, shards))]
+        heap = [(0, index) for index in range(len(buckets))]
+        for item in sorted(items, key=lambda item: item[2], reverse=True):
+            size, index = heapq.heappop(heap)
+            buckets[index].append(item)
+            heapq.heappush(heap, (size + item[2], index))
+        return [bucket for bucket in buckets if bucket]
+
+    ''' delete the objects by delete-objects.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        keys (list): the keys. DELETE_BATCH_SIZE at most.
+    Returns:
+        list: Key, Code & Message of the objects not deleted.
+    '''
+
+    def __deleteObjects(self, bucket_name: str, keys: List[str]) -> List[dict]:
+        request = {'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        # the keys are passed by a file, because they are too long for an argument.
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(request, file)
+            file.flush()
+            cmd = f"aws s3api delete-objects --bucket {bucket_name} --delete file://{file.name} --output json"
+            output = self.execAws(cmd, 's3', 'delete_objects', {'Bucket': bucket_name, 'Delete': request},
+                                  CliEnum.CMD_OPTION_CONTINUE)
+        if output is None or output.returncode != 0:
+            message = output.stderr.strip() if output is not None else ''
+            return [{'Key': key, 'Code': 'CommandFailed', 'Message': message} for key in keys]
+        return (S3Cli.parseOutput(output.stdout) or dict()).get('Errors', [])
+
+    ''' check whether the path is targeted by the filters like aws s3 commands.
+    Args:
+        path (str): the path after the prefix.
+        exclude (str, optional): exclude objects with UNIX style wildcards.
+        include (str, optional): include objects with UNIX style wildcards.
+    Returns:
+        bool: True when the path is targeted.
+    '''
+    @staticmethod
+    def __isFiltered(path: str, exclude=None, include=None) -> bool:
+        if include and fnmatch(path, include):
+            return True
+        return not (exclude and fnmatch(path, exclude))
+
+    ''' build the request of list-objects-v2.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str, optional): list only the keys beginning with it.
+        delimiter (str, optional): the delimiter grouping the keys.
+    Returns:
+        tuple: the command & the parameters of the operation.
+    '''
+    @staticmethod
+    def __listObjectsRequest(bucket_name: str, prefix_name=None, delimiter=None) -> Tuple[str, dict]:
+        cmd = f"aws s3api list-objects-v2 --bucket {bucket_name} --output json"
+        params = {'Bucket': bucket_name}
+        if prefix_name:
+            cmd += f" --prefix {shlex.quote(prefix_name)}"
+            params['Prefix'] = prefix_name
+        if delimiter:
+            cmd += f" --delimiter {shlex.quote(delimiter)}"
+            params['Delimiter'] = delimiter
+        return cmd, params
+
+    ''' list the objects under the prefix for syncUpload and syncDownload.
+    Args:
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet.
+    Returns:
+        dict: the size & the ETag of the objects by the path relative to the prefix.
+    '''
+
+    def __listRemote(self, bucket_name: str, prefix_name: str) -> Dict[str, dict]:
+        prefix = S3Cli.__key(prefix_name, '')
+        cmd, params = S3Cli.__listObjectsRequest(bucket_name, prefix)
+        remote = dict()
+        for content in self.iterItems(cmd, 's3', 'list_objects_v2', 'Contents', params):
+            if content['Key'].endswith('/'):
+                continue
+            remote[content['Key'][len(prefix):]] = {
+                'Size': content['Size'], 'ETag': content['ETag']}
+        return remote
+
+    ''' get the path of the manifest of the local directory, the bucket & the prefix.
+    Args:
+        root (Path): the local directory.
+        bucket_name (str): Target S3 bucket name.
+        prefix_name (str): Target prefix name on the target backet.
+    Returns:
+        Path: the file path.
+    '''
+
+    def __manifestFile(self, root: Path, bucket_name: str, prefix_name: str) -> Path:
+        digest = hashlib.sha1(
+            f"{root.resolve()}\0{S3Cli.__key(prefix_name, '')}".encode()).hexdigest()[:16]
+        return Path(S3Cli.MANIFEST_DIR).expanduser() / f"s3-manifest-{bucket_name}-{digest}.json"
+
+    ''' load the manifest.
+    Args:
+        path (Path): the file path.
+    Returns:
+        dict: the size, mtime, MD5 & ETag of the synced files. It is empty when the manifest does not exist.
+    '''
+    @staticmethod
+    def __loadManifest(path: Path) -> Dict[str, dict]:
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return dict()
+
+    ''' save the manifest.
+    Args:
+        path (Path): the file path.
+        manifest (dict): the size, mtime, MD5 & ETag of the synced files.
+    '''
+    @staticmethod
+    def __saveManifest(path: Path, manifest: Dict[str, dict]) -> None:
+        S3Cli.writeAtomic(path, json.dumps(manifest))
+
+    ''' iterate the files in the local directory.
+    Args:
+        root (Path): the local directory.
+    Yields:
+        str: the path relative to the directory with slashes.
+    '''
+    @staticmethod
+    def __walk(root: Path) -> Iterator[str]:
+        for path in root.rglob('*'):
+            if path.is_file():
+                yield path.relative_to(root).as_posix()
+
+    ''' calculate MD5 of the file, which is the ETag of the object uploaded at once.
+    Args:
+        path (Path): the file path.
+    Returns:
+        str: the hex digest.
+    '''
+    @staticmethod
+    def __md5(path: Path) -> str:
+        md5 = hashlib.md5()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+    ''' join the prefix and the relative path into the key.
+    Args:
+        prefix_name (str): Target prefix name on the target backet.
+        path (str): the path relative to the prefix.
+    Returns:
+        str: the key.
+    '''
+    @staticmethod
+    def __key(prefix_name: str, path: str) -> str:
+        prefix = (prefix_name or '').strip('/')
+        return f"{prefix}/{path}" if prefix else path
+
+    ''' execute a command outputting its lines as they happen by the output policy.
+        The output of large transfers is not held in memory.
+    Args:
+        cmd (str): the command executing.
+        tail_lines (int, optional): the number of last lines kept in the result. All lines are kept when it is None.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command. Refer Cli.execStream.
+    '''
+
+    def __execProgress(self, cmd: str, tail_lines=100) -> subprocess.CompletedProcess:
+        stream = S3Cli.execStream(
+            cmd, callback=S3Cli.write, tail_lines=tail_lines, env=self.session.env)
+        while True:
+            try:
+                next(stream)
+            except StopIteration as stop:
+                # the return value of the generator.
+                return stop.value
+
+    ''' build the command which copies objects recursively.
+    Args:
+        source (str): the local directory or the S3 path copied from.
+        destination (str): the local directory or the S3 path copied to.
+        exclude (str, optional): exclude objects with UNIX style wildcards.
+        include (str, optional): include objects with UNIX style wildcards.
+    Returns:
+        str: the command.
+    '''
+
+    def __copyCmd(self, source: str, destination: str, exclude=None, include=None) -> str:
+        cmd = f"aws s3 cp {source} {destination} --recursive --output yaml "
+        if exclude:
+            cmd += f"--exclude {re.escape(exclude)} "
+        if include:
+            cmd += f"--include {re.escape(include)} "
+        return cmd
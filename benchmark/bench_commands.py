@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmark of the overhead which this library adds on top of the commands.
+A stub aws executable is put on PATH, which returns canned JSON/YAML
+of the configurable size after the configurable latency,
+and a stub Docker Engine listens on a unix socket. It measures
+    - the per-call overhead of Cli.execCmd over subprocess.run,
+    - the parse cost of getRoles, getLayers & getLambdaInfos,
+    - the end-to-end throughput of ApigatewayCli.create & LambdaCli.addPermission,
+    - Docker.containers on the Engine API against docker ps.
+No AWS account or Docker daemon is needed.
+
+usage:
+    python benchmark/bench_commands.py [--items 2000] [--latency 0] [--repeat 5] [--functions 20] [--metrics]
+'''
+import argparse
+import contextlib
+import http.server
+import importlib
+import io
+import json
+import os
+import shutil
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT.parent))
+Cli = importlib.import_module(f"{ROOT.name}.cli").Cli
+Metrics = importlib.import_module(f"{ROOT.name}.metrics").Metrics
+AwsCli = importlib.import_module(f"{ROOT.name}.aws.aws_cli").AwsCli
+AwsCache = importlib.import_module(f"{ROOT.name}.aws.aws_cache").AwsCache
+ApigatewayCli = importlib.import_module(
+    f"{ROOT.name}.aws.apigateway_cli").ApigatewayCli
+LambdaCli = importlib.import_module(f"{ROOT.name}.aws.lambda_cli").LambdaCli
+Docker = importlib.import_module(f"{ROOT.name}.docker.docker").Docker
+
+# the stub of the aws cli. It prints responses/{service}-{operation}.{json|yaml}.
+AWS_STUB = '''#!/bin/sh
+[ "${FAKE_AWS_LATENCY:-0}" = 0 ] || sleep "$FAKE_AWS_LATENCY"
+dir=$(dirname "$0")/responses
+case "$1 $2" in
+ "apigateway get-export") for last; do :; done; cp "$dir/apigateway-get-export.yaml" "$last"; exit 0;;
+esac
+fmt=json
+case " $* " in *" --output yaml "*) fmt=yaml;; esac
+file="$dir/$1-$2.$fmt"
+if [ -f "$file" ]; then cat "$file"; else echo '{}'; fi
+'''
+
+# the stub of the docker cli, which prints the canned output of docker ps.
+DOCKER_STUB = '''#!/bin/sh
+[ "${FAKE_AWS_LATENCY:-0}" = 0 ] || sleep "$FAKE_AWS_LATENCY"
+cat "$(dirname "$0")/responses/docker-$1.txt"
+'''
+
+
+# build the canned responses which have the items.
+def buildResponses(items: int) -> dict:
+    account = '123456789012'
+    return {
+        'sts-get-caller-identity': {'Account': account, 'Arn': f"arn:aws:iam::{account}:user/bench", 'UserId': 'AIDA'},
+        'iam-list-roles': {'Roles': [{
+            'Path': '/service-role/', 'RoleName': f"role-{idx:06d}", 'RoleId': f"AROA{idx:017d}",
+            'Arn': f"arn:aws:iam::{account}:role/service-role/role-{idx:06d}",
+            'CreateDate': '2021-03-27T10:00:00+00:00', 'MaxSessionDuration': 3600
+        } for idx in range(items)]},
+        'lambda-list-layers': {'Layers': [{
+            'LayerName': f"layer-{idx:06d}", 'LayerArn': f"arn:aws:lambda:ap-northeast-1:{account}:layer:layer-{idx:06d}",
+            'LatestMatchingVersion': {
+                'LayerVersionArn': f"arn:aws:lambda:ap-northeast-1:{account}:layer:layer-{idx:06d}:1",
+                'Version': 1, 'CompatibleRuntimes': ['python3.8'], 'CreatedDate': '2021-03-27T10:00:00.000+0000'}
+        } for idx in range(items)]},
+        'apigateway-get-resources': {'items': [{'id': 'root0000', 'path': '/'}] + [{
+            'id': f"res{idx:06d}", 'parentId': 'root0000', 'pathPart': f"resource-{idx:06d}",
+            'path': f"/resource-{idx:06d}", 'resourceMethods': {'GET': {}, 'POST': {}, 'OPTIONS': {}}
+        } for idx in range(items)]},
+        'apigateway-create-rest-api': {'id': 'api0000001', 'name': 'bench'},
+        'apigateway-create-resource': {'id': 'res0000001'},
+        'apigateway-create-deployment': {'id': 'dep0000001'},
+        'lambda-get-policy': {'Policy': json.dumps({'Version': '2012-10-17', 'Statement': []})},
+    }
+
+
+# write the stubs & the responses into the directory.
+def writeStubs(bin_dir: Path, items: int) -> None:
+    responses = bin_dir / 'responses'
+    responses.mkdir(parents=True)
+    for name, data in buildResponses(items).items():
+        (responses / f"{name}.json").write_text(json.dumps(data, indent=4))
+        (responses / f"{name}.yaml").write_text(
+            yaml.safe_dump(data, default_flow_style=False))
+    (responses / 'apigateway-get-export.yaml').write_text(
+        'openapi: 3.0.1\ninfo:\n  title: bench\n')
+    ps = ['CONTAINER ID   IMAGE                   COMMAND   CREATED   STATUS   PORTS   NAMES']
+    ps += [f"{idx:012x}   {'amazon/dynamodb-local' if idx == 0 else 'nginx'}   \"run\"   now   Up   8000   c{idx}"
+           for idx in range(min(items, 200))]
+    (responses / 'docker-ps.txt').write_text('\n'.join(ps) + '\n')
+    for name, stub in [('aws', AWS_STUB), ('docker', DOCKER_STUB)]:
+        (bin_dir / name).write_text(stub)
+        (bin_dir / name).chmod(0o755)
+
+
+# the stub of the Docker Engine API, which answers the canned containers.
+class EngineHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    containers = b'[]'
+
+    def address_string(self) -> str:
+        return 'unix'
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.containers)))
+        self.end_headers()
+        self.wfile.write(self.containers)
+
+
+class EngineServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# measure the best time of the function, without the output of the library.
+def measure(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# run the command without this library as the baseline.
+def runRaw(cmd: str) -> None:
+    subprocess.run(cmd, shell=True, stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE, text=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=2000,
+                        help='the number of roles, layers & resources in the responses.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='the seconds which the stub aws sleeps per call.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--functions', type=int, default=20,
+                        help='the number of functions given to addPermission.')
+    parser.add_argument('--metrics', action='store_true',
+                        help='print the per-command metrics recorded by Metrics.')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix='bench-commands-'))
+    bin_dir = work_dir / 'bin'
+    writeStubs(bin_dir, args.items)
+    os.environ['PATH'] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    os.environ['FAKE_AWS_LATENCY'] = f"{args.latency:g}"
+    # ApigatewayCli exports the API into config/apigateway.
+    os.chdir(work_dir)
+    (work_dir / 'config' / 'apigateway').mkdir(parents=True)
+    # the stubs return all items at once.
+    AwsCli.PAGE_SIZE = max(args.items, 1) + 1
+    # measure the commands, not the cached responses.
+    AwsCache.TTL = 0
+    if args.metrics:
+        Metrics.enable()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        apigateway_cli = ApigatewayCli('bench', 'dev')
+        lambda_cli = LambdaCli('bench', 'dev')
+    functions = [{'lambda_name': f"function_{idx}", 'resource_name': f"resource-{idx}", 'methods': ['GET', 'POST']}
+                 for idx in range(args.functions)]
+
+    print(f"items: {args.items}, latency: {args.latency}s, repeat: {args.repeat}")
+    print(f"{'case':<42}{'time(s)':>10}{'raw(s)':>10}{'overhead(ms)':>14}")
+    cases = [
+        ('execCmd (sts get-caller-identity)', lambda: Cli.execCmd('aws sts get-caller-identity --output json'),
+         'aws sts get-caller-identity --output json'),
+        ('getRoles (iam list-roles)', lambda_cli.getRoles,
+         'aws iam list-roles --output json'),
+        ('getLayers (lambda list-layers)', lambda_cli.getLayers,
+         'aws lambda list-layers --output json'),
+        ('getLambdaInfos (apigateway get-resources)', lambda: apigateway_cli.getLambdaInfos('api0000001'),
+         'aws apigateway get-resources --output json'),
+        ('execCmd (iam list-roles --output yaml)', lambda: Cli.parseOutput(Cli.execCmd('aws iam list-roles --output yaml').stdout),
+         'aws iam list-roles --output yaml'),
+    ]
+    for name, func, raw_cmd in cases:
+        elapsed = measure(func, args.repeat)
+        raw = measure(lambda: runRaw(raw_cmd), args.repeat)
+        print(f"{name:<42}{elapsed:>10.4f}{raw:>10.4f}{(elapsed - raw) * 1000:>14.2f}")
+
+    print()
+    print(f"{'flow':<42}{'time(s)':>10}{'commands':>10}{'cmd/s':>14}")
+    flows = [
+        ('ApigatewayCli.create', lambda: apigateway_cli.create('bench'), 7),
+        (f"LambdaCli.addPermission ({args.functions} functions)",
+         lambda: lambda_cli.addPermission('api0000001', functions), args.functions * 3),
+    ]
+    for name, func, commands in flows:
+        elapsed = measure(func, args.repeat)
+        print(f"{name:<42}{elapsed:>10.4f}{commands:>10}{commands / elapsed:>14.1f}")
+
+    print()
+    socket_path = str(work_dir / 'docker.sock')
+    EngineHandler.containers = json.dumps(
+        [{'Id': 'c0', 'Image': Docker.DYNAMODB_LOCAL_IMAGE, 'State': 'running'}]).encode()
+    server = EngineServer(socket_path, EngineHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    docker = Docker(socket_path)
+    print(f"{'docker':<42}{'time(s)':>10}")
+    for name, func in [('Docker.containers (Engine API)', lambda: docker.containers(image=Docker.DYNAMODB_LOCAL_IMAGE)),
+                       ('docker ps (stub executable)', lambda: Cli.execCmd('docker ps'))]:
+        print(f"{name:<42}{measure(func, args.repeat):>10.4f}")
+    server.shutdown()
+
+    if args.metrics:
+        print()
+        print(f"{'family':<42}{'count':>8}{'p50(s)':>10}{'p95(s)':>10}{'max(s)':>10}")
+        for family, metric in Metrics.summary().items():
+            print(f"{family:<42}{metric['Count']:>8}{metric['P50']:>10.4f}{metric['P95']:>10.4f}{metric['Max']:>10.4f}")
+    os.chdir(ROOT)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
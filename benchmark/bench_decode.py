@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+'''
+Micro-benchmark of parsing the output of the aws cli.
+It measures the parse time per MB of a list-roles like output
+with --output json and --output yaml.
+
+usage:
+    python benchmark/bench_decode.py [--roles 5000] [--repeat 5]
+'''
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT.parent))
+Cli = importlib.import_module(f"{ROOT.name}.cli").Cli
+
+
+# build the output of aws iam list-roles which has the roles.
+def buildRoles(count: int) -> dict:
+    roles = list()
+    for idx in range(count):
+        roles.append({
+            'Path': '/service-role/',
+            'RoleName': f"role-{idx:06d}",
+            'RoleId': f"AROA{idx:017d}",
+            'Arn': f"arn:aws:iam::123456789012:role/service-role/role-{idx:06d}",
+            'CreateDate': '2021-03-27T10:00:00+00:00',
+            'AssumeRolePolicyDocument': {
+                'Version': '2012-10-17',
+                'Statement': [{
+                    'Effect': 'Allow',
+                    'Principal': {'Service': 'lambda.amazonaws.com'},
+                    'Action': 'sts:AssumeRole'
+                }]
+            },
+            'MaxSessionDuration': 3600
+        })
+    return {'Roles': roles}
+
+
+# measure the best time of parsing the text.
+def measure(parse, text: str, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--roles', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = buildRoles(args.roles)
+    json_text = json.dumps(data, indent=4)
+    yaml_text = yaml.safe_dump(data, default_flow_style=False)
+    cases = [
+        ('json (json.loads)', json.loads, json_text),
+        ('json (Cli.parseOutput)', Cli.parseOutput, json_text),
+        ('yaml (CSafeLoader)', lambda text: yaml.load(
+            text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)), yaml_text),
+        ('yaml (Cli.parseOutput)', Cli.parseOutput, yaml_text),
+        ('yaml (yaml.safe_load)', yaml.safe_load, yaml_text),
+    ]
+    print(f"roles: {args.roles}, libyaml: {hasattr(yaml, 'CSafeLoader')}")
+    print(f"{'case':<26}{'size(MB)':>10}{'time(s)':>10}{'s/MB':>10}")
+    for name, parse, text in cases:
+        size = len(text.encode()) / 1024 / 1024
+        elapsed = measure(parse, text, args.repeat)
+        print(f"{name:<26}{size:>10.2f}{elapsed:>10.4f}{elapsed / size:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
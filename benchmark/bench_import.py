@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+'''
+Regression check of the import time of this package.
+Each case is imported in a fresh interpreter with -X importtime,
+and the cumulative time of the package modules is compared with the budget.
+It also checks that the heavy modules (yaml, botocore, asyncio, ...)
+are not imported until they are used.
+The exit code is 1 when a case is over the budget or imports a deferred module,
+so that it can run in CI.
+
+usage:
+    python benchmark/bench_import.py [--repeat 5] [--budget-ms 100] [--verbose]
+'''
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT.name
+
+# the modules which must not be imported by the cases.
+DEFERRED = ['yaml', 'botocore', 'asyncio', 'concurrent.futures',
+            'termcolor', 'pprint', 'inspect', 'traceback', 'random']
+
+# the cases (name, statement, the budget ratio to --budget-ms & the deferred modules imported by the standard library).
+CASES = [
+    ('import package', f"import {PACKAGE}", 0.1, []),
+    ('from package import Cli', f"from {PACKAGE} import Cli", 1.0, []),
+    ('from package import LambdaCli',
+     f"from {PACKAGE} import LambdaCli", 1.0, []),
+    ('from package import ApigatewayCli',
+     f"from {PACKAGE} import ApigatewayCli", 1.0, []),
+    # http.client imports random.
+    ('from package import Docker',
+     f"from {PACKAGE} import Docker", 1.0, ['random']),
+]
+
+
+# import the statement in a fresh interpreter.
+# Returns: the cumulative microseconds of the top level imports of this package & the names of all imported modules.
+def importOnce(statement: str) -> tuple:
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=str(ROOT.parent),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+    times = dict()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # the nested imports are indented, and they are included in the cumulative time of the top level.
+        if name[1:2] != ' ' and (name.strip() == PACKAGE or name.strip().startswith(f"{PACKAGE}.")):
+            times[name.strip()] = int(cumulative)
+    return times, set(result.stdout.split())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='the number of fresh interpreters per case. The best time is used.')
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help='the budget of importing a class in milliseconds.')
+    parser.add_argument('--verbose', action='store_true',
+                        help='print the time of the top level imports of this package in each case.')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'case':<36}{'best(ms)':>10}{'budget(ms)':>12}  result")
+    for name, statement, ratio, allowed in CASES:
+        best, best_times, modules = None, None, set()
+        for _ in range(args.repeat):
+            times, modules = importOnce(statement)
+            elapsed = sum(times.values()) / 1000
+            if best is None or elapsed < best:
+                best, best_times = elapsed, times
+        budget = args.budget_ms * ratio
+        deferred = [module for module in DEFERRED
+                    if module in modules and module not in allowed]
+        ok = best <= budget and not deferred
+        failed |= not ok
+        note = 'ok' if ok else 'NG'
+        if deferred:
+            note += f" (imported: {', '.join(deferred)})"
+        print(f"{name:<36}{best:>10.2f}{budget:>12.1f}  {note}")
+        if args.verbose:
+            for module, cumulative in sorted(best_times.items(), key=lambda item: -item[1]):
+                print(f"    {module:<40}{cumulative / 1000:>10.2f}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,19 +4,22 @@ from __future__ import annotations
 
 import subprocess
 from subprocess import PIPE
-import termcolor
 import json
-import yaml
+import os
 import sys
-import random
-import string
 import datetime
-import pprint
 from pathlib import Path
-import traceback
-import inspect
+import weakref
+import threading
+import collections
+import time
 from .cli_enum import CliEnum
-from typing import Union
+from .metrics import Metrics
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Union
+# asyncio, concurrent.futures, yaml, termcolor, pprint, inspect, traceback and random
+# are imported by the methods using them, so that importing this module stays fast.
+if TYPE_CHECKING:
+    import asyncio
 
 
 '''
@@ -26,6 +29,17 @@ This is Command Class
 
 class Cli:
     ENUM = CliEnum
+    # the number of commands which execCmdAsync runs at the same time.
+    ASYNC_CONCURRENCY = 8
+    # the output of the commands. Refer setOutput.
+    OUTPUT_POLICY = CliEnum.OUTPUT_FULL
+    OUTPUT_TRUNCATE_CHARS = 1000
+    __semaphores = weakref.WeakKeyDictionary()
+    __history = collections.deque(maxlen=20)
+    __log_file = None
+    __output_lock = threading.Lock()
+    # the last failed result of each thread.
+    __local = threading.local()
     # constructor.
 
     def __init__(self):
@@ -42,43 +56,444 @@ class Cli:
         error_option (int, optional): the option when an error happens.
             CMD_OPTION_STOP(defalt): stop the processing.  
             CMD_OPTION_CONTINUE: continue the processing.
+        env (dict, optional): the environment variables of the command. os.environ is used when it is None.
     Returns:
         subprocess.CompletedProcess: the result of executing command.
     '''
     @staticmethod
-    def execCmd(cmd: str, error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+    def execCmd(cmd: str, error_option=CliEnum.CMD_OPTION_STOP, env=None) -> subprocess.CompletedProcess:
         try:
-            print(f' ---------- [COMMAND] {cmd} ---------- ')
+            Cli.__banner(cmd)
+            started = time.perf_counter()
             result = subprocess.run(
-                cmd, shell=True, stdout=PIPE, stderr=PIPE, text=True)
-            if result.returncode == 0:
-                print(termcolor.colored(result.returncode, 'green'))
-                print(termcolor.colored(pprint.pformat(result.stdout), 'green'))
-                print(termcolor.colored(pprint.pformat(result.stderr), 'green'))
-                print(' ------------------------------ ')
+                cmd, shell=True, stdout=PIPE, stderr=PIPE, text=True, env=env)
+            if Metrics.ENABLED:
+                Cli.__measure(result, started)
+            return Cli.__report(result, error_option)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' execute a command and stream its standard output line by line.
+        Only the last lines of stdout and stderr are kept for the error report,
+        so a large output runs in constant memory.
+    Args:
+        cmd (str): the command executing.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+        callback (Callable, optional): the function called with each line.
+        tail_lines (int, optional): the number of last lines kept for the error report.
+        env (dict, optional): the environment variables of the command. os.environ is used when it is None.
+    Yields:
+        str: a line of stdout without the line break.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command,
+            whose stdout and stderr have only the last lines.
+    e.g.
+        for line in Cli.execStream('aws s3 ls --recursive s3://MY_BUCKET', callback=Cli.write):
+            ...
+    '''
+    @staticmethod
+    def execStream(cmd: str, error_option=CliEnum.CMD_OPTION_STOP, callback: Optional[Callable[[str], None]] = None, tail_lines=100, env=None) -> Iterator[str]:
+        Cli.__banner(cmd)
+        started = time.perf_counter()
+        stdout_bytes = 0
+        process = subprocess.Popen(
+            cmd, shell=True, stdout=PIPE, stderr=PIPE, text=True, env=env)
+        stdout_tail = collections.deque(maxlen=tail_lines)
+        stderr_tail = collections.deque(maxlen=tail_lines)
+        # drain stderr in the background so that the process never blocks on it.
+        stderr_reader = threading.Thread(
+            target=stderr_tail.extend, args=(process.stderr,), daemon=True)
+        stderr_reader.start()
+        completed = False
+        try:
+            for line in process.stdout:
+                stdout_bytes += len(line)
+                line = line.rstrip('\n')
+                stdout_tail.append(line)
+                if callback:
+                    callback(line)
+                yield line
+            completed = True
+        finally:
+            # the caller stopped reading, so the rest of the output is not needed.
+            if not completed:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+            stderr_reader.join()
+            process.stderr.close()
+        result = subprocess.CompletedProcess(
+            cmd, process.returncode, '\n'.join(stdout_tail), ''.join(stderr_tail))
+        if Metrics.ENABLED:
+            Cli.__measure(result, started, stdout_bytes)
+        try:
+            return Cli.__report(result, error_option)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' execute commands in parallel.
+    Args:
+        cmds (list): the commands executing.
+        max_workers (int, optional): the maximum number of commands running at the same time.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing at the first error.
+                The commands not started yet are cancelled.
+            CMD_OPTION_CONTINUE: continue the processing and collect all results.
+        env (dict, optional): the environment variables of the commands. os.environ is used when it is None.
+    Returns:
+        list: the results of executing commands (subprocess.CompletedProcess) in the order of cmds.
+    '''
+    @staticmethod
+    def execMany(cmds: List[str], max_workers=8, error_option=CliEnum.CMD_OPTION_STOP, env=None) -> List[subprocess.CompletedProcess]:
+        def execute(cmd: str) -> subprocess.CompletedProcess:
+            result = Cli.execCmd(cmd, CliEnum.CMD_OPTION_CONTINUE, env)
+            if result.returncode != 0 and error_option == CliEnum.CMD_OPTION_STOP:
+                raise Exception('ERROR happened. Stop this process.')
+            return result
+        try:
+            return Cli.mapParallel(execute, cmds, max_workers)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' call the function with each item on the worker threads.
+        At the first error of the workers, the items not started yet are cancelled,
+        and the error (including SystemExit of CMD_OPTION_STOP) is raised after the running ones finish.
+    Args:
+        func (Callable): the function called with an item.
+        items (Iterable): the items.
+        max_workers (int, optional): the maximum number of items processed at the same time.
+    Returns:
+        list: the return values of the function in the order of items.
+    e.g.
+        results = Cli.mapParallel(lambda name: lambda_cli.getFunction(name), names)
+    '''
+    @staticmethod
+    def mapParallel(func: Callable[[object], object], items: Iterable, max_workers=8) -> list:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        # the workers record the commands with the caller of this method.
+        func = Metrics.bindCaller(func)
+        futures = [executor.submit(func, item) for item in items]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown()
+        return [future.result() for future in futures]
+
+    ''' execute a command asynchronously.
+        The number of commands running at the same time is limited by ASYNC_CONCURRENCY.
+    Args:
+        cmd (str): the command executing.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+        env (dict, optional): the environment variables of the command. os.environ is used when it is None.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command.
+    e.g.
+        results = await asyncio.gather(
+            Cli.execCmdAsync('aws lambda get-function --function-name foo'),
+            Cli.execCmdAsync('aws lambda get-function --function-name bar'))
+    '''
+    @staticmethod
+    async def execCmdAsync(cmd: str, error_option=CliEnum.CMD_OPTION_STOP, env=None) -> subprocess.CompletedProcess:
+        import asyncio
+        try:
+            async with Cli.__getSemaphore():
+                Cli.__banner(cmd)
+                started = time.perf_counter()
+                process = await asyncio.create_subprocess_exec(
+                    '/bin/sh', '-c', cmd, stdout=PIPE, stderr=PIPE, env=env)
+                stdout, stderr = await process.communicate()
+            result = subprocess.CompletedProcess(
+                cmd, process.returncode, stdout.decode(), stderr.decode())
+            if Metrics.ENABLED:
+                Cli.__measure(result, started, len(stdout), len(stderr))
+            return Cli.__report(result, error_option)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' execute a function in place of a command.
+        The result is output and the error option is applied in the same way as execCmd.
+    Args:
+        label (str): the label output in place of the command.
+        func (Callable): the function returning subprocess.CompletedProcess.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        subprocess.CompletedProcess: the result of the function.
+    '''
+    @staticmethod
+    def execFunc(label: str, func: Callable[[], subprocess.CompletedProcess], error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        try:
+            Cli.__banner(label)
+            started = time.perf_counter()
+            result = func()
+            if Metrics.ENABLED:
+                Cli.__measure(result, started, label=label)
+            return Cli.__report(result, error_option)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' execute a function in place of a command asynchronously.
+        The function runs on the default executor of the event loop,
+        limited by ASYNC_CONCURRENCY together with execCmdAsync.
+        Refer execFunc.
+    '''
+    @staticmethod
+    async def execFuncAsync(label: str, func: Callable[[], subprocess.CompletedProcess], error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        import asyncio
+        try:
+            async with Cli.__getSemaphore():
+                Cli.__banner(label)
+                started = time.perf_counter()
+                result = await asyncio.get_running_loop().run_in_executor(None, func)
+            if Metrics.ENABLED:
+                Cli.__measure(result, started, label=label)
+            return Cli.__report(result, error_option)
+        except Exception as e:
+            Cli.__abort(e)
+
+    ''' set the number of commands which execCmdAsync runs at the same time.
+    Args:
+        limit (int): the maximum number of running commands.
+    '''
+    @staticmethod
+    def setConcurrency(limit: int) -> None:
+        if limit < 1:
+            raise ValueError('the concurrency must be 1 or over.')
+        Cli.ASYNC_CONCURRENCY = limit
+        Cli.__semaphores.clear()
+
+    ''' get the semaphore of the running event loop.
+    Returns:
+        asyncio.Semaphore: the semaphore limiting execCmdAsync.
+    '''
+    @staticmethod
+    def __getSemaphore() -> asyncio.Semaphore:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        semaphore = Cli.__semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(Cli.ASYNC_CONCURRENCY)
+            Cli.__semaphores[loop] = semaphore
+        return semaphore
+
+    ''' record the metrics of an executed command. Refer Metrics.
+    Args:
+        result (subprocess.CompletedProcess): the result of executing command.
+        started (float): time.perf_counter() when the command started.
+        stdout_bytes (int, optional): the size of stdout. It is measured from the result when it is None.
+        stderr_bytes (int, optional): the size of stderr. It is measured from the result when it is None.
+        label (str, optional): the label of execFunc, which is recorded in place of the command.
+    '''
+    @staticmethod
+    def __measure(result: subprocess.CompletedProcess, started: float, stdout_bytes=None, stderr_bytes=None, label=None) -> None:
+        seconds = time.perf_counter() - started
+        if stdout_bytes is None:
+            stdout_bytes = len(result.stdout.encode()) \
+                if isinstance(result.stdout, str) else len(result.stdout or b'')
+        if stderr_bytes is None:
+            stderr_bytes = len(result.stderr.encode()) \
+                if isinstance(result.stderr, str) else len(result.stderr or b'')
+        Metrics.record(label or str(result.args), seconds,
+                       result.returncode, stdout_bytes, stderr_bytes)
+
+    ''' output the result of a command and apply the error option.
+    Args:
+        result (subprocess.CompletedProcess): the result of executing command.
+        error_option (int): the option when an error happens.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command.
+    '''
+    @staticmethod
+    def __report(result: subprocess.CompletedProcess, error_option: int) -> subprocess.CompletedProcess:
+        # the history keeps only the head & the tail, so that large outputs are not held in memory.
+        entry = subprocess.CompletedProcess(
+            result.args, result.returncode, Cli.__clip(result.stdout), Cli.__clip(result.stderr))
+        Cli.__history.append(entry)
+        if result.returncode != 0:
+            Cli.__local.last_error = entry
+        if result.returncode == 0:
+            if Cli.OUTPUT_POLICY != CliEnum.OUTPUT_SILENT:
+                Cli.__output(result, 'green')
+                Cli.__write(' ------------------------------ ')
+            return result
+        else:
+            if error_option == CliEnum.CMD_OPTION_STOP:
+                Cli.__output(result, 'red')
+                raise Exception('ERROR happened. Stop this process.')
+            elif error_option == CliEnum.CMD_OPTION_CONTINUE:
+                Cli.__output(result, 'yellow')
                 return result
-            else:
-                if error_option == CliEnum.CMD_OPTION_STOP:
-                    print(termcolor.colored(result.returncode, 'red'))
-                    print(termcolor.colored(pprint.pformat(result.stdout), 'red'))
-                    print(termcolor.colored(pprint.pformat(result.stderr), 'red'))
-                    raise Exception('ERROR happened. Stop this process.')
-                elif error_option == CliEnum.CMD_OPTION_CONTINUE:
-                    print(termcolor.colored(result.returncode, 'yellow'))
-                    print(termcolor.colored(
-                        pprint.pformat(result.stdout), 'yellow'))
-                    print(termcolor.colored(
-                        pprint.pformat(result.stderr), 'yellow'))
-                    return result
+
+    ''' output the result got already and apply the error option, in the same way as execCmd.
+    Args:
+        result (subprocess.CompletedProcess): the result of executing command.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        subprocess.CompletedProcess: the result of executing command.
+    '''
+    @staticmethod
+    def checkResult(result: subprocess.CompletedProcess, error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        try:
+            return Cli.__report(result, error_option)
         except Exception as e:
-            print(termcolor.colored(f"{e}", 'red'))
-            print(termcolor.colored(f"Caller : ", 'red'))
-            for stack in inspect.stack():
-                print(termcolor.colored(
-                    f"{stack.filename},{stack.function},{stack.lineno}", 'red'))
-            print(termcolor.colored(
-                f"Stacktrace : {traceback.format_exc()}", 'red'))
-            sys.exit()
+            Cli.__abort(e)
+
+    ''' set how the commands and their results are output.
+        The output is formatted only when it is written, so OUTPUT_SILENT costs nothing for large outputs.
+    Args:
+        policy (int, optional): the output of the results.
+            OUTPUT_FULL(defalt): output stdout & stderr entirely.
+            OUTPUT_TRUNCATED: output only the head & the tail of stdout & stderr (OUTPUT_TRUNCATE_CHARS each).
+            OUTPUT_SILENT: output nothing but the errors, which are truncated.
+        log_file (str, optional): the file into which the output is appended instead of the terminal.
+            An empty string writes into the terminal again.
+        truncate_chars (int, optional): the number of characters of the head & the tail kept by OUTPUT_TRUNCATED.
+        history (int, optional): the number of the last results kept for getHistory.
+    e.g.
+        Cli.setOutput(CliEnum.OUTPUT_SILENT, log_file='deploy.log')
+    '''
+    @staticmethod
+    def setOutput(policy=None, log_file=None, truncate_chars=None, history=None) -> None:
+        with Cli.__output_lock:
+            if policy is not None:
+                Cli.OUTPUT_POLICY = policy
+            if truncate_chars is not None:
+                Cli.OUTPUT_TRUNCATE_CHARS = truncate_chars
+            if history is not None:
+                Cli.__history = collections.deque(
+                    Cli.__history, maxlen=history)
+            if log_file is not None:
+                if Cli.__log_file is not None:
+                    Cli.__log_file.close()
+                Cli.__log_file = open(log_file, 'a') if log_file else None
+
+    ''' get the results of the last commands for the post-mortem. They are kept even by OUTPUT_SILENT.
+        Their stdout & stderr are truncated to the head & the tail (OUTPUT_TRUNCATE_CHARS each) by any policy.
+    Returns:
+        list: the results (subprocess.CompletedProcess) from the oldest.
+    '''
+    @staticmethod
+    def getHistory() -> List[subprocess.CompletedProcess]:
+        return list(Cli.__history)
+
+    ''' get the last failed result of the commands executed on the current thread.
+        e.g. the command which stopped the processing by CMD_OPTION_STOP on a worker thread.
+    Returns:
+        subprocess.CompletedProcess: the result truncated like getHistory, or None when no command failed.
+    '''
+    @staticmethod
+    def getLastError() -> Optional[subprocess.CompletedProcess]:
+        return getattr(Cli.__local, 'last_error', None)
+
+    ''' output the command which is executed.
+    Args:
+        cmd (str): the command or the label.
+    '''
+    @staticmethod
+    def __banner(cmd: str) -> None:
+        if Cli.OUTPUT_POLICY != CliEnum.OUTPUT_SILENT:
+            Cli.__write(f' ---------- [COMMAND] {cmd} ---------- ')
+
+    ''' output the result of a command by the output policy.
+    Args:
+        result (subprocess.CompletedProcess): the result of executing command.
+        color (str): the color on the terminal.
+    '''
+    @staticmethod
+    def __output(result: subprocess.CompletedProcess, color: str) -> None:
+        import pprint
+        if Cli.OUTPUT_POLICY == CliEnum.OUTPUT_SILENT:
+            # the command is not output yet.
+            Cli.__write(f' ---------- [COMMAND] {result.args} ---------- ')
+        Cli.__write(result.returncode, color)
+        Cli.__write(pprint.pformat(Cli.__truncate(result.stdout)), color)
+        Cli.__write(pprint.pformat(Cli.__truncate(result.stderr)), color)
+
+    ''' keep only the head & the tail of the output unless OUTPUT_FULL.
+    Args:
+        text (str): the output.
+    Returns:
+        str: the output truncated.
+    '''
+    @staticmethod
+    def __truncate(text: str) -> str:
+        if Cli.OUTPUT_POLICY == CliEnum.OUTPUT_FULL:
+            return text
+        return Cli.__clip(text)
+
+    ''' keep only the head & the tail of the output by any policy.
+    Args:
+        text (str): the output.
+    Returns:
+        str: the output truncated.
+    '''
+    @staticmethod
+    def __clip(text: str) -> str:
+        limit = Cli.OUTPUT_TRUNCATE_CHARS
+        if text is None or len(text) <= limit * 2:
+            return text
+        return f"{text[:limit]}\n... {len(text) - limit * 2} characters omitted ...\n{text[-limit:]}"
+
+    ''' output a line of the progress of a command, e.g. the callback of execStream.
+        It follows the output policy: nothing is output by OUTPUT_SILENT, and it is written into the log file if set.
+    Args:
+        text (object): the text.
+        color (str, optional): the color on the terminal.
+    e.g.
+        for line in Cli.execStream('aws s3 cp --recursive ./dist s3://MY_BUCKET', callback=Cli.write):
+            ...
+    '''
+    @staticmethod
+    def write(text: object, color=None) -> None:
+        if Cli.OUTPUT_POLICY != CliEnum.OUTPUT_SILENT:
+            Cli.__write(text, color)
+
+    ''' write a line into the terminal, or the log file without the color.
+    Args:
+        text (object): the text.
+        color (str, optional): the color on the terminal.
+    '''
+    @staticmethod
+    def __write(text: object, color=None) -> None:
+        if Cli.__log_file is None:
+            if color:
+                import termcolor
+                text = termcolor.colored(text, color)
+            print(text)
+            return
+        with Cli.__output_lock:
+            Cli.__log_file.write(f"{text}\n")
+            Cli.__log_file.flush()
+
+    ''' output the error with the caller's stack and stop this process.
+    Args:
+        e (Exception): the error.
+    '''
+    @staticmethod
+    def __abort(e: Exception) -> None:
+        import inspect
+        import traceback
+        Cli.__write(f"{e}", 'red')
+        Cli.__write(f"Caller : ", 'red')
+        # context=0 does not read the source lines of each frame.
+        for stack in inspect.stack(context=0):
+            Cli.__write(
+                f"{stack.filename},{stack.function},{stack.lineno}", 'red')
+        Cli.__write(f"Stacktrace : {traceback.format_exc()}", 'red')
+        sys.exit()
 
     ''' get a random string.
     Args:
@@ -88,6 +503,8 @@ class Cli:
     '''
     @staticmethod
     def getRandomStr(count: int) -> str:
+        import random
+        import string
         return ''.join(random.choices(string.ascii_lowercase + string.digits + '-', k=count))
 
     ''' Get the current time with string.
@@ -106,8 +523,36 @@ class Cli:
     '''
     @staticmethod
     def loadYaml(file_path: str) -> dict:
+        import yaml
         with open(file_path) as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=Cli.__yamlLoader())
+
+    ''' Parsing the output of a command
+        JSON (e.g. --output json) is parsed with the json module,
+        and the others are parsed as YAML with libyaml if it is available.
+    Args:
+        text (str): the output of a command.
+    Returns:
+        dict or list: the parsed output. None when the output is empty.
+    '''
+    @staticmethod
+    def parseOutput(text: str) -> Union[dict, list, None]:
+        if text.lstrip()[:1] in ('{', '['):
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        import yaml
+        return yaml.load(text, Loader=Cli.__yamlLoader())
+
+    ''' get the YAML loader. libyaml is used if it is available, because the pure Python loader is very slow.
+    Returns:
+        type: the loader.
+    '''
+    @staticmethod
+    def __yamlLoader() -> type:
+        import yaml
+        return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
     ''' Loading a file as json format
     Args:
@@ -126,6 +571,38 @@ class Cli:
                 json_data = json.dumps(json_data, sort_keys=True, indent=2)
             return json_data
 
+    ''' write a file atomically.
+        Another file is written and replaced, so that the other process never reads a part of it,
+        and an interruption never breaks it.
+    Args:
+        path (str or Path): target file path. Its directory is created if it does not exist.
+        data (str, bytes or Callable): the text, the bytes, or the function writing the file at the given path.
+    e.g.
+        Cli.writeAtomic('manifest.json', json.dumps(manifest))
+        Cli.writeAtomic('function.zip', lambda tmp_path: writeZip(tmp_path))
+    '''
+    @staticmethod
+    def writeAtomic(path: Union[str, Path], data: Union[str, bytes, Callable[[Path], None]]) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # the threads of the same process do not share the file either.
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            if callable(data):
+                data(tmp_path)
+            elif isinstance(data, bytes):
+                tmp_path.write_bytes(data)
+            else:
+                tmp_path.write_text(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
     ''' Output standard output message
     Args:
         message (str): the message.
@@ -141,5 +618,5 @@ class Cli:
             color = 'red'
         elif severity == CliEnum.SEVERIY_WARN:
             color = 'yellow'
-        print(termcolor.colored(
-            f"************ {Cli.now()} : {message} ************", color))
+        Cli.__write(
+            f"************ {Cli.now()} : {message} ************", color)
@@ -10,3 +10,15 @@ class CliEnum(IntEnum):
     
     RETURN_TYPE_DICT = auto()
     RETURN_TYPE_STRING = auto()
+
+    BACKEND_CLI = auto()
+    BACKEND_BOTOCORE = auto()
+
+    OUTPUT_FULL = auto()
+    OUTPUT_TRUNCATED = auto()
+    OUTPUT_SILENT = auto()
+
+    FAILURE_THROTTLE = auto()
+    FAILURE_TRANSIENT = auto()
+    FAILURE_CONFLICT = auto()
+    FAILURE_FATAL = auto()
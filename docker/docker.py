@@ -1,7 +1,44 @@
 # -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
 
+import http.client
+import json
 import os
+import socket
+import subprocess
+import threading
+import time
+import urllib.parse
+from typing import List
 from ..cli import Cli
+from ..cli_enum import CliEnum
+
+
+'''
+This is HTTP Connection Class over a unix socket
+'''
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+
+    ''' constructor.
+    Args:
+        socket_path (str): the path of the unix socket.
+        timeout (float, optional): the timeout seconds of the socket.
+    '''
+
+    def __init__(self, socket_path: str, timeout=60) -> UnixHTTPConnection:
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    # connect to the unix socket instead of the TCP host.
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
 
 
 '''
@@ -10,28 +47,180 @@ This is Docker Command Class
 
 
 class Docker(Cli):
+    # the socket of the Docker Engine API. unix:// of DOCKER_HOST precedes it.
+    SOCKET_PATH = '/var/run/docker.sock'
+    # the image of DynamoDB Local.
+    DYNAMODB_LOCAL_IMAGE = 'amazon/dynamodb-local'
+    __default = None
+    __default_lock = threading.Lock()
+
+    ''' constructor.
+        The connection to the Docker Engine API is kept alive and reused by the requests of this instance.
+    Args:
+        socket_path (str, optional): the path of the unix socket. SOCKET_PATH is used when it is None.
+    '''
 
-    # constructor.
-    def __init__(self):
-        pass
+    def __init__(self, socket_path=None) -> Docker:
+        docker_host = os.environ.get('DOCKER_HOST', '')
+        if socket_path is None and docker_host.startswith('unix://'):
+            socket_path = docker_host[len('unix://'):]
+        self.socket_path = socket_path or Docker.SOCKET_PATH
+        self.__connection = None
+        self.__lock = threading.Lock()
 
     # destructor.
 
-    def __del__(self):
-        pass
+    def __del__(self) -> None:
+        if getattr(self, '_Docker__connection', None) is not None:
+            self.__connection.close()
 
-    # check whether the docker process is running or not
+    ''' get the instance shared by the class methods.
+    Returns:
+        Docker: the instance.
+    '''
+    @classmethod
+    def get(cls) -> Docker:
+        with Docker.__default_lock:
+            if Docker.__default is None:
+                Docker.__default = cls()
+            return Docker.__default
 
+    ''' check whether the container of the image is running or not.
+    Args:
+        image (str, optional): the image of the container.
+    Returns:
+        bool: True when it is running.
+    '''
     @classmethod
-    def isRunning(cls):
-        cmd = 'docker ps'
-        result = DockerCli.execCmd(cmd)
-        result_list = result.stdout.splitlines()
-        is_running = False
-        if len(result_list) > 1:
-            for idx in range(1, len(result_list)):
-                image = result_list[idx].split()[1]
-                if image == 'amazon/dynamodb-local':
-                    is_running = True
+    def isRunning(cls, image=DYNAMODB_LOCAL_IMAGE) -> bool:
+        return len(cls.get().containers(image=image)) > 0
+
+    ''' list the containers. The filters are applied by the Docker Engine.
+        Ref: https://docs.docker.com/engine/api/v1.41/#operation/ContainerList
+    Args:
+        image (str, optional): the image (ancestor) of the containers.
+        label (str, optional): the label of the containers. e.g. app or app=test
+        all (bool, optional): list the stopped containers too.
+        error_option (int, optional): the option when an error happens.
+            CMD_OPTION_STOP(defalt): stop the processing.
+            CMD_OPTION_CONTINUE: continue the processing.
+    Returns:
+        list: the containers. The keys are the same as the Docker Engine API. e.g. Id, Image, State
+    '''
+
+    def containers(self, image=None, label=None, all=False, error_option=CliEnum.CMD_OPTION_STOP) -> List[dict]:
+        filters = dict()
+        if image:
+            filters['ancestor'] = [image]
+        if label:
+            filters['label'] = [label]
+        query = {'all': str(all).lower()}
+        if filters:
+            query['filters'] = json.dumps(filters)
+        result = self.request('GET', '/containers/json', query, error_option)
+        return (Docker.parseOutput(result.stdout) or []) if result.returncode == 0 else []
+
+    ''' start the container.
+    Args:
+        container (str): the id or the name of the container.
+        error_option (int, optional): the option when an error happens.
+    Returns:
+        subprocess.CompletedProcess: the result of the request.
+    '''
+
+    def start(self, container: str, error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        return self.request('POST', f"/containers/{urllib.parse.quote(container)}/start", error_option=error_option)
+
+    ''' stop the container.
+    Args:
+        container (str): the id or the name of the container.
+        timeout (int, optional): the seconds to wait before killing the container.
+        error_option (int, optional): the option when an error happens.
+    Returns:
+        subprocess.CompletedProcess: the result of the request.
+    '''
+
+    def stop(self, container: str, timeout=10, error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        return self.request('POST', f"/containers/{urllib.parse.quote(container)}/stop", {'t': timeout}, error_option)
+
+    ''' wait until DynamoDB Local answers HTTP requests, polling the port with exponential backoff.
+        Any status (e.g. 400 of the empty request) means that it is ready.
+    Args:
+        host (str, optional): the host of DynamoDB Local.
+        port (int, optional): the port of DynamoDB Local.
+        timeout (float, optional): the seconds to wait at most.
+        interval (float, optional): the first interval seconds of the polling, which doubles up to 1 second.
+    Returns:
+        bool: True when it is ready, False when timed out.
+    e.g.
+        docker = Docker()
+        docker.start('dynamodb-local')
+        Docker.waitDynamodbLocal()
+    '''
+    @staticmethod
+    def waitDynamodbLocal(host='localhost', port=8000, timeout=30.0, interval=0.05) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with socket.create_connection((host, port), timeout=1) as connection:
+                    # the port is opened before the server is ready, so wait for a status line. e.g. HTTP/1.1 400 Bad Request
+                    connection.sendall(f"POST / HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                                       'Content-Length: 0\r\nConnection: close\r\n\r\n'.encode())
+                    if connection.recv(16).startswith(b'HTTP/'):
+                        return True
+            except OSError:
+                pass
+            if time.monotonic() + interval > deadline:
+                return False
+            time.sleep(interval)
+            interval = min(interval * 2, 1.0)
+
+    ''' send a request to the Docker Engine API.
+        The result is reported in the same way as the commands. 304 (Not Modified) is not an error.
+    Args:
+        method (str): the HTTP method.
+        path (str): the path of the API. e.g. /containers/json
+        query (dict, optional): the query parameters.
+        error_option (int, optional): the option when an error happens.
+    Returns:
+        subprocess.CompletedProcess: the result whose stdout is the response body,
+            and whose returncode is 0 on success or the HTTP status on error.
+    '''
+
+    def request(self, method: str, path: str, query=None, error_option=CliEnum.CMD_OPTION_STOP) -> subprocess.CompletedProcess:
+        if query:
+            path += '?' + urllib.parse.urlencode(query)
+        args = f"[docker] {method} {path}"
+        return Docker.execFunc(args, lambda: self.__send(args, method, path), error_option)
+
+    ''' send a request on the kept-alive connection, and reconnect once when it was closed.
+    Args:
+        args (str): the label of the result.
+        method (str): the HTTP method.
+        path (str): the path with the query.
+    Returns:
+        subprocess.CompletedProcess: the result.
+    '''
+
+    def __send(self, args: str, method: str, path: str) -> subprocess.CompletedProcess:
+        with self.__lock:
+            for attempt in range(2):
+                if self.__connection is None:
+                    self.__connection = UnixHTTPConnection(self.socket_path)
+                try:
+                    self.__connection.request(method, path)
+                    response = self.__connection.getresponse()
+                    body = response.read().decode()
                     break
-        return is_running
+                except (http.client.HTTPException, ConnectionError) as e:
+                    self.__connection.close()
+                    self.__connection = None
+                    if attempt > 0:
+                        return subprocess.CompletedProcess(args, 1, '', f"{e}")
+                except OSError as e:
+                    self.__connection.close()
+                    self.__connection = None
+                    return subprocess.CompletedProcess(args, 1, '', f"{e}")
+        if response.status < 300 or response.status == 304:
+            return subprocess.CompletedProcess(args, 0, body, '')
+        return subprocess.CompletedProcess(args, response.status, '', body)
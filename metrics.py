@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# the following is not necessary if Python version is 3.9 or over.
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import math
+import shlex
+import sys
+import threading
+from typing import Callable, Dict, List
+
+'''
+This is Command Metrics Class
+'''
+
+
+class Metrics:
+    # whether the commands are recorded. Cli checks only this while it is False.
+    ENABLED = False
+    __records = dict()
+    __lock = threading.Lock()
+    __exports = {'json': None, 'prometheus': None}
+    __registered = False
+    # the methods executing the commands for the other methods.
+    __PLUMBING = {'execAws', 'execAwsAsync',
+                  'iterItems', 'iterPages', 'request'}
+    # the caller captured by bindCaller for the functions run on the worker threads.
+    __CALLER = contextvars.ContextVar('metrics_caller', default=None)
+
+    ''' start recording the commands.
+    Args:
+        json_path (str, optional): the JSON file into which the metrics are exported at exit.
+        prometheus_path (str, optional): the Prometheus text file into which the metrics are exported at exit.
+    e.g.
+        Metrics.enable(json_path='metrics.json')
+        lambda_cli.updateFunction(...)
+        print(Metrics.summary()['lambda update-function-code']['P95'])
+    '''
+    @staticmethod
+    def enable(json_path=None, prometheus_path=None) -> None:
+        with Metrics.__lock:
+            Metrics.__exports = {'json': json_path,
+                                 'prometheus': prometheus_path}
+            if not Metrics.__registered:
+                atexit.register(Metrics.export)
+                Metrics.__registered = True
+        Metrics.ENABLED = True
+
+    ''' stop recording the commands. The records are kept.
+    '''
+    @staticmethod
+    def disable() -> None:
+        Metrics.ENABLED = False
+
+    ''' clear the records.
+    '''
+    @staticmethod
+    def reset() -> None:
+        with Metrics.__lock:
+            Metrics.__records.clear()
+
+    ''' record an executed command.
+    Args:
+        cmd (str): the command or the label of execFunc.
+        seconds (float): the wall time.
+        returncode (int): the exit code.
+        stdout_bytes (int): the size of stdout.
+        stderr_bytes (int): the size of stderr.
+    '''
+    @staticmethod
+    def record(cmd: str, seconds: float, returncode: int, stdout_bytes: int, stderr_bytes: int) -> None:
+        family = Metrics.family(cmd)
+        caller = Metrics.__caller(sys._getframe(1))
+        with Metrics.__lock:
+            record = Metrics.__records.setdefault(family, {
+                'Seconds': [], 'Errors': 0, 'StdoutBytes': 0, 'StderrBytes': 0, 'Callers': dict()})
+            record['Seconds'].append(seconds)
+            record['Errors'] += returncode != 0
+            record['StdoutBytes'] += stdout_bytes
+            record['StderrBytes'] += stderr_bytes
+            record['Callers'][caller] = record['Callers'].get(caller, 0) + 1
+
+    ''' get the family of a command, which aggregates the metrics.
+    Args:
+        cmd (str): the command or the label of execFunc.
+    Returns:
+        str: the family. e.g. lambda update-function-code
+    '''
+    @staticmethod
+    def family(cmd: str) -> str:
+        # the labels of the botocore backend are [botocore] {service} {operation}.
+        if cmd.startswith('[botocore] '):
+            words = cmd.split()[1:]
+            if words[:1] == ['aws']:
+                words = words[1:]
+            words = [word for word in words if not word.startswith('-')][:2]
+            return ' '.join(word.replace('_', '-') for word in words)
+        if cmd.startswith('[docker] '):
+            method, path = (cmd.split()[1:3] + [''])[:2]
+            segments = path.split('?')[0].strip('/').split('/')
+            # drop the id of /containers/{id}/start.
+            if len(segments) > 2:
+                segments = segments[:1] + segments[2:]
+            return f"docker {method} /{'/'.join(segments)}"
+        try:
+            words = shlex.split(cmd)
+        except ValueError:
+            words = cmd.split()
+        if words and words[0] == 'aws':
+            return ' '.join([word for word in words[1:] if not word.startswith('-')][:2])
+        return words[0] if words else ''
+
+    ''' summarize the records by the family.
+    Returns:
+        dict: Count, Errors, Sum, P50, P95, Max, StdoutBytes, StderrBytes & Callers by the family.
+    '''
+    @staticmethod
+    def summary() -> Dict[str, dict]:
+        with Metrics.__lock:
+            records = {family: dict(record, Seconds=sorted(record['Seconds']), Callers=dict(record['Callers']))
+                       for family, record in Metrics.__records.items()}
+        summary = dict()
+        for family, record in sorted(records.items()):
+            seconds = record['Seconds']
+            summary[family] = {
+                'Count': len(seconds),
+                'Errors': record['Errors'],
+                'Sum': sum(seconds),
+                'P50': Metrics.__percentile(seconds, 50),
+                'P95': Metrics.__percentile(seconds, 95),
+                'Max': seconds[-1] if seconds else 0.0,
+                'StdoutBytes': record['StdoutBytes'],
+                'StderrBytes': record['StderrBytes'],
+                'Callers': record['Callers']
+            }
+        return summary
+
+    ''' export the metrics into the files given to enable. It is called at exit.
+    '''
+    @staticmethod
+    def export() -> None:
+        if Metrics.__exports['json']:
+            Metrics.toJson(Metrics.__exports['json'])
+        if Metrics.__exports['prometheus']:
+            Metrics.toPrometheus(Metrics.__exports['prometheus'])
+
+    ''' write the summary into a JSON file.
+    Args:
+        path (str): the file path.
+    '''
+    @staticmethod
+    def toJson(path: str) -> None:
+        Metrics.__write(path, json.dumps(Metrics.summary(), indent=2))
+
+    ''' write the summary into a file in the Prometheus text format.
+    Args:
+        path (str): the file path.
+    '''
+    @staticmethod
+    def toPrometheus(path: str) -> None:
+        Metrics.__write(path, Metrics.prometheusText())
+
+    ''' format the summary in the Prometheus text format.
+    Returns:
+        str: the metrics.
+    '''
+    @staticmethod
+    def prometheusText() -> str:
+        summary = Metrics.summary()
+        lines = ['# HELP cli_command_duration_seconds The wall time of the commands.',
+                 '# TYPE cli_command_duration_seconds summary']
+        for family, metric in summary.items():
+            label = Metrics.__label(family)
+            lines.append(
+                f'cli_command_duration_seconds{{family="{label}",quantile="0.5"}} {metric["P50"]}')
+            lines.append(
+                f'cli_command_duration_seconds{{family="{label}",quantile="0.95"}} {metric["P95"]}')
+            lines.append(
+                f'cli_command_duration_seconds_sum{{family="{label}"}} {metric["Sum"]}')
+            lines.append(
+                f'cli_command_duration_seconds_count{{family="{label}"}} {metric["Count"]}')
+        for name, key, kind, help_text in [
+                ('cli_command_duration_max_seconds', 'Max',
+                 'gauge', 'The longest wall time of the commands.'),
+                ('cli_command_errors_total', 'Errors', 'counter',
+                 'The number of commands which failed.'),
+                ('cli_command_stdout_bytes_total', 'StdoutBytes',
+                 'counter', 'The size of stdout of the commands.'),
+                ('cli_command_stderr_bytes_total', 'StderrBytes', 'counter', 'The size of stderr of the commands.')]:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for family, metric in summary.items():
+                lines.append(
+                    f'{name}{{family="{Metrics.__label(family)}"}} {metric[key]}')
+        return '\n'.join(lines) + '\n'
+
+    ''' bind the caller of this moment to the function run on a worker thread,
+        since the stack of the worker has no public method of the caller. e.g. the closures of LambdaCli.addPermission
+    Args:
+        func (Callable): the function submitted to the worker threads.
+    Returns:
+        Callable: the function recording the commands with the caller. func itself while the metrics are disabled.
+    e.g.
+        executor.submit(Metrics.bindCaller(delete), index, batch)
+    '''
+    @staticmethod
+    def bindCaller(func: Callable) -> Callable:
+        if not Metrics.ENABLED:
+            return func
+        caller = Metrics.__caller(sys._getframe(1))
+
+        def bound(*args, **kwargs) -> object:
+            token = Metrics.__CALLER.set(caller)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                Metrics.__CALLER.reset(token)
+        return bound
+
+    ''' get the caller of the command, which is the nearest public method of the instances of this package.
+        e.g. LambdaCli.updateFunction
+        On a worker thread without it, the caller bound by bindCaller is used.
+    Args:
+        frame (frame): the frame from which the stack is walked.
+    Returns:
+        str: the class & the method, or unknown when it is not called by them.
+    '''
+    @staticmethod
+    def __caller(frame) -> str:
+        candidate = None
+        while frame is not None:
+            owner = frame.f_locals.get('self')
+            name = frame.f_code.co_name
+            if owner is not None and type(owner).__module__.startswith(__package__ or '') \
+                    and name not in Metrics.__PLUMBING:
+                # the closures (e.g. upload of syncUpload) are not the methods of the class, even if their names are.
+                if not name.startswith(('_', '<')) and \
+                        getattr(getattr(type(owner), name, None), '__code__', None) is frame.f_code:
+                    return f"{type(owner).__name__}.{name}"
+                # the private methods & the closures are used only when no public method is found.
+                if candidate is None:
+                    candidate = f"{type(owner).__name__}.{name}"
+            frame = frame.f_back
+        return Metrics.__CALLER.get() or candidate or 'unknown'
+
+    ''' get the percentile of the sorted values (nearest rank).
+    Args:
+        values (list): the sorted values.
+        percent (float): the percentile.
+    Returns:
+        float: the value.
+    '''
+    @staticmethod
+    def __percentile(values: List[float], percent: float) -> float:
+        if not values:
+            return 0.0
+        return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+    ''' escape the value of a Prometheus label.
+    Args:
+        value (str): the value.
+    Returns:
+        str: the escaped value.
+    '''
+    @staticmethod
+    def __label(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    ''' write the text into the file atomically.
+    Args:
+        path (str): the file path.
+        text (str): the text.
+    '''
+    @staticmethod
+    def __write(path: str, text: str) -> None:
+        # cli imports this module.
+        from .cli import Cli
+        Cli.writeAtomic(path, text)